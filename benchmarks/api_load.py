@@ -0,0 +1,398 @@
+"""Load-test the REST API with a mix of requests and report latency percentiles.
+
+Example:
+    python benchmarks/api_load.py --users 100 --articles 10000 --requests 2000 \\
+        --concurrency 8 --save baseline.json
+    python benchmarks/api_load.py --users 100 --articles 10000 --requests 2000 \\
+        --concurrency 8 --compare baseline.json
+
+Without `--url`, requests go through the Flask test client against a
+temporary SQLite database seeded with `generate_sample_data`. With `--url`,
+they are sent over HTTP to a running server, whose empty database must first
+be seeded with the same data (`flask create-sample-data --users N --articles M`)
+and whose rate limits must be off (`LOGIN_RATE_LIMIT=0 SEARCH_RATE_LIMIT=0`).
+
+Each operation of the mix (login, list, get, search, patch, delete) gets its
+own p50/p95/p99 latency; `--compare` exits with status 1 when any of them, or
+the overall throughput, is worse than the baseline by more than `--threshold`.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from userarticlesmanager.extensions import create_app, db  # noqa: E402
+from userarticlesmanager.routes import register_routes  # noqa: E402
+from userarticlesmanager.utils.database import (  # noqa: E402
+    SAMPLE_WORDS,
+    generate_sample_data,
+)
+
+OPERATIONS = ("login", "list", "get", "search", "patch", "delete")
+DEFAULT_MIX = "login=1,list=5,get=5,search=2,patch=1,delete=1"
+PASSWORD = "password"
+
+# (status code, response body) of one request
+Send = Callable[[str, str, Optional[dict], Optional[str]], tuple[int, Any]]
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise SystemExit(f"Unknown operation in --mix: {name!r}")
+        weights[name.strip()] = int(weight or 1)
+    return weights
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted `samples`."""
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, max(0, round(fraction * len(samples)) - 1))]
+
+
+def test_client_sender(app: Any) -> Send:
+    local = threading.local()
+
+    def send(
+        method: str, path: str, body: Optional[dict], token: Optional[str]
+    ) -> tuple[int, Any]:
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        response = local.client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.get_json(silent=True)
+
+    return send
+
+
+def http_sender(url: str) -> Send:
+    """Send requests over one keep-alive connection per thread."""
+    parts = urlsplit(url)
+    prefix = parts.path.rstrip("/")
+    local = threading.local()
+
+    def send(
+        method: str, path: str, body: Optional[dict], token: Optional[str]
+    ) -> tuple[int, Any]:
+        if not hasattr(local, "connection"):
+            connection_class = (
+                http.client.HTTPSConnection
+                if parts.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            local.connection = connection_class(parts.netloc, timeout=30)
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        payload = json.dumps(body) if body is not None else None
+        try:
+            local.connection.request(method, prefix + path, payload, headers)
+            response = local.connection.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            local.connection.close()
+            del local.connection
+            raise
+        try:
+            return response.status, json.loads(data) if data else None
+        except ValueError:
+            return response.status, None
+
+    return send
+
+
+class Workload:
+    """Builds and runs the requests of each operation against seeded data."""
+
+    def __init__(
+        self, send: Send, users: int, articles: int, deletable: int, seed: int
+    ) -> None:
+        self.send = send
+        self.users = users
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.admin_token = self.login("user1")
+        self.viewer_token = self.login(f"user{min(users, 2)}")
+        # Only the newest articles are deleted, so `get` mostly finds its article
+        self.article_ids = list(range(1, articles + 1))
+        self.deletable = self.article_ids[-deletable:] if deletable else []
+        self.patchable = self.article_ids[: len(self.article_ids) - deletable]
+        self.deletable_lock = threading.Lock()
+
+    def login(self, username: str) -> str:
+        status, body = self.send(
+            "POST", "/api/login", {"username": username, "password": PASSWORD}, None
+        )
+        if status != 200:
+            raise SystemExit(f"Login as {username} failed with {status}: {body}")
+        return body["access_token"]
+
+    def pick(self, choices: Any) -> Any:
+        with self.rng_lock:
+            return self.rng.choice(choices)
+
+    def run(self, operation: str) -> tuple[bool, float]:
+        """Send one request of `operation`; returns (success, seconds)."""
+        started = time.perf_counter()
+        status = getattr(self, f"do_{operation}")()
+        return status is not None and status < 400, time.perf_counter() - started
+
+    def do_login(self) -> int:
+        username = f"user{self.pick(range(1, self.users + 1))}"
+        body = {"username": username, "password": PASSWORD}
+        return self.send("POST", "/api/login", body, None)[0]
+
+    def do_list(self) -> int:
+        return self.send("GET", "/api/articles?limit=20", None, self.viewer_token)[0]
+
+    def do_get(self) -> int:
+        article_id = self.pick(self.article_ids)
+        status = self.send("GET", f"/api/articles/{article_id}", None, self.admin_token)
+        return 200 if status[0] == 404 else status[0]  # deleted by an earlier request
+
+    def do_search(self) -> int:
+        path = f"/api/articles/search?q={self.pick(SAMPLE_WORDS)}"
+        return self.send("GET", path, None, self.viewer_token)[0]
+
+    def do_patch(self) -> int:
+        article_id = self.pick(self.patchable)
+        body = {"title": f"Edited {self.pick(SAMPLE_WORDS)}"}
+        path = f"/api/articles/{article_id}"
+        return self.send("PATCH", path, body, self.admin_token)[0]
+
+    def do_delete(self) -> Optional[int]:
+        with self.deletable_lock:
+            if not self.deletable:
+                return None
+            article_id = self.deletable.pop()
+        path = f"/api/articles/{article_id}"
+        return self.send("DELETE", path, None, self.admin_token)[0]
+
+
+def run_load(
+    workload: Workload,
+    mix: dict[str, int],
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> tuple[dict[str, dict[str, Any]], float]:
+    rng = random.Random(seed)
+    plan = rng.choices(list(mix), weights=list(mix.values()), k=requests)
+    timings: dict[str, list[float]] = {operation: [] for operation in mix}
+    errors = {operation: 0 for operation in mix}
+    lock = threading.Lock()
+
+    def execute(operation: str) -> None:
+        try:
+            ok, seconds = workload.run(operation)
+        except (OSError, http.client.HTTPException):
+            ok, seconds = False, 0.0
+        with lock:
+            if ok:
+                timings[operation].append(seconds)
+            else:
+                errors[operation] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(execute, plan))
+    elapsed = time.perf_counter() - started
+
+    results = {}
+    for operation, samples in timings.items():
+        samples.sort()
+        results[operation] = {
+            "count": len(samples),
+            "errors": errors[operation],
+            "p50_ms": percentile(samples, 0.50) * 1000,
+            "p95_ms": percentile(samples, 0.95) * 1000,
+            "p99_ms": percentile(samples, 0.99) * 1000,
+        }
+    return results, elapsed
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(report: dict[str, Any]) -> None:
+    meta = report["meta"]
+    print(
+        f"commit={meta['commit']} target={meta['target']} users={meta['users']} "
+        f"articles={meta['articles']} concurrency={meta['concurrency']}"
+    )
+    print(
+        f"{'operation':<10}{'count':>8}{'errors':>8}{'p50 ms':>10}"
+        f"{'p95 ms':>10}{'p99 ms':>10}"
+    )
+    for operation, stats in report["operations"].items():
+        print(
+            f"{operation:<10}{stats['count']:>8}{stats['errors']:>8}"
+            f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+        )
+    print(
+        f"requests={report['requests']} elapsed={report['elapsed']:.2f}s "
+        f"requests/sec={report['requests_per_second']:.1f}"
+    )
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], threshold: float) -> int:
+    """Print the changes from `baseline` and return the number of regressions."""
+    regressions = 0
+    print(f"compared with {baseline['meta']['commit']} (threshold {threshold:.0%}):")
+    for operation, stats in report["operations"].items():
+        before = baseline["operations"].get(operation)
+        if not before:
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if not before[key]:
+                continue
+            change = stats[key] / before[key] - 1
+            flag = ""
+            if change > threshold:
+                regressions += 1
+                flag = "  REGRESSION"
+            print(
+                f"  {operation} {key[:3]}: {before[key]:.2f} -> {stats[key]:.2f} ms "
+                f"({change:+.0%}){flag}"
+            )
+    before_rate = baseline["requests_per_second"]
+    if before_rate:
+        change = report["requests_per_second"] / before_rate - 1
+        flag = ""
+        if change < -threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(
+            f"  requests/sec: {before_rate:.1f} -> "
+            f"{report['requests_per_second']:.1f} ({change:+.0%}){flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--content-size", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--mix", default=DEFAULT_MIX, help="Relative weight of each operation"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--warmup", type=int, default=100, help="Requests sent before measuring"
+    )
+    parser.add_argument(
+        "--url", help="Base URL of a running server, e.g. http://localhost:5000"
+    )
+    parser.add_argument(
+        "--no-response-cache",
+        action="store_true",
+        help="Disable the response cache (test client only)",
+    )
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file written by --save")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown reported as a regression",
+    )
+    args = parser.parse_args()
+    if args.users < 2:
+        parser.error("--users must be at least 2")
+    mix = parse_mix(args.mix)
+    # Enough deletable articles for every delete of the warmup and the run
+    deletable = 0
+    if "delete" in mix:
+        deletable = min(
+            args.articles // 2,
+            (args.requests + args.warmup) * mix["delete"] // sum(mix.values()) * 2 + 10,
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url:
+            send = http_sender(args.url)
+            target = args.url
+        else:
+
+            class BenchmarkConfig:
+                SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp}/bench.db"
+                JWT_SECRET_KEY = "benchmark-secret-key-of-32-bytes!"
+                SLOW_QUERY_THRESHOLD_MS = 0
+                RESPONSE_CACHE_BACKEND = "none" if args.no_response_cache else "memory"
+                SERVER_TIMING_ENABLED = False
+
+            app = create_app(BenchmarkConfig)  # type: ignore
+            register_routes(app)
+            with app.app_context():
+                db.create_all()
+                generate_sample_data(
+                    args.users, args.articles, args.content_size, args.seed, PASSWORD
+                )
+            send = test_client_sender(app)
+            target = "test-client"
+
+        workload = Workload(send, args.users, args.articles, deletable, args.seed)
+        if args.warmup:
+            run_load(workload, mix, args.warmup, args.concurrency, args.seed + 1)
+        operations, elapsed = run_load(
+            workload, mix, args.requests, args.concurrency, args.seed
+        )
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "target": target,
+            "users": args.users,
+            "articles": args.articles,
+            "content_size": args.content_size,
+            "concurrency": args.concurrency,
+            "mix": mix,
+            "seed": args.seed,
+        },
+        "operations": operations,
+        "requests": args.requests,
+        "elapsed": elapsed,
+        "requests_per_second": args.requests / elapsed,
+    }
+    print_report(report)
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
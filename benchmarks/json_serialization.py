@@ -0,0 +1,87 @@
+"""Compare JSON serialization time of a large article list per JSON provider.
+
+Example:
+    python benchmarks/json_serialization.py --articles 10000 --repeat 5
+
+Each provider renders the same `{"items": [...]}` payload of `Article.to_dict`
+rows through `provider.response`, exactly as `jsonify` does for
+`GET /api/articles`. No database is involved; the best of `--repeat` runs
+is reported.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from flask.json.provider import DefaultJSONProvider, JSONProvider  # noqa: E402
+from userarticlesmanager.extensions import create_app  # noqa: E402
+from userarticlesmanager.models.article import Article  # noqa: E402
+from userarticlesmanager.utils.json_provider import (  # noqa: E402
+    OrjsonProvider,
+    StdlibJSONProvider,
+    orjson,
+)
+
+
+def build_payload(count: int, content_size: int) -> dict:
+    started_at = datetime(2024, 1, 1)
+    items = []
+    for i in range(count):
+        article = Article(
+            title=f"Article {i}", content="x" * content_size, user_id=i % 100 + 1
+        )
+        article.id = i + 1
+        article.created_at = started_at + timedelta(seconds=i)
+        article.updated_at = started_at + timedelta(seconds=i, minutes=5)
+        items.append(article.to_dict())
+    return {"items": items, "next_cursor": None}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=10_000)
+    parser.add_argument("--content-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    class BenchmarkConfig:
+        SQLALCHEMY_DATABASE_URI = "sqlite://"
+        JWT_SECRET_KEY = "benchmark"
+        PASSWORD_HASH_WORKERS = 0
+
+    app = create_app(BenchmarkConfig)  # type: ignore
+    payload = build_payload(args.articles, args.content_size)
+
+    providers: dict[str, JSONProvider] = {
+        "flask-default": DefaultJSONProvider(app),
+        "stdlib": StdlibJSONProvider(app),
+    }
+    if orjson is not None:
+        providers["orjson"] = OrjsonProvider(app)
+    else:
+        print("orjson is not installed; skipping it")
+
+    print(f"articles={args.articles} content_size={args.content_size}")
+    baseline = None
+    with app.app_context():
+        for name, provider in providers.items():
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                body = provider.response(payload).get_data()  # type: ignore
+                timings.append(time.perf_counter() - started)
+            best = min(timings)
+            baseline = baseline or best
+            print(
+                f"{name:<14} best={best * 1000:8.1f}ms "
+                f"speedup={baseline / best:5.1f}x size={len(body) / 1024:8.0f}KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
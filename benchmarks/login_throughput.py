@@ -0,0 +1,76 @@
+"""Measure /api/login throughput for a password hashing configuration.
+
+Example:
+    python benchmarks/login_throughput.py --method scrypt --workers 4 --logins 200
+
+Logins are sent concurrently through the Flask test client against a
+temporary SQLite database, so the numbers reflect hashing cost rather than
+network or database latency.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from userarticlesmanager.extensions import create_app, db  # noqa: E402
+from userarticlesmanager.models.user import User  # noqa: E402
+from userarticlesmanager.routes import register_routes  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--method", default="scrypt", help="PASSWORD_HASH_METHOD")
+    parser.add_argument(
+        "--workers", type=int, default=0, help="PASSWORD_HASH_WORKERS (0 = inline)"
+    )
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument(
+        "--concurrency", type=int, default=0, help="Parallel clients (default: workers)"
+    )
+    args = parser.parse_args()
+    concurrency = args.concurrency or max(args.workers, 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        class BenchmarkConfig:
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp}/bench.db"
+            JWT_SECRET_KEY = "benchmark"
+            PASSWORD_HASH_METHOD = args.method
+            PASSWORD_HASH_WORKERS = args.workers
+            PASSWORD_HASH_MAX_PENDING = max(concurrency, 1)
+
+        app = create_app(BenchmarkConfig)  # type: ignore
+        register_routes(app)
+        with app.app_context():
+            db.create_all()
+            db.session.add(User(username="bench", password="bench_password"))
+            db.session.commit()
+
+        def login(_: int) -> int:
+            response = app.test_client().post(
+                "/api/login", json={"username": "bench", "password": "bench_password"}
+            )
+            return response.status_code
+
+        login(0)  # warm up the process pool
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            statuses = list(pool.map(login, range(args.logins)))
+        elapsed = time.perf_counter() - started
+        app.extensions["password_hasher"].shutdown()
+
+    cores = min(max(args.workers, 1), os.cpu_count() or 1)
+    rate = args.logins / elapsed
+    print(f"method={args.method} workers={args.workers} concurrency={concurrency}")
+    print(f"logins={args.logins} ok={statuses.count(200)} elapsed={elapsed:.2f}s")
+    print(f"logins/sec={rate:.1f} logins/sec/core={rate / cores:.1f}")
+
+
+if __name__ == "__main__":
+    main()
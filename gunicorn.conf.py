@@ -0,0 +1,72 @@
+"""Gunicorn settings for serving `wsgi:app` in production.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Every setting can be overridden from the environment (GUNICORN_*). The
+default `gthread` workers run one process per CPU core with a pool of threads
+each, so a container serves `workers * threads` requests at a time.
+
+To switch to an async worker class, install the `gevent` extra (gevent, and
+psycogreen so that psycopg2 yields while waiting on PostgreSQL) and set
+`GUNICORN_WORKER_CLASS=gevent`; `GUNICORN_WORKER_CONNECTIONS` then bounds the
+concurrent requests per worker instead of `GUNICORN_THREADS`.
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", str(multiprocessing.cpu_count())))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+
+# Import the app once in the master so workers fork with it already loaded
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# A worker silent for `timeout` seconds is restarted; on shutdown or reload,
+# workers get `graceful_timeout` seconds to finish in-flight requests.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Recycle workers now and then to bound the effect of slow leaks
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "1000"))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+
+# A process-local response cache would serve other workers' stale articles and
+# ETags (and spurious 412s) until its entries expire, so with several workers
+# it is off unless RESPONSE_CACHE_BACKEND=redis (or memory) is set explicitly.
+if workers > 1:
+    os.environ.setdefault("RESPONSE_CACHE_BACKEND", "none")
+
+# Every worker already occupies a core, so password verification gets a
+# process pool sized to its share of the cores rather than one per core.
+os.environ.setdefault(
+    "PASSWORD_HASH_WORKERS", str(max(multiprocessing.cpu_count() // workers, 1))
+)
+# Logins waiting for a hash hold a request thread each; leave one free for the
+# other endpoints instead of letting a login burst take them all.
+concurrency = worker_connections if worker_class == "gevent" else threads
+os.environ.setdefault("PASSWORD_HASH_MAX_PENDING", str(max(concurrency - 1, 1)))
+
+
+def post_fork(server, worker):  # type: ignore[no-untyped-def]
+    """Drop database connections inherited from the master process."""
+    if worker_class == "gevent":
+        try:
+            from psycogreen.gevent import patch_psycopg  # type: ignore
+
+            patch_psycopg()
+        except ImportError:
+            server.log.warning("psycogreen is not installed; psycopg2 will block")
+
+    if preload_app:
+        from userarticlesmanager.extensions import db
+        from wsgi import app
+
+        with app.app_context():
+            db.engine.dispose(close=False)
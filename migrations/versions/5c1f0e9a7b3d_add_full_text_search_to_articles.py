@@ -0,0 +1,98 @@
+"""Add full-text search to articles
+
+Revision ID: 5c1f0e9a7b3d
+Revises: 2a8e31738040
+Create Date: 2026-10-17 09:12:41.503218
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1f0e9a7b3d"
+down_revision: Union[str, None] = "2a8e31738040"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce({row}title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce({row}content, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "sqlite":
+        op.add_column("articles", sa.Column("search_vector", sa.Text(), nullable=True))
+        op.execute(
+            "CREATE VIRTUAL TABLE articles_fts USING fts5("
+            "title, content, content='articles', content_rowid='id', "
+            "tokenize='porter unicode61')"
+        )
+        op.execute(
+            "CREATE TRIGGER articles_fts_ai AFTER INSERT ON articles BEGIN "
+            "INSERT INTO articles_fts(rowid, title, content) "
+            "VALUES (new.id, new.title, new.content); END"
+        )
+        op.execute(
+            "CREATE TRIGGER articles_fts_ad AFTER DELETE ON articles BEGIN "
+            "INSERT INTO articles_fts(articles_fts, rowid, title, content) "
+            "VALUES ('delete', old.id, old.title, old.content); END"
+        )
+        op.execute(
+            "CREATE TRIGGER articles_fts_au AFTER UPDATE OF title, content "
+            "ON articles BEGIN "
+            "INSERT INTO articles_fts(articles_fts, rowid, title, content) "
+            "VALUES ('delete', old.id, old.title, old.content); "
+            "INSERT INTO articles_fts(rowid, title, content) "
+            "VALUES (new.id, new.title, new.content); END"
+        )
+        op.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+        return
+
+    op.add_column(
+        "articles", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True)
+    )
+    op.execute(f"""
+        CREATE FUNCTION articles_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR_EXPRESSION.format(row="NEW.")};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """)
+    op.execute(
+        "CREATE TRIGGER articles_search_vector_trigger "
+        "BEFORE INSERT OR UPDATE OF title, content ON articles "
+        "FOR EACH ROW EXECUTE FUNCTION articles_search_vector_update()"
+    )
+    # Backfill existing rows; the trigger only covers writes from now on.
+    op.execute(
+        f"UPDATE articles SET search_vector = {SEARCH_VECTOR_EXPRESSION.format(row='')}"
+    )
+    op.create_index(
+        "ix_articles_search_vector",
+        "articles",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS articles_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS articles_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS articles_fts_ai")
+        op.execute("DROP TABLE IF EXISTS articles_fts")
+        op.drop_column("articles", "search_vector")
+        return
+
+    op.drop_index("ix_articles_search_vector", table_name="articles")
+    op.execute("DROP TRIGGER IF EXISTS articles_search_vector_trigger ON articles")
+    op.execute("DROP FUNCTION IF EXISTS articles_search_vector_update()")
+    op.drop_column("articles", "search_vector")
@@ -0,0 +1,40 @@
+"""Add trigram index on usernames
+
+Revision ID: 8d4b2a61c0e7
+Revises: 5c1f0e9a7b3d
+Create Date: 2026-10-17 10:03:27.114592
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d4b2a61c0e7"
+down_revision: Union[str, None] = "5c1f0e9a7b3d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # pg_trgm is PostgreSQL-only; other databases fall back to the in-memory index.
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_users_username_trgm",
+        "users",
+        ["username"],
+        postgresql_using="gin",
+        postgresql_ops={"username": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    op.drop_index("ix_users_username_trgm", table_name="users")
@@ -0,0 +1,32 @@
+"""Add article_list_version
+
+Revision ID: 9e2b6d4f1a73
+Revises: d8c4e17a5f60
+Create Date: 2026-10-19 09:02:51.204617
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9e2b6d4f1a73"
+down_revision: Union[str, None] = "d8c4e17a5f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "article_list_version",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("INSERT INTO article_list_version (id, version) VALUES (1, 0)")
+
+
+def downgrade() -> None:
+    op.drop_table("article_list_version")
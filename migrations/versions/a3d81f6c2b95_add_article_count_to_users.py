@@ -0,0 +1,55 @@
+"""Add article_count to users
+
+Revision ID: a3d81f6c2b95
+Revises: f19c62d7a8e3
+Create Date: 2026-10-17 23:05:12.304718
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3d81f6c2b95"
+down_revision: Union[str, None] = "f19c62d7a8e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Users whose count is computed per backfill statement
+BACKFILL_CHUNK_SIZE = 10000
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("article_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    if op.get_context().dialect.name != "postgresql":
+        _backfill()
+        return
+
+    # Each chunk commits on its own, so row locks on users are held briefly
+    with op.get_context().autocommit_block():
+        _backfill()
+
+
+def _backfill() -> None:
+    connection = op.get_bind()
+    max_id = connection.execute(sa.text("SELECT MAX(id) FROM users")).scalar() or 0
+    for low in range(0, max_id, BACKFILL_CHUNK_SIZE):
+        connection.execute(
+            sa.text(
+                "UPDATE users SET article_count = "
+                "(SELECT COUNT(*) FROM articles WHERE articles.user_id = users.id) "
+                "WHERE id > :low AND id <= :high"
+            ),
+            {"low": low, "high": low + BACKFILL_CHUNK_SIZE},
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("article_count")
@@ -0,0 +1,31 @@
+"""Add role_version to users
+
+Revision ID: b7e3c94d2f18
+Revises: 8d4b2a61c0e7
+Create Date: 2026-10-17 11:21:05.840113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e3c94d2f18"
+down_revision: Union[str, None] = "8d4b2a61c0e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("role_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("role_version")
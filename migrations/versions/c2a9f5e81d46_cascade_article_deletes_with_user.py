@@ -0,0 +1,45 @@
+"""Cascade article deletes with their user
+
+Revision ID: c2a9f5e81d46
+Revises: b7e3c94d2f18
+Create Date: 2026-10-17 12:40:52.367905
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c2a9f5e81d46"
+down_revision: Union[str, None] = "b7e3c94d2f18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite cannot alter constraints in place and does not enforce foreign keys
+    # by default; the application deletes articles explicitly there.
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    op.drop_constraint("articles_user_id_fkey", "articles", type_="foreignkey")
+    op.create_foreign_key(
+        "articles_user_id_fkey",
+        "articles",
+        "users",
+        ["user_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    op.drop_constraint("articles_user_id_fkey", "articles", type_="foreignkey")
+    op.create_foreign_key(
+        "articles_user_id_fkey", "articles", "users", ["user_id"], ["id"]
+    )
@@ -0,0 +1,27 @@
+"""Add deleting_at to users
+
+Revision ID: d8c4e17a5f60
+Revises: a3d81f6c2b95
+Create Date: 2026-10-18 10:14:37.512893
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d8c4e17a5f60"
+down_revision: Union[str, None] = "a3d81f6c2b95"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("deleting_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("deleting_at")
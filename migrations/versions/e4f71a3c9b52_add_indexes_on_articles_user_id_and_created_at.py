@@ -0,0 +1,58 @@
+"""Add indexes on articles.user_id and (created_at, id)
+
+Revision ID: e4f71a3c9b52
+Revises: c2a9f5e81d46
+Create Date: 2026-10-17 13:05:18.204716
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4f71a3c9b52"
+down_revision: Union[str, None] = "c2a9f5e81d46"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_articles_user_id": ["user_id"],
+    "ix_articles_created_at_id": ["created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        for name, columns in INDEXES.items():
+            op.create_index(name, "articles", columns)
+        return
+
+    # CREATE INDEX CONCURRENTLY does not lock out writes on a live table, but
+    # cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(
+                name,
+                "articles",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        for name in INDEXES:
+            op.drop_index(name, table_name="articles")
+        return
+
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(
+                name,
+                table_name="articles",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,47 @@
+"""Add index on articles.updated_at
+
+Revision ID: f19c62d7a8e3
+Revises: e4f71a3c9b52
+Create Date: 2026-10-17 13:42:06.518233
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f19c62d7a8e3"
+down_revision: Union[str, None] = "e4f71a3c9b52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        op.create_index("ix_articles_updated_at", "articles", ["updated_at"])
+        return
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_articles_updated_at",
+            "articles",
+            ["updated_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        op.drop_index("ix_articles_updated_at", table_name="articles")
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_articles_updated_at",
+            table_name="articles",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
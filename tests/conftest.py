@@ -33,6 +33,9 @@ def prepare_database(app: Flask) -> None:
         db.session.query(Article).delete()
         db.session.query(User).delete()
         db.session.commit()
+        # IDs are reused after the tables are emptied, so drop cached users too
+        app.extensions["current_user_cache"].clear()
+        app.extensions["response_cache"].clear()
 
         # Add a test user
         test_user = User(
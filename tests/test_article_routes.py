@@ -1,6 +1,35 @@
+import csv
+import fnmatch
+import gzip
+import io
+import json
+import shutil
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+import pytest
+from sqlalchemy import event, select, text
 from userarticlesmanager.models.user import User, UserRoles
 from userarticlesmanager.models.article import Article
-from userarticlesmanager.extensions import db
+from userarticlesmanager.extensions import create_app, db
+from userarticlesmanager.routes import register_routes
+from userarticlesmanager.test_config import TestConfig
+from userarticlesmanager.utils.instrumentation import (
+    QueryBudgetExceeded,
+    count_queries,
+)
+from userarticlesmanager.utils.json_provider import (
+    OrjsonProvider,
+    StdlibJSONProvider,
+    orjson,
+)
+from userarticlesmanager.utils.response_cache import (
+    CachedResponse,
+    RedisBackend,
+    ResponseCache,
+)
 
 
 def test_create_article_admin(client, get_access_token) -> None:
@@ -40,8 +69,56 @@ def test_get_articles_viewer(client, app, get_access_token) -> None:
     )
     assert response.status_code == 200
     data = response.get_json()
-    assert len(data) == 1
-    assert data[0]["title"] == "Viewer Article"
+    assert len(data["items"]) == 1
+    assert data["items"][0]["title"] == "Viewer Article"
+    assert data["next_cursor"] is None
+
+
+def test_get_articles_cursor_pagination(client, app, get_access_token) -> None:
+    """Test walking the article list page by page with `limit` and `after`."""
+    with app.app_context():
+        db.session.add_all(
+            [
+                Article(title=f"Paged Article {i}", content="Content", user_id=1)
+                for i in range(5)
+            ]
+        )
+        db.session.commit()
+
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    titles: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        url = "/api/articles?limit=2" + (f"&after={cursor}" if cursor else "")
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        data = response.get_json()
+        assert len(data["items"]) <= 2
+        titles.extend(item["title"] for item in data["items"])
+        pages += 1
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert titles == [f"Paged Article {i}" for i in range(5)]
+
+
+def test_get_articles_invalid_pagination(client, get_access_token) -> None:
+    """Test that malformed `after` and `limit` values are rejected."""
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = client.get("/api/articles?after=not-a-cursor", headers=headers)
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Invalid cursor"
+
+    response = client.get("/api/articles?limit=0", headers=headers)
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Limit must be a positive integer"
 
 
 def test_update_article_editor(client, app, get_access_token) -> None:
@@ -118,6 +195,78 @@ def test_search_articles(client, app, get_access_token) -> None:
     assert data[1]["title"] == "Searchable Article 2"
 
 
+def test_search_articles_matches_content_and_ranks_titles_first(
+    client, app, get_access_token
+) -> None:
+    """Test that search covers content and ranks title matches above content matches."""
+    with app.app_context():
+        db.session.add_all(
+            [
+                Article(title="Gardening", content="Notes about tomatoes", user_id=1),
+                Article(title="Tomatoes", content="Growing guide", user_id=1),
+                Article(title="Unrelated", content="Nothing to see", user_id=1),
+            ]
+        )
+        db.session.commit()
+
+    access_token = get_access_token("admin_user", "admin_password")
+
+    response = client.get(
+        "/api/articles/search?q=tomato",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [article["title"] for article in data] == ["Tomatoes", "Gardening"]
+
+
+def test_search_articles_pagination(client, app, get_access_token) -> None:
+    """Test paging through search results with `limit` and `offset`."""
+    with app.app_context():
+        db.session.add_all(
+            [
+                Article(title=f"Paged result {i}", content="Body", user_id=1)
+                for i in range(3)
+            ]
+        )
+        db.session.commit()
+
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    first_page = client.get("/api/articles/search?q=paged&limit=2", headers=headers)
+    second_page = client.get(
+        "/api/articles/search?q=paged&limit=2&offset=2", headers=headers
+    )
+    assert len(first_page.get_json()) == 2
+    assert len(second_page.get_json()) == 1
+    titles = {a["title"] for a in first_page.get_json() + second_page.get_json()}
+    assert titles == {f"Paged result {i}" for i in range(3)}
+
+
+def test_search_articles_reflects_updates(client, app, get_access_token) -> None:
+    """Test that the search index follows title changes made through the API."""
+    with app.app_context():
+        article = Article(title="Draft", content="Body", user_id=1)
+        db.session.add(article)
+        db.session.commit()
+        article_id = article.id
+
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    client.patch(
+        f"/api/articles/{article_id}", headers=headers, json={"title": "Published"}
+    )
+
+    assert (
+        client.get("/api/articles/search?q=draft", headers=headers).status_code == 404
+    )
+    response = client.get("/api/articles/search?q=published", headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()[0]["id"] == article_id
+
+
 def test_invalid_article_id(client, get_access_token) -> None:
     access_token = get_access_token("admin_user", "admin_password")
 
@@ -206,6 +355,64 @@ def test_create_article_missing_data(client, get_access_token) -> None:
     assert data["message"] == "Title and content are required"
 
 
+def test_create_article_rejects_non_integer_user_id(
+    client, app, get_access_token
+) -> None:
+    """Test that a user_id that is not a whole number is a 400, not a 500."""
+    access_token = get_access_token("admin_user", "admin_password")
+
+    for user_id in ("abc", 1.5, True, None):
+        response = client.post(
+            "/api/articles",
+            headers={"Authorization": f"Bearer {access_token}"},
+            json={"title": "Title", "content": "Body", "user_id": user_id},
+        )
+        assert response.status_code == 400
+        assert response.get_json()["message"] == "User ID must be an integer"
+
+    with app.app_context():
+        assert Article.query.count() == 0
+        assert sum(user.article_count for user in User.query.all()) == 0
+
+
+def test_search_articles_statement_timeout(
+    client, app, get_access_token, monkeypatch
+) -> None:
+    """Test that a search running past its statement timeout is cancelled with 503."""
+    routes = sys.modules["userarticlesmanager.routes.article_routes"]
+
+    def slow_search(*args, **kwargs) -> list:
+        # Counts to a billion; interrupted long before it finishes
+        db.session.execute(
+            text(
+                "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL "
+                "SELECT i + 1 FROM n WHERE i < 1000000000) SELECT count(*) FROM n"
+            )
+        )
+        return []
+
+    monkeypatch.setattr(routes, "full_text_search", slow_search)
+    monkeypatch.setitem(
+        app.config, "STATEMENT_TIMEOUTS_MS", {"article_routes.search_articles": 50}
+    )
+    access_token = get_access_token("admin_user", "admin_password")
+
+    started = time.monotonic()
+    response = client.get(
+        "/api/articles/search?q=anything",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert time.monotonic() - started < 5
+
+    # Other endpoints are not limited, and the connection is usable again
+    response = client.get(
+        "/api/articles", headers={"Authorization": f"Bearer {access_token}"}
+    )
+    assert response.status_code == 200
+
+
 def test_search_articles_no_results(client, get_access_token) -> None:
     """Test searching for articles with no matching results."""
     access_token = get_access_token("admin_user", "admin_password")
@@ -217,3 +424,791 @@ def test_search_articles_no_results(client, get_access_token) -> None:
     assert response.status_code == 404
     data = response.get_json()
     assert data["message"] == "No articles found"
+
+
+def test_export_articles_ndjson(client, app, get_access_token, monkeypatch) -> None:
+    """Test streaming every article as newline-delimited JSON."""
+    monkeypatch.setitem(app.config, "EXPORT_BATCH_SIZE", 2)
+    with app.app_context():
+        db.session.add_all(
+            [
+                Article(title=f"Export {i}", content=f"Body {i}", user_id=1)
+                for i in range(5)
+            ]
+        )
+        db.session.commit()
+
+    access_token = get_access_token("viewer_user", "viewer_password")
+
+    response = client.get(
+        "/api/articles/export",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)["title"] for line in lines] == [
+        f"Export {i}" for i in range(5)
+    ]
+
+
+def test_export_articles_csv(client, app, get_access_token) -> None:
+    """Test exporting articles as CSV with a header row."""
+    with app.app_context():
+        db.session.add(
+            Article(title="CSV Article", content="Line, with comma", user_id=1)
+        )
+        db.session.commit()
+
+    access_token = get_access_token("admin_user", "admin_password")
+
+    response = client.get(
+        "/api/articles/export?format=csv",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(rows) == 1
+    assert rows[0]["title"] == "CSV Article"
+    assert rows[0]["content"] == "Line, with comma"
+
+
+def test_export_articles_invalid_format(client, get_access_token) -> None:
+    """Test that unknown export formats are rejected."""
+    access_token = get_access_token("admin_user", "admin_password")
+
+    response = client.get(
+        "/api/articles/export?format=xml",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Format must be one of: ndjson, csv"
+
+
+def test_bulk_articles_mixed_operations(client, app, get_access_token) -> None:
+    """Test a bulk request with creates, updates, deletes and per-item failures."""
+    with app.app_context():
+        viewer_user = User(
+            username="viewer_user", password="viewer_password", role=UserRoles.VIEWER
+        )
+        db.session.add(viewer_user)
+        db.session.commit()
+        viewer_id = viewer_user.id
+        own = Article(title="Own", content="Mine", user_id=viewer_id)
+        foreign = Article(title="Foreign", content="Not mine", user_id=1)
+        db.session.add_all([own, foreign])
+        db.session.commit()
+        own_id, foreign_id = own.id, foreign.id
+
+    access_token = get_access_token("viewer_user", "viewer_password")
+
+    response = client.post(
+        "/api/articles/bulk",
+        headers={"Authorization": f"Bearer {access_token}"},
+        json={
+            "operations": [
+                {"action": "create", "title": "New 1", "content": "Body 1"},
+                {"action": "create", "title": "New 2", "content": "Body 2"},
+                {"action": "update", "id": own_id, "title": "Own updated"},
+                {"action": "delete", "id": foreign_id},
+                {"action": "create", "title": "No content"},
+                {"action": "update", "id": 9999, "title": "Missing"},
+                {"action": "create", "title": "T", "content": "C", "user_id": 1.5},
+                {"action": "create", "title": "T", "content": "C", "user_id": True},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["succeeded"] == 3
+    assert data["failed"] == 5
+    statuses = {result["index"]: result["status"] for result in data["results"]}
+    assert statuses == {0: 201, 1: 201, 2: 200, 3: 403, 4: 400, 5: 404, 6: 400, 7: 400}
+    messages = {result["index"]: result.get("message") for result in data["results"]}
+    assert messages[6] == messages[7] == "User ID must be an integer"
+
+    with app.app_context():
+        titles = sorted(article.title for article in Article.query.all())
+        assert titles == ["Foreign", "New 1", "New 2", "Own updated"]
+        updated = db.session.get(Article, own_id)
+        assert updated is not None
+        assert updated.content == "Mine"
+        assert updated.updated_at is not None
+
+
+def test_bulk_articles_strict_mode_applies_nothing(
+    client, app, get_access_token
+) -> None:
+    """Test that one failing operation aborts the whole batch in strict mode."""
+    with app.app_context():
+        article = Article(title="Keep", content="Body", user_id=1)
+        db.session.add(article)
+        db.session.commit()
+        article_id = article.id
+
+    access_token = get_access_token("admin_user", "admin_password")
+
+    response = client.post(
+        "/api/articles/bulk",
+        headers={"Authorization": f"Bearer {access_token}"},
+        json={
+            "strict": True,
+            "operations": [
+                {"action": "delete", "id": article_id},
+                {"action": "create", "title": "Bad", "user_id": 9999, "content": "x"},
+            ],
+        },
+    )
+    assert response.status_code == 400
+    statuses = [result["status"] for result in response.get_json()["results"]]
+    assert statuses == [424, 404]
+
+    with app.app_context():
+        assert db.session.get(Article, article_id) is not None
+        assert Article.query.filter_by(title="Bad").first() is None
+
+
+def test_bulk_articles_rejects_malformed_body(client, get_access_token) -> None:
+    """Test that the operations list is required."""
+    access_token = get_access_token("admin_user", "admin_password")
+
+    response = client.post(
+        "/api/articles/bulk",
+        headers={"Authorization": f"Bearer {access_token}"},
+        json={"operations": []},
+    )
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Operations must be a non-empty list"
+
+
+def test_get_article_etag_not_modified(client, app, get_access_token) -> None:
+    """Test that a single article is answered with 304 while its ETag still matches."""
+    with app.app_context():
+        article = Article(title="Cached", content="Body", user_id=1)
+        db.session.add(article)
+        db.session.commit()
+        article_id = article.id
+
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = client.get(f"/api/articles/{article_id}", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+    assert "no-cache" in response.headers["Cache-Control"]
+
+    response = client.get(
+        f"/api/articles/{article_id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+
+    response = client.get(
+        f"/api/articles/{article_id}",
+        headers={**headers, "If-Modified-Since": last_modified},
+    )
+    assert response.status_code == 304
+
+    client.patch(
+        f"/api/articles/{article_id}", headers=headers, json={"title": "Changed"}
+    )
+    response = client.get(
+        f"/api/articles/{article_id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.get_json()["title"] == "Changed"
+
+
+def test_get_articles_collection_etag(client, app, get_access_token) -> None:
+    """Test that the list ETag changes with creates, updates, deletes and the page."""
+    with app.app_context():
+        article = Article(title="Listed", content="Body", user_id=1)
+        db.session.add(article)
+        db.session.commit()
+        article_id = article.id
+
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    etag = client.get("/api/articles", headers=headers).headers["ETag"]
+    response = client.get("/api/articles", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    other_page = client.get("/api/articles?limit=1", headers=headers).headers["ETag"]
+    assert other_page != etag
+
+    seen = {etag}
+    for change in (
+        lambda: client.post(
+            "/api/articles", headers=headers, json={"title": "New", "content": "Body"}
+        ),
+        lambda: client.patch(
+            f"/api/articles/{article_id}", headers=headers, json={"content": "Edited"}
+        ),
+        lambda: client.delete(f"/api/articles/{article_id}", headers=headers),
+    ):
+        change()
+        response = client.get(
+            "/api/articles", headers={**headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert etag not in seen
+        seen.add(etag)
+
+    # A delete does not move the latest modification time, so list pages
+    # send no Last-Modified and ignore If-Modified-Since
+    response = client.get(
+        "/api/articles",
+        headers={**headers, "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"},
+    )
+    assert response.status_code == 200
+    assert "Last-Modified" not in response.headers
+
+
+def test_update_article_if_match(client, app, get_access_token) -> None:
+    """Test that PATCH with a stale If-Match is rejected with 412."""
+    with app.app_context():
+        article = Article(title="Original", content="Body", user_id=1)
+        db.session.add(article)
+        db.session.commit()
+        article_id = article.id
+
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+    etag = client.get(f"/api/articles/{article_id}", headers=headers).headers["ETag"]
+
+    response = client.patch(
+        f"/api/articles/{article_id}",
+        headers={**headers, "If-Match": etag},
+        json={"title": "First"},
+    )
+    assert response.status_code == 200
+    new_etag = response.headers["ETag"]
+    assert new_etag != etag
+
+    response = client.patch(
+        f"/api/articles/{article_id}",
+        headers={**headers, "If-Match": etag},
+        json={"title": "Second"},
+    )
+    assert response.status_code == 412
+    assert response.headers["ETag"] == new_etag
+
+    with app.app_context():
+        assert Article.query.filter_by(id=article_id).one().title == "First"
+
+
+def test_article_reads_served_from_response_cache(
+    client, app, get_access_token
+) -> None:
+    """Test that repeated reads hit the cache and writes invalidate exactly what changed."""
+    with app.app_context():
+        first = Article(title="First", content="Body", user_id=1)
+        second = Article(title="Second", content="Body", user_id=1)
+        db.session.add_all([first, second])
+        db.session.commit()
+        first_id, second_id = first.id, second.id
+
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    def cache_status(url: str) -> str:
+        return client.get(url, headers=headers).headers["X-Cache"]
+
+    for url in (
+        "/api/articles",
+        f"/api/articles/{first_id}",
+        f"/api/articles/{second_id}",
+    ):
+        assert cache_status(url) == "MISS"
+        assert cache_status(url) == "HIT"
+
+    response = client.get(f"/api/articles/{first_id}", headers=headers)
+    etag = response.headers["ETag"]
+    response = client.get(
+        f"/api/articles/{first_id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["X-Cache"] == "HIT"
+
+    client.patch(f"/api/articles/{first_id}", headers=headers, json={"title": "Edited"})
+    response = client.get(f"/api/articles/{first_id}", headers=headers)
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.get_json()["title"] == "Edited"
+    assert cache_status(f"/api/articles/{second_id}") == "HIT"
+    assert cache_status("/api/articles") == "MISS"
+
+    client.post(
+        "/api/articles", headers=headers, json={"title": "New", "content": "Body"}
+    )
+    response = client.get("/api/articles", headers=headers)
+    assert response.headers["X-Cache"] == "MISS"
+    assert len(response.get_json()["items"]) == 3
+
+    client.delete(f"/api/articles/{second_id}", headers=headers)
+    response = client.get(f"/api/articles/{second_id}", headers=headers)
+    assert response.status_code == 404
+
+    stats = client.get("/api/articles/cache/stats", headers=headers).get_json()
+    assert stats["backend"] == "memory"
+    assert stats["hits"] >= 5
+    assert 0 < stats["hit_ratio"] < 1
+
+
+def test_delete_user_invalidates_cached_articles(client, app, get_access_token) -> None:
+    """Test that deleting a user drops their cached articles."""
+    with app.app_context():
+        author = User(username="author", password="password", role=UserRoles.VIEWER)
+        db.session.add(author)
+        db.session.commit()
+        article = Article(title="Doomed", content="Body", user_id=author.id)
+        db.session.add(article)
+        db.session.commit()
+        author_id, article_id = author.id, article.id
+
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+    client.get(f"/api/articles/{article_id}", headers=headers)
+    assert (
+        client.get(f"/api/articles/{article_id}", headers=headers).headers["X-Cache"]
+        == "HIT"
+    )
+
+    client.delete(f"/api/users/{author_id}", headers=headers)
+
+    assert client.get(f"/api/articles/{article_id}", headers=headers).status_code == 404
+
+
+class _RedisStandIn:
+    """Minimal in-memory server speaking the subset of the Redis API the backend uses."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, tuple[bytes, float]] = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value, expires_at = self.data.get(key, (None, 0.0))
+            return value if expires_at > time.monotonic() else None
+
+    def set(self, key, value, px=None, nx=False):
+        with self.lock:
+            current = self.data.get(key)
+            if nx and current and current[1] > time.monotonic():
+                return None
+            expires_at = time.monotonic() + px / 1000 if px else float("inf")
+            self.data[key] = (
+                value if isinstance(value, bytes) else str(value).encode(),
+                expires_at,
+            )
+            return True
+
+    def delete(self, *keys):
+        with self.lock:
+            return len([self.data.pop(key) for key in keys if key in self.data])
+
+    def incr(self, key):
+        with self.lock:
+            value, expires_at = self.data.get(key, (b"0", float("inf")))
+            self.data[key] = (str(int(value) + 1).encode(), expires_at)
+            return int(value) + 1
+
+    def scan_iter(self, match):
+        return [key for key in list(self.data) if fnmatch.fnmatch(key, match)]
+
+
+def test_response_cache_redis_backend_single_flight() -> None:
+    """Test the Redis backend and that concurrent misses compute an entry only once."""
+    server = _RedisStandIn()
+    cache = ResponseCache(RedisBackend(server), ttl=30)
+    calls = []
+
+    def compute() -> CachedResponse:
+        calls.append(1)
+        time.sleep(0.05)
+        return CachedResponse(body=b'{"id": 1}', etag="abc", last_modified=None)
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.get_or_compute("articles:1", compute))
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(entry.body == b'{"id": 1}' for entry, _ in results)
+    assert len([hit for _, hit in results if hit]) == 7
+    assert cache.stats()["hit_ratio"] == 7 / 8
+
+    list_key = cache.list_key(b"limit=5")
+    cache.get_or_compute(list_key, compute)
+    article_key = cache.article_key(1)
+    cache.get_or_compute(article_key, compute)
+    cache.invalidate_articles([1])
+    assert server.get(f"userarticlesmanager:{article_key}") is None
+    assert cache.list_key(b"limit=5") != list_key
+
+    # Retiring all articles changes the keys instead of deleting entries
+    cache.get_or_compute(article_key, compute)
+    cache.invalidate_all_articles()
+    assert cache.article_key(1) != article_key
+
+    cache.clear()
+    assert server.data == {}
+
+
+def test_get_articles_sparse_fieldset(client, app, get_access_token) -> None:
+    """Test that `fields` limits the response and never selects the other columns."""
+    with app.app_context():
+        article = Article(title="Long read", content="x" * 10_000, user_id=1)
+        db.session.add(article)
+        db.session.commit()
+        article_id = article.id
+
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        listing = client.get("/api/articles?fields=title,id", headers=headers)
+        single = client.get(f"/api/articles/{article_id}?fields=title", headers=headers)
+        search = client.get("/api/articles/search?q=long&fields=id", headers=headers)
+        export = client.get(
+            "/api/articles/export?format=csv&fields=id,title", headers=headers
+        )
+        export_rows = list(csv.DictReader(io.StringIO(export.get_data(as_text=True))))
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert listing.get_json()["items"] == [{"id": article_id, "title": "Long read"}]
+    assert single.get_json() == {"title": "Long read"}
+    assert search.get_json() == [{"id": article_id}]
+    assert export_rows == [{"id": str(article_id), "title": "Long read"}]
+    assert not [s for s in statements if "articles.content" in s]
+
+    full = client.get(f"/api/articles/{article_id}", headers=headers)
+    assert full.headers["ETag"] != single.headers["ETag"]
+
+
+def test_get_articles_unknown_field(client, get_access_token) -> None:
+    """Test that unknown fields are rejected."""
+    access_token = get_access_token("admin_user", "admin_password")
+
+    response = client.get(
+        "/api/articles?fields=title,password",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == 400
+    assert "password" in response.get_json()["message"]
+
+
+def test_article_datetimes_serialized_as_iso8601(client, get_access_token) -> None:
+    """Test that timestamps are written as ISO 8601 UTC strings."""
+    access_token = get_access_token("admin_user", "admin_password")
+
+    response = client.post(
+        "/api/articles",
+        headers={"Authorization": f"Bearer {access_token}"},
+        json={"title": "Dated", "content": "Body"},
+    )
+    created_at = response.get_json()["created_at"]
+    assert created_at.endswith("Z")
+    assert datetime.fromisoformat(created_at).tzinfo is not None
+
+
+def test_json_providers_produce_identical_documents(app) -> None:
+    """Test that the orjson and stdlib providers render the same bytes."""
+    if orjson is None:
+        pytest.skip("orjson is not installed")
+    payload = {
+        "items": [
+            {
+                "id": 1,
+                "title": "Überschrift",
+                "created_at": datetime(2024, 12, 1, 12, 0, 0),
+                "updated_at": datetime(2024, 12, 1, 12, 0, 0, 250000),
+                "user_id": None,
+            }
+        ],
+        "next_cursor": None,
+    }
+
+    with app.app_context():
+        fast = OrjsonProvider(app).response(payload).get_data()
+        standard = StdlibJSONProvider(app).response(payload).get_data()  # type: ignore
+
+    assert fast == standard
+    assert b'"2024-12-01T12:00:00Z"' in fast
+
+
+def test_article_list_gzip_compressed(client, app, get_access_token) -> None:
+    """Test gzip negotiation, the size threshold and ETags of compressed bodies."""
+    with app.app_context():
+        db.session.add_all(
+            [
+                Article(title=f"Long {i}", content="lorem ipsum " * 200, user_id=1)
+                for i in range(5)
+            ]
+        )
+        small = Article(title="Small", content="Short", user_id=1)
+        db.session.add(small)
+        db.session.commit()
+        small_id = small.id
+
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+    gzip_headers = {**headers, "Accept-Encoding": "gzip, deflate"}
+
+    plain = client.get("/api/articles", headers=headers)
+    compressed = client.get("/api/articles", headers=gzip_headers)
+    assert "Content-Encoding" not in plain.headers
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert gzip.decompress(compressed.data) == plain.data
+    assert len(compressed.data) < len(plain.data) / 5
+
+    etag = compressed.headers["ETag"]
+    assert etag.endswith('-gzip"')
+    response = client.get(
+        "/api/articles", headers={**gzip_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    response = client.get(f"/api/articles/{small_id}", headers=gzip_headers)
+    assert "Content-Encoding" not in response.headers
+    response = client.patch(
+        f"/api/articles/{small_id}",
+        headers={**gzip_headers, "If-Match": response.headers["ETag"]},
+        json={"title": "Still small"},
+    )
+    assert response.status_code == 200
+
+    response = client.get(
+        "/api/articles", headers={**headers, "Accept-Encoding": "gzip;q=0"}
+    )
+    assert "Content-Encoding" not in response.headers
+
+
+def test_export_articles_streamed_gzip(
+    client, app, get_access_token, monkeypatch
+) -> None:
+    """Test that streamed exports are compressed chunk by chunk."""
+    monkeypatch.setitem(app.config, "EXPORT_BATCH_SIZE", 2)
+    with app.app_context():
+        db.session.add_all(
+            [Article(title=f"Export {i}", content="Body", user_id=1) for i in range(5)]
+        )
+        db.session.commit()
+
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    plain = client.get("/api/articles/export", headers=headers).data
+    response = client.get(
+        "/api/articles/export",
+        headers={**headers, "Accept-Encoding": "gzip"},
+        buffered=False,
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    chunks = list(response.response)
+    response.close()
+
+    assert len(chunks) > 2
+    assert gzip.decompress(b"".join(chunks)) == plain
+
+
+@contextmanager
+def _replica_app(tmp_path, response_cache_backend: str):
+    """An app whose replica is a copy of the primary missing its last article.
+
+    Yields the app, the writer's user ID and the ID of the unreplicated article.
+    """
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+
+    class ReplicaConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{primary}"
+        SQLALCHEMY_BINDS = {"replica_0": f"sqlite:///{replica}"}
+        REPLICA_STICKY_SECONDS = 60
+        REPLICA_STICKY_BACKEND = "memory"
+        RESPONSE_CACHE_BACKEND = response_cache_backend
+
+    replica_app = create_app(ReplicaConfig)  # type: ignore[arg-type]
+    register_routes(replica_app)
+    with replica_app.app_context():
+        db.create_all()
+        db.session.add_all(
+            [
+                User(username="writer", password="writer_pw", role=UserRoles.ADMIN),
+                User(username="reader", password="reader_pw", role=UserRoles.VIEWER),
+            ]
+        )
+        db.session.commit()
+        writer_id = db.session.execute(
+            db.select(User.id).filter_by(username="writer")
+        ).scalar_one()
+        # "Replicate" the users, then write an article the replica has not seen yet
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+        shutil.copy(primary, replica)
+        unreplicated = Article(title="Lagging", content="Not on the replica", user_id=1)
+        db.session.add(unreplicated)
+        db.session.commit()
+        unreplicated_id = unreplicated.id
+
+    try:
+        yield replica_app, writer_id, unreplicated_id
+    finally:
+        with replica_app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+        # init_app registered metadata for the replica bind on the shared extension
+        db.metadatas.pop("replica_0", None)
+
+
+def _login(client, username: str, password: str) -> dict:
+    response = client.post(
+        "/api/login", json={"username": username, "password": password}
+    )
+    return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+
+
+def test_reads_routed_to_replica_with_read_your_writes(tmp_path) -> None:
+    """Test that GET requests read from the replica unless the client just wrote."""
+    with _replica_app(tmp_path, "none") as (replica_app, writer_id, unreplicated_id):
+        # Both clients share one address, as behind a proxy or NAT
+        writer = replica_app.test_client()
+        reader = replica_app.test_client()
+        writer_headers = _login(writer, "writer", "writer_pw")
+        reader_headers = _login(reader, "reader", "reader_pw")
+
+        # Reads go to the replica, which lags behind the primary
+        response = writer.get(
+            f"/api/articles/{unreplicated_id}", headers=writer_headers
+        )
+        assert response.status_code == 404
+
+        response = writer.post(
+            "/api/articles",
+            json={"title": "Fresh", "content": "Just written", "user_id": writer_id},
+            headers=writer_headers,
+        )
+        assert response.status_code == 201
+        article_id = response.get_json()["id"]
+
+        # The writer now reads its own write from the primary; other clients do not
+        response = writer.get(f"/api/articles/{article_id}", headers=writer_headers)
+        assert response.status_code == 200
+        assert response.get_json()["title"] == "Fresh"
+        response = reader.get(f"/api/articles/{article_id}", headers=reader_headers)
+        assert response.status_code == 404
+
+
+def test_response_cache_filled_from_primary_with_replicas(tmp_path) -> None:
+    """Test that cached article responses, shared by all clients, never come
+    from a lagging replica, while uncached reads still use it."""
+    with _replica_app(tmp_path, "memory") as (replica_app, writer_id, unreplicated_id):
+        writer = replica_app.test_client()
+        reader = replica_app.test_client()
+        writer_headers = _login(writer, "writer", "writer_pw")
+        reader_headers = _login(reader, "reader", "reader_pw")
+
+        # Filled by a client that has not written, still from the primary
+        response = reader.get("/api/articles", headers=reader_headers)
+        assert response.headers["X-Cache"] == "MISS"
+        assert [item["id"] for item in response.get_json()["items"]] == [
+            unreplicated_id
+        ]
+        response = reader.get(
+            f"/api/articles/{unreplicated_id}", headers=reader_headers
+        )
+        assert response.status_code == 200
+        # Sparse fieldsets are not cached and read from the replica
+        response = reader.get(
+            f"/api/articles/{unreplicated_id}?fields=id,title", headers=reader_headers
+        )
+        assert response.status_code == 404
+
+        response = writer.patch(
+            f"/api/articles/{unreplicated_id}",
+            json={"title": "Edited"},
+            headers=writer_headers,
+        )
+        assert response.status_code == 200
+
+        # The writer's own write comes back, not a stale copy from the replica
+        for client, headers in ((writer, writer_headers), (reader, reader_headers)):
+            response = client.get(f"/api/articles/{unreplicated_id}", headers=headers)
+            assert response.get_json()["title"] == "Edited"
+            response = client.get("/api/articles", headers=headers)
+            assert response.get_json()["items"][0]["title"] == "Edited"
+        assert response.headers["X-Cache"] == "HIT"
+
+
+def test_server_timing_and_slow_query_log(
+    client, app, get_access_token, monkeypatch, caplog
+) -> None:
+    """Test the Server-Timing header and the slow-query log."""
+    with app.app_context():
+        db.session.add(Article(title="Timed", content="Content", user_id=1))
+        db.session.commit()
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    with count_queries() as stats:
+        response = client.get("/api/articles?limit=5", headers=headers)
+    assert response.status_code == 200
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    assert f'desc="{stats.queries} queries"' in timing
+    assert "app;dur=" in timing
+    assert "Slow query" not in caplog.text
+
+    monkeypatch.setitem(app.config, "SLOW_QUERY_THRESHOLD_MS", 1e-6)
+    client.get("/api/articles?limit=6", headers=headers)
+    assert "Slow query" in caplog.text
+    assert "article_routes.get_articles" in caplog.text
+
+
+def test_query_budget_catches_n_plus_one(
+    client, app, get_access_token, monkeypatch
+) -> None:
+    """Test that a view running a query per article exceeds its query budget."""
+    with app.app_context():
+        db.session.add_all(
+            [Article(title=f"N+1 {i}", content="Content", user_id=1) for i in range(3)]
+        )
+        db.session.commit()
+    access_token = get_access_token("admin_user", "admin_password")
+    routes = sys.modules["userarticlesmanager.routes.article_routes"]
+    paginate_keyset = routes.paginate_keyset
+
+    def paginate_and_load_authors(*args, **kwargs):
+        articles, next_cursor = paginate_keyset(*args, **kwargs)
+        for article in articles:
+            db.session.execute(select(User.username).where(User.id == article.user_id))
+        return articles, next_cursor
+
+    monkeypatch.setattr(routes, "paginate_keyset", paginate_and_load_authors)
+
+    with pytest.raises(QueryBudgetExceeded, match="repeated: 3x SELECT users.username"):
+        client.get("/api/articles", headers={"Authorization": f"Bearer {access_token}"})
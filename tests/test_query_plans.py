@@ -0,0 +1,119 @@
+from sqlalchemy import event
+from userarticlesmanager.models.user import User, UserRoles
+from userarticlesmanager.models.article import Article
+from userarticlesmanager.extensions import db
+
+
+def _explain_article_queries(app, send_requests) -> list[tuple[str, list[str]]]:
+    """Run requests, then EXPLAIN every statement they issued against `articles`."""
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if "articles" in statement and not statement.startswith("INSERT"):
+            captured.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        send_requests()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    plans = []
+    with app.app_context(), db.engine.connect() as connection:
+        for statement, parameters in captured:
+            rows = connection.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            ).fetchall()
+            plans.append((statement, [row[-1] for row in rows]))
+    return plans
+
+
+def _assert_no_full_scan(plans: list[tuple[str, list[str]]]) -> None:
+    for statement, details in plans:
+        assert not [d for d in details if d == "SCAN articles"], statement
+
+
+def test_article_list_pages_use_created_at_index(client, app, get_access_token) -> None:
+    """Test that listing and paging articles seeks into the (created_at, id) index."""
+    with app.app_context():
+        db.session.add_all(
+            [Article(title=f"Article {i}", content="Body", user_id=1) for i in range(5)]
+        )
+        db.session.commit()
+
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+    cursor = client.get("/api/articles?limit=2", headers=headers).get_json()[
+        "next_cursor"
+    ]
+
+    plans = _explain_article_queries(
+        app,
+        lambda: client.get(f"/api/articles?limit=2&after={cursor}", headers=headers),
+    )
+
+    _assert_no_full_scan(plans)
+    assert any(
+        "USING INDEX ix_articles_created_at_id (created_at>?)" in detail
+        for _, details in plans
+        for detail in details
+    )
+
+
+def test_user_article_queries_use_user_id_index(client, app, get_access_token) -> None:
+    """Test that per-user article lookups and deletes use the user_id index."""
+    with app.app_context():
+        author = User(username="author", password="password", role=UserRoles.VIEWER)
+        db.session.add(author)
+        db.session.commit()
+        author_id = author.id
+        db.session.add_all(
+            [
+                Article(title=f"Post {i}", content="Body", user_id=author_id)
+                for i in range(3)
+            ]
+        )
+        db.session.commit()
+
+    access_token = get_access_token("admin_user", "admin_password")
+
+    plans = _explain_article_queries(
+        app,
+        lambda: client.delete(
+            f"/api/users/{author_id}",
+            headers={"Authorization": f"Bearer {access_token}"},
+        ),
+    )
+
+    _assert_no_full_scan(plans)
+    assert any(
+        "ix_articles_user_id (user_id=?)" in detail
+        for _, details in plans
+        for detail in details
+    )
+
+
+def test_article_by_id_queries_use_primary_key(client, app, get_access_token) -> None:
+    """Test that single-article reads, updates and deletes search by primary key."""
+    with app.app_context():
+        article = Article(title="Single", content="Body", user_id=1)
+        db.session.add(article)
+        db.session.commit()
+        article_id = article.id
+
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    def send_requests() -> None:
+        client.get(f"/api/articles/{article_id}", headers=headers)
+        client.patch(
+            f"/api/articles/{article_id}", headers=headers, json={"title": "New"}
+        )
+        client.delete(f"/api/articles/{article_id}", headers=headers)
+
+    plans = _explain_article_queries(app, send_requests)
+
+    assert plans
+    _assert_no_full_scan(plans)
@@ -0,0 +1,267 @@
+import sys
+import threading
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from userarticlesmanager.extensions import create_app, db
+from userarticlesmanager.routes import register_routes
+from userarticlesmanager.test_config import TestConfig
+from userarticlesmanager.utils.db_engine import (
+    InstrumentedQueuePool,
+    engine_options,
+    pool_stats,
+)
+from userarticlesmanager.utils.rate_limit import (
+    ConcurrencyLimiter,
+    MemoryRateLimitStore,
+    RateLimiter,
+    RedisRateLimitStore,
+    take_token,
+)
+
+
+def test_liveness(client) -> None:
+    """Test that the liveness probe answers without authentication."""
+    response = client.get("/healthz")
+    assert response.status_code == 200
+    assert response.get_json() == {"status": "ok"}
+
+
+def test_readiness(client) -> None:
+    """Test that the readiness probe checks the database."""
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["status"] == "ok"
+    assert "pool" in data
+
+
+def test_readiness_database_unreachable(client, monkeypatch) -> None:
+    """Test that the readiness probe reports 503 when the database cannot be reached."""
+
+    def fail(*args, **kwargs) -> None:
+        raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+    monkeypatch.setattr(db.session, "execute", fail)
+
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.get_json()["status"] == "unavailable"
+
+
+def test_engine_options_from_settings() -> None:
+    """Test that pool settings apply to server databases but not to SQLite."""
+    assert engine_options("sqlite:///:memory:") == {}
+
+    options = engine_options(
+        "postgresql://user:secret@db/articles",
+        pool_size=8,
+        max_overflow=2,
+        pool_timeout=3,
+        pool_recycle=600,
+        pool_pre_ping=True,
+        statement_timeout_ms=15000,
+    )
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 8
+    assert options["max_overflow"] == 2
+    assert options["pool_timeout"] == 3
+    assert options["pool_recycle"] == 600
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"]["options"] == "-c statement_timeout=15000"
+
+
+def test_pool_metrics_record_occupancy_and_waits(tmp_path) -> None:
+    """Test that the instrumented pool reports checked-out connections and timeouts."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            stats = pool_stats(engine)
+            assert stats["checked_out"] == 1
+            assert stats["size"] == 1
+
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+
+        stats = pool_stats(engine)
+        assert stats["checked_out"] == 0
+        assert stats["checkouts"] == 2
+        assert stats["checkout_timeouts"] == 1
+        assert stats["wait_seconds_max"] >= 0.05
+    finally:
+        engine.dispose()
+
+
+def test_metrics_prometheus_format(client, get_access_token) -> None:
+    """Test that /metrics reports requests, queries and cache figures."""
+    access_token = get_access_token("admin_user", "admin_password")
+    client.get("/api/articles", headers={"Authorization": f"Bearer {access_token}"})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    body = response.get_data(as_text=True)
+    assert "# TYPE http_requests_total counter" in body
+    assert (
+        'http_requests_total{method="GET",endpoint="article_routes.get_articles",'
+        'status="200"}' in body
+    )
+    assert (
+        'http_request_duration_seconds_bucket{endpoint="article_routes.get_articles",'
+        'le="+Inf"}' in body
+    )
+    assert "# TYPE db_queries_total counter" in body
+    assert "response_cache_hits_total" in body
+    assert "current_user_cache_entries" in body
+
+
+def test_rate_limit_per_client(client, app, get_access_token, monkeypatch) -> None:
+    """Test that clients over their token bucket get 429 with Retry-After."""
+    admin_token = get_access_token("admin_user", "admin_password")
+    viewer_token = get_access_token("test_user", "test_password")
+    monkeypatch.setitem(
+        app.extensions,
+        "rate_limiter",
+        RateLimiter(
+            {
+                "user_routes.login": (0.01, 2),
+                "article_routes.search_articles": (0.01, 1),
+            },
+            MemoryRateLimitStore(maxsize=100),
+        ),
+    )
+    credentials = {"username": "test_user", "password": "test_password"}
+
+    assert client.post("/api/login", json=credentials).status_code == 200
+    assert client.post("/api/login", json=credentials).status_code == 200
+    response = client.post("/api/login", json=credentials)
+    assert response.status_code == 429
+    assert response.get_json()["message"] == "Too many requests, try again later"
+    assert 1 <= int(response.headers["Retry-After"]) <= 100
+
+    # Authenticated clients are limited by identity, each with their own bucket
+    for token in (admin_token, viewer_token):
+        headers = {"Authorization": f"Bearer {token}"}
+        response = client.get("/api/articles/search?q=missing", headers=headers)
+        assert response.status_code == 404
+        response = client.get("/api/articles/search?q=missing", headers=headers)
+        assert response.status_code == 429
+
+    body = client.get("/metrics").get_data(as_text=True)
+    assert (
+        'http_requests_rejected_total{reason="rate_limit",'
+        'endpoint="user_routes.login"} 1' in body
+    )
+    assert (
+        'http_requests_rejected_total{reason="rate_limit",'
+        'endpoint="article_routes.search_articles"} 2' in body
+    )
+
+
+def test_rate_limit_uses_forwarded_address_behind_proxy() -> None:
+    """Test that TRUSTED_PROXIES gives anonymous clients behind a proxy their own bucket."""
+
+    class ProxiedConfig(TestConfig):
+        TRUSTED_PROXIES = 1
+        RATE_LIMITS = {"user_routes.login": (0.01, 1)}
+
+    proxied_app = create_app(ProxiedConfig)  # type: ignore[arg-type]
+    register_routes(proxied_app)
+    client = proxied_app.test_client()  # every request comes from one proxy
+
+    def login(forwarded_for: str) -> int:
+        return client.post(
+            "/api/login", json={}, headers={"X-Forwarded-For": forwarded_for}
+        ).status_code
+
+    assert login("203.0.113.1") == 400
+    assert login("203.0.113.1") == 429
+    assert login("203.0.113.2") == 400
+    # Only the address added by the trusted proxy counts, not a client's own
+    assert login("198.51.100.7, 203.0.113.2") == 429
+
+
+def test_concurrency_cap_rejects_instead_of_queueing(
+    client, app, get_access_token, monkeypatch
+) -> None:
+    """Test that a request over an endpoint's concurrency cap gets 503 right away."""
+    headers = {
+        "Authorization": f"Bearer {get_access_token('test_user', 'test_password')}"
+    }
+    limiter = ConcurrencyLimiter({"article_routes.search_articles": 1})
+    monkeypatch.setitem(app.extensions, "concurrency_limiter", limiter)
+    entered, release = threading.Event(), threading.Event()
+
+    def slow_search(*args, **kwargs) -> list:
+        entered.set()
+        release.wait(5)
+        return []
+
+    monkeypatch.setattr(
+        sys.modules["userarticlesmanager.routes.article_routes"],
+        "full_text_search",
+        slow_search,
+    )
+    statuses = []
+    first = threading.Thread(
+        target=lambda: statuses.append(
+            app.test_client()
+            .get("/api/articles/search?q=a", headers=headers)
+            .status_code
+        )
+    )
+    first.start()
+    assert entered.wait(5)
+
+    response = client.get("/api/articles/search?q=a", headers=headers)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert client.get("/api/articles", headers=headers).status_code == 200
+
+    release.set()
+    first.join()
+    assert statuses == [404]
+    assert limiter.in_flight["article_routes.search_articles"] == 0
+    response = client.get("/api/articles/search?q=a", headers=headers)
+    assert response.status_code == 404
+
+
+class _ScriptingStandIn:
+    """Local stand-in for a Redis server, running the token bucket script's logic."""
+
+    def __init__(self) -> None:
+        self.buckets: dict[str, tuple[float, float]] = {}
+        self.now = 1000.0
+
+    def eval(self, script, numkeys, key, rate, burst):
+        tokens, updated_at = self.buckets.get(key, (float(burst), self.now))
+        tokens, retry_after = take_token(tokens, updated_at, self.now, rate, burst)
+        self.buckets[key] = (tokens, self.now)
+        return str(retry_after).encode()
+
+
+def test_shared_rate_limit_store_across_workers() -> None:
+    """Test that limiters of different workers drain one shared bucket."""
+    server = _ScriptingStandIn()
+    workers = [
+        RateLimiter({"user_routes.login": (2.0, 3)}, RedisRateLimitStore(server))
+        for _ in range(2)
+    ]
+
+    waits = [workers[n % 2].check("user_routes.login", "addr:1") for n in range(4)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.5)
+    assert list(server.buckets) == [
+        "userarticlesmanager:ratelimit:user_routes.login:addr:1"
+    ]
+
+    server.now += 0.5
+    assert workers[1].check("user_routes.login", "addr:1") == 0.0
+    assert workers[0].check("user_routes.search_users", "addr:1") == 0.0
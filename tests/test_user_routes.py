@@ -1,4 +1,17 @@
+import sys
+import time
+import pytest
+from flask_jwt_extended import create_access_token, decode_token
+from sqlalchemy import event
 from userarticlesmanager.models.user import User, UserRoles
+from userarticlesmanager.models.article import Article
+from userarticlesmanager.services.user_service import (
+    mark_user_deleting,
+    purge_user,
+    reconcile_article_counts,
+)
+from userarticlesmanager.utils.database import generate_sample_data
+from userarticlesmanager.utils.passwords import PasswordHasher, PasswordHasherBusy
 from userarticlesmanager.extensions import db
 
 
@@ -13,6 +26,98 @@ def test_login_success(client) -> None:
     assert data["message"] == "Login successful"
 
 
+def test_login_rehashes_password_with_new_parameters(client, app, monkeypatch) -> None:
+    """Test that a hash made with outdated parameters is replaced on login."""
+    monkeypatch.setitem(
+        app.extensions, "password_hasher", PasswordHasher(method="pbkdf2:sha256:2000")
+    )
+
+    response = client.post(
+        "/api/login", json={"username": "test_user", "password": "test_password"}
+    )
+    assert response.status_code == 200
+
+    with app.app_context():
+        user = User.query.filter_by(username="test_user").first()
+        assert user.password_hash.startswith("pbkdf2:sha256:2000$")
+        assert user.check_password("test_password")
+
+
+def test_password_hasher_verifies_on_process_pool() -> None:
+    """Test verification and hashing on the process pool."""
+    hasher = PasswordHasher(method="pbkdf2:sha256:1000", workers=1)
+    try:
+        password_hash = hasher.hash("secret")
+        assert hasher.verify(password_hash, "secret")
+        assert not hasher.verify(password_hash, "wrong")
+        assert not hasher.needs_rehash(password_hash)
+        pooled_hash = hasher.pooled_hash("secret")
+        assert pooled_hash != password_hash  # salted anew
+        assert not hasher.needs_rehash(pooled_hash)
+        assert hasher.verify(pooled_hash, "secret")
+    finally:
+        hasher.shutdown()
+
+
+def test_password_hasher_rehashes_on_salt_length_change() -> None:
+    """Test that a hash with another salt length than configured is upgraded."""
+    password_hash = PasswordHasher(method="pbkdf2:sha256:1000").hash("secret")
+    assert not PasswordHasher(method="pbkdf2:sha256:1000").needs_rehash(password_hash)
+    longer_salt = PasswordHasher(method="pbkdf2:sha256:1000", salt_length=24)
+    assert longer_salt.needs_rehash(password_hash)
+    assert not longer_salt.needs_rehash(longer_salt.hash("secret"))
+
+
+def test_password_hasher_timeout_keeps_slot_until_done(
+    client, monkeypatch, app
+) -> None:
+    """Test that a timed-out hash is a 503 and holds its slot until it finishes."""
+    hasher = PasswordHasher(
+        method="pbkdf2:sha256:1000", workers=1, max_pending=1, timeout=0
+    )
+    monkeypatch.setitem(app.extensions, "password_hasher", hasher)
+
+    def wait_for_free_slot() -> None:
+        deadline = time.monotonic() + 10
+        while not hasher._slots.acquire(blocking=False):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        hasher._slots.release()
+
+    try:
+        response = client.post(
+            "/api/login", json={"username": "test_user", "password": "test_password"}
+        )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+        # A job that outlives its caller's wait keeps the only slot taken
+        wait_for_free_slot()
+        slow_hash = PasswordHasher(method="pbkdf2:sha256:500000").hash("secret")
+        with pytest.raises(PasswordHasherBusy, match="timed out"):
+            hasher.verify(slow_hash, "secret")
+        with pytest.raises(PasswordHasherBusy, match="in progress"):
+            hasher.verify(slow_hash, "secret")
+        wait_for_free_slot()
+    finally:
+        hasher.shutdown()
+
+
+def test_login_rejected_when_hasher_saturated(client, app, monkeypatch) -> None:
+    """Test that logins fail fast with 503 when no verification slot is free."""
+    monkeypatch.setitem(
+        app.extensions,
+        "password_hasher",
+        PasswordHasher(method="pbkdf2:sha256:1000", workers=1, max_pending=0),
+    )
+
+    response = client.post(
+        "/api/login", json={"username": "test_user", "password": "test_password"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
 def test_list_users_admin(client, app, get_access_token) -> None:
     """Test getting a list of users as an admin."""
     with app.app_context():
@@ -32,6 +137,139 @@ def test_list_users_admin(client, app, get_access_token) -> None:
     assert isinstance(data, list)
 
 
+def test_article_counts_follow_article_writes(client, app, get_access_token) -> None:
+    """Test that every article write path keeps the stored article count in step."""
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+    with app.app_context():
+        author = User(username="author", password="password")
+        db.session.add(author)
+        db.session.commit()
+        author_id = author.id
+
+    created = [
+        client.post(
+            "/api/articles",
+            json={"title": f"Article {n}", "content": "Content", "user_id": author_id},
+            headers=headers,
+        ).get_json()["id"]
+        for n in range(3)
+    ]
+    response = client.post(
+        "/api/articles/bulk",
+        json={
+            "operations": [
+                {
+                    "action": "create",
+                    "title": "A",
+                    "content": "C",
+                    "user_id": author_id,
+                },
+                {
+                    "action": "create",
+                    "title": "B",
+                    "content": "C",
+                    "user_id": author_id,
+                },
+                {"action": "delete", "id": created[0]},
+            ]
+        },
+        headers=headers,
+    )
+    assert response.get_json()["succeeded"] == 3
+    assert (
+        client.delete(f"/api/articles/{created[1]}", headers=headers).status_code == 200
+    )
+
+    # The test configuration enforces the views' query budget of one query
+    response = client.get("/api/users?article_count=true", headers=headers)
+    assert response.status_code == 200
+    counts = {user["username"]: user["article_count"] for user in response.get_json()}
+    assert counts == {"test_user": 0, "admin_user": 0, "author": 3}
+
+    response = client.get(f"/api/users/{author_id}?article_count=1", headers=headers)
+    assert response.get_json()["article_count"] == 3
+    response = client.get("/api/users/9999?article_count=1", headers=headers)
+    assert response.status_code == 404
+    response = client.get("/api/users", headers=headers)
+    assert "article_count" not in response.get_json()[0]
+
+    with app.app_context():
+        purge_user(author_id, chunk_size=2)
+        assert reconcile_article_counts(repair=False) == []
+
+
+def test_reconcile_article_counts_command_repairs_drift(app) -> None:
+    """Test that the reconcile command reports and repairs drifted counts."""
+    with app.app_context():
+        author = User(username="author", password="password")
+        db.session.add(author)
+        db.session.flush()
+        # Written without adjusting the counter, as a raw SQL import would
+        db.session.add_all(
+            Article(title=f"Article {n}", content="Content", user_id=author.id)
+            for n in range(2)
+        )
+        db.session.commit()
+        author_id = author.id
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=["reconcile-article-counts", "--dry-run"])
+    assert result.exit_code == 1
+    assert f"user {author_id}: stored 0, actual 2" in result.output
+
+    result = runner.invoke(args=["reconcile-article-counts", "--chunk-size", "1"])
+    assert result.exit_code == 0
+    assert "Repaired the article counts of 1 users" in result.output
+
+    result = runner.invoke(args=["reconcile-article-counts", "--dry-run"])
+    assert result.exit_code == 0
+    assert "All article counts are correct" in result.output
+    with app.app_context():
+        assert User.query.get(author_id).article_count == 2
+
+
+def test_list_user_articles_paginated(client, app, get_access_token) -> None:
+    """Test paging through one user's articles."""
+    with app.app_context():
+        author = User(username="author", password="password")
+        other = User(username="other", password="password")
+        db.session.add_all([author, other])
+        db.session.flush()
+        db.session.add_all(
+            Article(title=f"Article {n}", content="Content", user_id=author.id)
+            for n in range(5)
+        )
+        db.session.add(Article(title="Other", content="Content", user_id=other.id))
+        db.session.commit()
+        author_id = author.id
+    headers = {
+        "Authorization": f"Bearer {get_access_token('test_user', 'test_password')}"
+    }
+
+    response = client.get(f"/api/users/{author_id}/articles?limit=3", headers=headers)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [item["title"] for item in data["items"]] == [
+        "Article 0",
+        "Article 1",
+        "Article 2",
+    ]
+    response = client.get(
+        f"/api/users/{author_id}/articles?limit=3&after={data['next_cursor']}"
+        "&fields=title",
+        headers=headers,
+    )
+    data = response.get_json()
+    assert data["items"] == [{"title": "Article 3"}, {"title": "Article 4"}]
+    assert data["next_cursor"] is None
+
+    response = client.get("/api/users/9999/articles", headers=headers)
+    assert response.status_code == 404
+    response = client.get(f"/api/users/{author_id}/articles?limit=0", headers=headers)
+    assert response.status_code == 400
+
+
 def test_list_users_non_admin(client, get_access_token) -> None:
     """Test that non-admin cannot access the user list."""
     access_token = get_access_token("test_user", "test_password")
@@ -122,6 +360,70 @@ def test_search_users(client, app, get_access_token) -> None:
     assert data[1]["username"] == "search_user2"
 
 
+def test_search_users_substring_and_pagination(client, app, get_access_token) -> None:
+    """Test that username search matches substrings and pages with `limit`/`offset`."""
+    with app.app_context():
+        db.session.add_all(
+            [
+                User(username=f"team_{name}_lead", password="password")
+                for name in ("alpha", "beta", "gamma")
+            ]
+        )
+        db.session.commit()
+
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = client.get("/api/users/search?username=_LEAD&limit=2", headers=headers)
+    assert response.status_code == 200
+    assert [user["username"] for user in response.get_json()] == [
+        "team_alpha_lead",
+        "team_beta_lead",
+    ]
+
+    response = client.get(
+        "/api/users/search?username=_lead&limit=2&offset=2", headers=headers
+    )
+    assert [user["username"] for user in response.get_json()] == ["team_gamma_lead"]
+
+
+def test_search_users_follows_renames(client, app, get_access_token) -> None:
+    """Test that the username index picks up users renamed through the API."""
+    with app.app_context():
+        user = User(username="before_rename", password="password")
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+    access_token = get_access_token("admin_user", "admin_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    assert (
+        client.get("/api/users/search?username=before", headers=headers).status_code
+        == 200
+    )
+    client.patch(f"/api/users/{user_id}", headers=headers, json={"username": "after"})
+
+    assert (
+        client.get("/api/users/search?username=before", headers=headers).status_code
+        == 404
+    )
+    response = client.get("/api/users/search?username=after", headers=headers)
+    assert [user["id"] for user in response.get_json()] == [str(user_id)]
+
+
+def test_search_users_requires_username(client, get_access_token) -> None:
+    """Test that an empty search term is rejected instead of listing every user."""
+    access_token = get_access_token("admin_user", "admin_password")
+
+    response = client.get(
+        "/api/users/search?username=",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Username parameter is required"
+
+
 def test_login_invalid_password(client) -> None:
     """Test login with invalid password."""
     response = client.post(
@@ -246,3 +548,364 @@ def test_update_nonexistent_user(client, get_access_token) -> None:
     assert response.status_code == 404
     data = response.get_json()
     assert data["message"] == "User not found"
+
+
+def _count_user_queries(app, send_request):
+    """Send a request and return its response with the number of users table queries."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = send_request()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return response, len([s for s in statements if "FROM users" in s])
+
+
+def test_current_user_cached_for_tokens_without_role_claims(client, app) -> None:
+    """Test that tokens without role claims are authorized from the user cache."""
+    with app.app_context():
+        user_id = User.query.filter_by(username="test_user").first().id
+        legacy_token = create_access_token(identity=str(user_id))
+    headers = {"Authorization": f"Bearer {legacy_token}"}
+    client.get("/api/articles", headers=headers)
+
+    response, user_queries = _count_user_queries(
+        app, lambda: client.get("/api/articles", headers=headers)
+    )
+
+    assert response.status_code == 200
+    assert user_queries == 0
+    assert app.extensions["current_user_cache"].hits >= 1
+
+
+def test_role_claims_authorize_without_user_queries(
+    client, app, get_access_token
+) -> None:
+    """Test that a token's role claims authorize GET /api/articles/<id> on their own."""
+    with app.app_context():
+        article = Article(title="Claims", content="Body", user_id=1)
+        db.session.add(article)
+        db.session.commit()
+        article_id = article.id
+
+    access_token = get_access_token("test_user", "test_password")
+    headers = {"Authorization": f"Bearer {access_token}"}
+    with app.app_context():
+        claims = decode_token(access_token)
+    assert claims["role"] == UserRoles.VIEWER
+    assert claims["role_version"] == 0
+
+    response, user_queries = _count_user_queries(
+        app, lambda: client.get(f"/api/articles/{article_id}", headers=headers)
+    )
+
+    assert response.status_code == 200
+    assert user_queries == 0
+
+
+def test_role_change_revokes_older_tokens(client, app, get_access_token) -> None:
+    """Test that a role change made through update_user rejects tokens with the old role."""
+    with app.app_context():
+        admin_user = User(
+            username="admin_user", password="admin_password", role=UserRoles.ADMIN
+        )
+        db.session.add(admin_user)
+        db.session.commit()
+        viewer_id = User.query.filter_by(username="test_user").first().id
+
+    admin_token = get_access_token("admin_user", "admin_password")
+    viewer_token = get_access_token("test_user", "test_password")
+    viewer_headers = {"Authorization": f"Bearer {viewer_token}"}
+    assert client.get("/api/users", headers=viewer_headers).status_code == 403
+
+    client.patch(
+        f"/api/users/{viewer_id}",
+        headers={"Authorization": f"Bearer {admin_token}"},
+        json={"role": UserRoles.ADMIN},
+    )
+
+    response = client.get("/api/users", headers=viewer_headers)
+    assert response.status_code == 401
+    assert response.get_json()["msg"] == "Token has been revoked"
+
+    new_token = get_access_token("test_user", "test_password")
+    response = client.get(
+        "/api/users", headers={"Authorization": f"Bearer {new_token}"}
+    )
+    assert response.status_code == 200
+
+
+def test_changes_by_other_workers_revoke_tokens(
+    client, app, get_access_token, monkeypatch
+) -> None:
+    """Test that a demotion or delete made by another process rejects tokens
+    once this process's cached snapshot has expired."""
+    # Entries expire right away, as if the TTL had passed
+    monkeypatch.setattr(app.extensions["current_user_cache"], "ttl", 0)
+    admin_token = get_access_token("admin_user", "admin_password")
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    assert client.get("/api/users", headers=admin_headers).status_code == 200
+
+    # Changed straight in the database, without this process's invalidation
+    with app.app_context():
+        admin_user = User.query.filter_by(username="admin_user").first()
+        admin_user.role = UserRoles.VIEWER
+        admin_user.role_version += 1
+        db.session.commit()
+    response = client.get("/api/users", headers=admin_headers)
+    assert response.status_code == 401
+    assert response.get_json()["msg"] == "Token has been revoked"
+
+    with app.app_context():
+        viewer_id = User.query.filter_by(username="test_user").first().id
+        legacy_token = create_access_token(identity=str(viewer_id))
+    viewer_token = get_access_token("test_user", "test_password")
+    with app.app_context():
+        db.session.execute(db.delete(User).where(User.id == viewer_id))
+        db.session.commit()
+    for token in (viewer_token, legacy_token):
+        response = client.get(
+            "/api/articles", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 401
+
+
+def test_delete_user_removes_articles_set_based(client, app, get_access_token) -> None:
+    """Test that deleting a user removes their articles without loading them."""
+    with app.app_context():
+        author = User(username="prolific_author", password="password")
+        db.session.add(author)
+        db.session.commit()
+        author_id = author.id
+        db.session.add_all(
+            [
+                Article(title=f"Post {i}", content="Body", user_id=author_id)
+                for i in range(20)
+            ]
+        )
+        db.session.add(Article(title="Other", content="Body", user_id=1))
+        db.session.commit()
+
+    access_token = get_access_token("admin_user", "admin_password")
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.delete(
+            f"/api/users/{author_id}",
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert len([s for s in statements if s.startswith("DELETE")]) == 2
+    assert not [
+        s for s in statements if s.startswith("SELECT") and "FROM articles" in s
+    ]
+    with app.app_context():
+        assert Article.query.filter_by(user_id=author_id).count() == 0
+        assert Article.query.count() == 1
+
+
+def test_purge_user_deletes_in_chunks(app) -> None:
+    """Test the chunked purge used for background user deletion."""
+    with app.app_context():
+        author = User(username="prolific_author", password="password")
+        db.session.add(author)
+        db.session.commit()
+        author_id = author.id
+        db.session.add_all(
+            [
+                Article(title=f"Post {i}", content="Body", user_id=author_id)
+                for i in range(5)
+            ]
+        )
+        db.session.commit()
+
+        assert purge_user(author_id, chunk_size=2) == 5
+        assert Article.query.filter_by(user_id=author_id).count() == 0
+        assert db.session.get(User, author_id) is None
+
+
+def test_delete_user_background_mode(
+    client, app, get_access_token, monkeypatch
+) -> None:
+    """Test that background deletion answers 202 and hands the user to the purge."""
+    with app.app_context():
+        author = User(username="prolific_author", password="password")
+        db.session.add(author)
+        db.session.commit()
+        author_id = author.id
+
+    started = []
+    # The routes package exports the blueprint under the module's name
+    monkeypatch.setattr(
+        sys.modules["userarticlesmanager.routes.user_routes"],
+        "start_user_purge",
+        lambda app, user_id: started.append(user_id),
+    )
+    access_token = get_access_token("admin_user", "admin_password")
+    author_token = get_access_token("prolific_author", "password")
+
+    response = client.delete(
+        f"/api/users/{author_id}?mode=background",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == 202
+    assert response.get_json()["message"] == "User deletion started"
+    assert started == [author_id]
+
+    # Locked out while the purge runs, and on every worker (same database)
+    response = client.get(
+        "/api/articles", headers={"Authorization": f"Bearer {author_token}"}
+    )
+    assert response.status_code == 401
+    response = client.post(
+        "/api/login", json={"username": "prolific_author", "password": "password"}
+    )
+    assert response.status_code == 401
+
+
+def test_resume_user_purges_command(app) -> None:
+    """Test that the CLI finishes purges of users marked as being deleted."""
+    with app.app_context():
+        author = User(username="prolific_author", password="password")
+        db.session.add(author)
+        db.session.commit()
+        author_id = author.id
+        db.session.add_all(
+            [
+                Article(title=f"Post {i}", content="Body", user_id=author_id)
+                for i in range(3)
+            ]
+        )
+        db.session.commit()
+        mark_user_deleting(author_id)
+
+    result = app.test_cli_runner().invoke(
+        args=["resume-user-purges", "--chunk-size", "2"]
+    )
+    assert result.exit_code == 0
+    assert f"user {author_id}: purged with 3 articles" in result.output
+
+    with app.app_context():
+        assert db.session.get(User, author_id) is None
+        assert Article.query.filter_by(user_id=author_id).count() == 0
+    result = app.test_cli_runner().invoke(args=["resume-user-purges"])
+    assert "No interrupted user deletions" in result.output
+
+
+def test_generate_sample_data_is_deterministic_and_usable(client, app) -> None:
+    """Test that generated users can log in and generated articles are searchable."""
+    with app.app_context():
+        db.session.query(User).delete()
+        db.session.commit()
+        assert generate_sample_data(20, 50, content_size=80, seed=1) == (20, 50)
+        first = [(a.title, a.user_id) for a in Article.query.order_by(Article.id)]
+        roles = {user.username: user.role for user in User.query}
+
+        db.session.query(Article).delete()
+        db.session.query(User).delete()
+        db.session.commit()
+        generate_sample_data(20, 50, content_size=80, seed=1)
+        second = [(a.title, a.user_id) for a in Article.query.order_by(Article.id)]
+
+    assert [title for title, _ in first] == [title for title, _ in second]
+    assert len({user_id for _, user_id in first}) > 1
+    assert roles["user1"] == UserRoles.ADMIN
+    assert roles["user10"] == UserRoles.EDITOR
+    assert roles["user2"] == UserRoles.VIEWER
+
+    response = client.post(
+        "/api/login", json={"username": "user1", "password": "password"}
+    )
+    assert response.status_code == 200
+    token = response.get_json()["access_token"]
+    response = client.get(
+        f"/api/articles/search?q={first[0][0].split()[0]}",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.get_json()
+
+
+def test_generate_sample_data_continues_numbering_and_counts(app) -> None:
+    """Test that usernames continue after the last userN and counts survive a failure."""
+
+    def stop_after_first_batch(table: str, written: int) -> None:
+        if table == Article.__tablename__:
+            raise RuntimeError("interrupted")
+
+    with app.app_context():
+        db.session.query(User).delete()
+        db.session.add_all(
+            [
+                User(username="user7", password="x", role=UserRoles.VIEWER),
+                User(username="user12x", password="x", role=UserRoles.VIEWER),
+                User(username="username", password="x", role=UserRoles.VIEWER),
+            ]
+        )
+        db.session.commit()
+
+        with pytest.raises(RuntimeError):
+            generate_sample_data(
+                3, 20, content_size=40, batch_size=8, progress=stop_after_first_batch
+            )
+
+        names = {user.username for user in User.query}
+        assert {"user8", "user9", "user10"} <= names
+        assert Article.query.count() == 8
+        for user in User.query:
+            assert (
+                user.article_count == Article.query.filter_by(user_id=user.id).count()
+            )
+
+
+def test_create_sample_data_command_generates_rows(app) -> None:
+    """Test the --users/--articles options of the create-sample-data command."""
+    with app.app_context():
+        db.session.query(User).delete()
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(
+        args=[
+            "create-sample-data",
+            "--users",
+            "5",
+            "--articles",
+            "30",
+            "--batch-size",
+            "7",
+        ]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Generated 5 users and 30 articles" in result.output
+    assert "articles: 28 rows" in result.output
+
+    with app.app_context():
+        assert User.query.count() == 5
+        assert Article.query.count() == 30
+
+    # A second run continues the numbering instead of clashing with user1..user5
+    result = app.test_cli_runner().invoke(
+        args=["create-sample-data", "--users", "3", "--articles", "10"]
+    )
+    assert result.exit_code == 0, result.output
+    with app.app_context():
+        assert User.query.filter_by(username="user8").first() is not None
+        assert User.query.count() == 8
+        assert sum(user.article_count for user in User.query) == 40
+        assert reconcile_article_counts(repair=False) == []
@@ -1,6 +1,8 @@
 import os
 from dotenv import load_dotenv
 from datetime import timedelta
+from typing import Any
+from userarticlesmanager.utils.db_engine import engine_options, replica_binds
 
 load_dotenv()
 
@@ -14,3 +16,122 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS: bool = False
     JWT_SECRET_KEY: str = os.getenv("SECRET_KEY", "")  # Default to an empty string
     JWT_ACCESS_TOKEN_EXPIRES: timedelta = timedelta(hours=1)
+
+    # Connection pool (server databases only); stale connections are replaced on checkout
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_CONNECT_TIMEOUT: int = int(os.getenv("DB_CONNECT_TIMEOUT", "10"))
+    # Longest a single statement may run, in milliseconds (0 disables the limit)
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    # Tighter limits for endpoints whose queries depend on user input
+    SEARCH_STATEMENT_TIMEOUT_MS: int = int(
+        os.getenv("SEARCH_STATEMENT_TIMEOUT_MS", "5000")
+    )
+    STATEMENT_TIMEOUTS_MS: dict[str, int] = {
+        "article_routes.search_articles": SEARCH_STATEMENT_TIMEOUT_MS,
+        "user_routes.search_users": SEARCH_STATEMENT_TIMEOUT_MS,
+    }
+    _ENGINE_SETTINGS: dict[str, Any] = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "statement_timeout_ms": DB_STATEMENT_TIMEOUT_MS,
+        "connect_timeout": DB_CONNECT_TIMEOUT,
+    }
+    SQLALCHEMY_ENGINE_OPTIONS: dict[str, Any] = engine_options(
+        SQLALCHEMY_DATABASE_URI, **_ENGINE_SETTINGS
+    )
+
+    # Read replicas (comma-separated URLs): GET requests read from one of them
+    DATABASE_REPLICA_URLS: list[str] = [
+        url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    ]
+    SQLALCHEMY_BINDS: dict[str, Any] = replica_binds(
+        [url for url in DATABASE_REPLICA_URLS if url], **_ENGINE_SETTINGS
+    )
+    # Seconds a client reads from the primary after writing, to see its own writes
+    REPLICA_STICKY_SECONDS: float = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+    # Where those clients are remembered: redis (shared by all workers) or memory
+    REPLICA_STICKY_BACKEND: str = os.getenv("REPLICA_STICKY_BACKEND", "redis")
+    REPLICA_STICKY_URL: str = os.getenv(
+        "REPLICA_STICKY_URL",
+        os.getenv("RESPONSE_CACHE_URL", "redis://localhost:6379/0"),
+    )
+
+    # JSON serialization: "auto" uses orjson when it is installed, else "stdlib"
+    JSON_PROVIDER: str = os.getenv("JSON_PROVIDER", "auto")
+
+    # Response compression: bodies below COMPRESS_MIN_SIZE bytes are sent as is
+    COMPRESS_MIN_SIZE: int = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+    COMPRESS_LEVEL: int = int(os.getenv("COMPRESS_LEVEL", "6"))
+    COMPRESS_BROTLI_QUALITY: int = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+
+    # Keyset pagination for list endpoints
+    PAGE_SIZE_DEFAULT: int = int(os.getenv("PAGE_SIZE_DEFAULT", "20"))
+    PAGE_SIZE_MAX: int = int(os.getenv("PAGE_SIZE_MAX", "100"))
+
+    # Rows fetched per round trip by the streaming article export
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+    # Process-local cache of (id, role, role_version) snapshots used to authorize
+    # requests; a role change or delete reaches other workers within the TTL
+    CURRENT_USER_CACHE_SIZE: int = int(os.getenv("CURRENT_USER_CACHE_SIZE", "1024"))
+    CURRENT_USER_CACHE_TTL: float = float(os.getenv("CURRENT_USER_CACHE_TTL", "5"))
+
+    # Password hashing; stored hashes made with other parameters are upgraded on login
+    PASSWORD_HASH_METHOD: str = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_SALT_LENGTH: int = int(os.getenv("PASSWORD_SALT_LENGTH", "16"))
+    # Login verification and rehashing run on this many processes (0 runs them inline)
+    PASSWORD_HASH_WORKERS: int = int(
+        os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1))
+    )
+    # Verifications allowed in flight before /api/login answers 503
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+    PASSWORD_HASH_TIMEOUT: float = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+
+    # Largest number of operations accepted by POST /api/articles/bulk
+    BULK_MAX_OPERATIONS: int = int(os.getenv("BULK_MAX_OPERATIONS", "1000"))
+
+    # Articles deleted per transaction by DELETE /api/users/<id>?mode=background
+    USER_PURGE_CHUNK_SIZE: int = int(os.getenv("USER_PURGE_CHUNK_SIZE", "1000"))
+
+    # Cache of rendered article responses: "memory" (per process), "redis" or "none"
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_URL: str = os.getenv(
+        "RESPONSE_CACHE_URL", "redis://localhost:6379/0"
+    )
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "4096"))
+    RESPONSE_CACHE_TTL: float = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+
+    # Token-bucket rate limits as (requests per second, burst) per client (JWT
+    # identity, else address); clients over the limit get 429 (a rate of 0 disables)
+    LOGIN_RATE_LIMIT: float = float(os.getenv("LOGIN_RATE_LIMIT", "1"))
+    LOGIN_RATE_BURST: int = int(os.getenv("LOGIN_RATE_BURST", "10"))
+    SEARCH_RATE_LIMIT: float = float(os.getenv("SEARCH_RATE_LIMIT", "5"))
+    SEARCH_RATE_BURST: int = int(os.getenv("SEARCH_RATE_BURST", "20"))
+    RATE_LIMITS: dict[str, tuple[float, int]] = {
+        "user_routes.login": (LOGIN_RATE_LIMIT, LOGIN_RATE_BURST),
+        "article_routes.search_articles": (SEARCH_RATE_LIMIT, SEARCH_RATE_BURST),
+        "user_routes.search_users": (SEARCH_RATE_LIMIT, SEARCH_RATE_BURST),
+    }
+    # Buckets kept "memory" (per process), "redis" (shared by all workers) or "none"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_URL: str = os.getenv("RATE_LIMIT_URL", RESPONSE_CACHE_URL)
+    RATE_LIMIT_SIZE: int = int(os.getenv("RATE_LIMIT_SIZE", "65536"))
+    # Reverse proxies in front of the app whose X-Forwarded-For is trusted for the
+    # client address (0 uses the socket's peer address)
+    TRUSTED_PROXIES: int = int(os.getenv("TRUSTED_PROXIES", "0"))
+
+    # Requests of an endpoint served at once by each worker process; more get 503
+    SEARCH_MAX_CONCURRENCY: int = int(os.getenv("SEARCH_MAX_CONCURRENCY", "4"))
+    EXPORT_MAX_CONCURRENCY: int = int(os.getenv("EXPORT_MAX_CONCURRENCY", "2"))
+    CONCURRENCY_LIMITS: dict[str, int] = {
+        "article_routes.search_articles": SEARCH_MAX_CONCURRENCY,
+        "user_routes.search_users": SEARCH_MAX_CONCURRENCY,
+        "article_routes.export_articles": EXPORT_MAX_CONCURRENCY,
+    }
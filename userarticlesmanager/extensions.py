@@ -4,11 +4,14 @@ from flask_jwt_extended import JWTManager
 from flask.cli import with_appcontext
 from flasgger import Swagger  # type: ignore
 from flask_cors import CORS  # type: ignore
+from userarticlesmanager.utils.replicas import RoutingSession
+from typing import Optional
 import click
 import os
+import time
 
-# Initialization of components
-db = SQLAlchemy()
+# Initialization of components; the session reads from replicas when they are configured
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 jwt = JWTManager()
 
 
@@ -17,23 +20,215 @@ def create_app(config_class: str = "userarticlesmanager.config.Config") -> Flask
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # Client addresses (rate limits, read-your-writes) from the trusted proxies
+    trusted_proxies = app.config.get("TRUSTED_PROXIES", 0)
+    if trusted_proxies > 0:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_proxies)  # type: ignore
+
+    # orjson when installed; datetimes are written as ISO 8601 either way
+    from userarticlesmanager.utils.json_provider import create_json_provider
+
+    app.json = create_json_provider(app)
+
     # Initialize components
     db.init_app(app)
     jwt.init_app(app)
 
+    # Authorize requests from a cached (id, role) snapshot instead of loading User rows
+    from userarticlesmanager.utils.auth import (
+        is_token_revoked,
+        load_current_user,
+    )
+    from userarticlesmanager.utils.cache import TTLCache
+    from userarticlesmanager.utils.passwords import create_password_hasher
+    from userarticlesmanager.utils.replicas import (
+        create_replica_router,
+        mark_client_write,
+    )
+    from userarticlesmanager.utils.response_cache import create_response_cache
+
+    app.extensions["current_user_cache"] = TTLCache(
+        maxsize=app.config.get("CURRENT_USER_CACHE_SIZE", 1024),
+        ttl=app.config.get("CURRENT_USER_CACHE_TTL", 5),
+    )
+    app.extensions["password_hasher"] = create_password_hasher(app.config)
+    app.extensions["response_cache"] = create_response_cache(app.config)
+    app.extensions["replica_router"] = create_replica_router(
+        app.config, app.extensions["response_cache"]
+    )
+    jwt.user_lookup_loader(load_current_user)
+    jwt.token_in_blocklist_loader(is_token_revoked)
+
+    # Request wall time, query counts and slow-query log (`Server-Timing`, /metrics)
+    from userarticlesmanager.utils.instrumentation import (
+        Metrics,
+        finish_request_instrumentation,
+        start_request_instrumentation,
+    )
+
+    app.extensions["metrics"] = Metrics()
+    app.before_request(start_request_instrumentation)
+    app.after_request(finish_request_instrumentation)
+
+    # Rate limits (429) and concurrency caps (503) for expensive endpoints
+    from userarticlesmanager.utils.rate_limit import (
+        ConcurrencyLimiter,
+        admit_request,
+        create_rate_limiter,
+        release_request,
+    )
+
+    app.extensions["rate_limiter"] = create_rate_limiter(
+        app.config, app.extensions["response_cache"]
+    )
+    app.extensions["concurrency_limiter"] = ConcurrencyLimiter(
+        app.config.get("CONCURRENCY_LIMITS", {})
+    )
+    app.before_request(admit_request)
+    app.teardown_request(release_request)
+
+    # Per-request statement timeouts; a cancelled statement answers 503
+    from sqlalchemy.exc import OperationalError
+    from userarticlesmanager.utils.db_engine import (
+        end_request_timeout,
+        handle_operational_error,
+        start_request_timeout,
+    )
+
+    app.before_request(start_request_timeout)
+    app.teardown_request(end_request_timeout)
+    app.register_error_handler(OperationalError, handle_operational_error)
+
+    # Clients that wrote read from the primary until the replicas caught up
+    app.after_request(mark_client_write)
+
+    # gzip/brotli for responses whose client sends a matching Accept-Encoding
+    from userarticlesmanager.utils.compression import compress_response
+
+    app.after_request(compress_response)
+
     CORS(app)
 
     Swagger(app, template_file="swagger_config.yml")
 
     app.cli.add_command(create_sample_data_command)
+    app.cli.add_command(reconcile_article_counts_command)
+    app.cli.add_command(resume_user_purges_command)
 
     return app
 
 
 @click.command(name="create-sample-data")
+@click.option("--users", type=click.IntRange(min=1), help="Generate this many users.")
+@click.option(
+    "--articles",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Generate this many articles.",
+)
+@click.option(
+    "--content-size",
+    type=click.IntRange(min=1),
+    default=500,
+    show_default=True,
+    help="Characters of content per generated article.",
+)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option(
+    "--password",
+    default="password",
+    show_default=True,
+    help="Password of every generated user.",
+)
+@click.option(
+    "--batch-size", type=click.IntRange(min=1), default=10_000, show_default=True
+)
+@with_appcontext
+def create_sample_data_command(
+    users: Optional[int],
+    articles: int,
+    content_size: int,
+    seed: int,
+    password: str,
+    batch_size: int,
+) -> None:
+    """Command to create sample data in the database.
+
+    Without --users, creates an admin, an editor and a viewer with one article
+    each; with it, generates --users users named `userN` (numbered after the
+    existing ones, `user1` an admin) and --articles articles spread among them.
+    """
+    from userarticlesmanager.utils.database import (
+        create_sample_data,
+        generate_sample_data,
+    )
+
+    if users is None:
+        create_sample_data()
+        return
+
+    started = time.perf_counter()
+
+    def progress(table: str, rows: int) -> None:
+        elapsed = time.perf_counter() - started
+        click.echo(f"{table}: {rows} rows ({elapsed:.1f}s)")
+
+    users, articles = generate_sample_data(
+        users,
+        articles,
+        content_size=content_size,
+        seed=seed,
+        password=password,
+        batch_size=batch_size,
+        progress=progress,
+    )
+    elapsed = time.perf_counter() - started
+    click.echo(
+        f"Generated {users} users and {articles} articles in {elapsed:.1f}s "
+        f"({(users + articles) / max(elapsed, 1e-9):.0f} rows/s)"
+    )
+
+
+@click.command(name="reconcile-article-counts")
+@click.option(
+    "--dry-run", is_flag=True, help="Only report drifted counts, do not repair them."
+)
+@click.option(
+    "--chunk-size", type=click.IntRange(min=1), default=1000, show_default=True
+)
+@with_appcontext
+def reconcile_article_counts_command(dry_run: bool, chunk_size: int) -> None:
+    """Find users whose stored article_count differs from their articles and fix it.
+
+    Exits with status 1 when drift was found in a dry run.
+    """
+    from userarticlesmanager.services.user_service import reconcile_article_counts
+
+    drifted = reconcile_article_counts(chunk_size=chunk_size, repair=not dry_run)
+    for user_id, stored, actual in drifted:
+        click.echo(f"user {user_id}: stored {stored}, actual {actual}")
+    if not drifted:
+        click.echo("All article counts are correct")
+    elif dry_run:
+        click.echo(f"{len(drifted)} users have drifted article counts")
+        raise SystemExit(1)
+    else:
+        click.echo(f"Repaired the article counts of {len(drifted)} users")
+
+
+@click.command(name="resume-user-purges")
+@click.option(
+    "--chunk-size", type=click.IntRange(min=1), default=1000, show_default=True
+)
 @with_appcontext
-def create_sample_data_command() -> None:
-    """Command to create sample data in the database."""
-    from userarticlesmanager.utils.database import create_sample_data
+def resume_user_purges_command(chunk_size: int) -> None:
+    """Finish background user deletions that were interrupted, e.g. by a restart."""
+    from userarticlesmanager.services.user_service import resume_user_purges
 
-    create_sample_data()
+    purged = resume_user_purges(chunk_size)
+    for user_id, deleted in purged:
+        click.echo(f"user {user_id}: purged with {deleted} articles")
+    if not purged:
+        click.echo("No interrupted user deletions")
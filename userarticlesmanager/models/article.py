@@ -1,8 +1,23 @@
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Integer,
+    String,
+    Text,
+    DateTime,
+    ForeignKey,
+    Index,
+    event,
+    update,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from userarticlesmanager.extensions import db
-from typing import Any
+from typing import Any, Iterable, Optional
+
+# Fields of `Article.to_dict`, in response order; also the choices of `fields=`
+ARTICLE_FIELDS = ("id", "title", "content", "created_at", "updated_at", "user_id")
 
 
 class Article(db.Model):  # type: ignore
@@ -15,25 +30,97 @@ class Article(db.Model):  # type: ignore
     content: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime | None] = mapped_column(
-        DateTime, onupdate=datetime.utcnow
+        DateTime, onupdate=datetime.utcnow, index=True
     )
     user_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id"), nullable=False
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
     user: Mapped["User"] = relationship("User", back_populates="articles")  # type: ignore
+    # Maintained by a database trigger on PostgreSQL; SQLite uses the articles_fts table instead.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR().with_variant(Text(), "sqlite"), nullable=True, deferred=True
+    )
+
+    __table_args__ = (
+        # Serves the (created_at, id) keyset ordering of the article list
+        Index("ix_articles_created_at_id", "created_at", "id"),
+        Index(
+            "ix_articles_search_vector", "search_vector", postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
 
     def __init__(self, title: str, content: str, user_id: int) -> None:
         self.title = title
         self.content = content
         self.user_id = user_id
 
-    def to_dict(self) -> dict[str, Any]:
-        """Convert object to dictionary for JSON response."""
-        return {
-            "id": self.id,
-            "title": self.title,
-            "content": self.content,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at,
-            "user_id": self.user_id,
-        }
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> dict[str, Any]:
+        """Convert object to dictionary for JSON response.
+
+        Only the given `fields` are read, so columns that were not loaded are
+        not fetched.
+        """
+        return {field: getattr(self, field) for field in fields or ARTICLE_FIELDS}
+
+
+class ArticleListVersion(db.Model):  # type: ignore
+    """Single-row counter of changes to the articles table.
+
+    Every statement that inserts, updates or deletes articles bumps it in the
+    same transaction, so list pages get their ETag from one primary-key read
+    instead of aggregates over the whole table.
+    """
+
+    __tablename__ = "article_list_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    @classmethod
+    def bump(cls) -> None:
+        """Count a change to the articles; call it right before the commit,
+        as the row stays locked until then."""
+        db.session.execute(
+            update(cls)
+            .where(cls.id == 1)
+            .values(version=cls.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+event.listen(
+    ArticleListVersion.__table__,
+    "after_create",
+    DDL("INSERT INTO article_list_version (id, version) VALUES (1, 0)"),
+)
+
+
+# SQLite fallback for full-text search: an FTS5 index over title and content,
+# kept in sync with the articles table by triggers.
+_SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    "title, content, content='articles', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN "
+    "INSERT INTO articles_fts(rowid, title, content) "
+    "VALUES (new.id, new.title, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, content "
+    "ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO articles_fts(rowid, title, content) "
+    "VALUES (new.id, new.title, new.content); END",
+]
+
+for _statement in _SQLITE_FTS_DDL:
+    event.listen(
+        Article.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Article.__table__,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS articles_fts").execute_if(dialect="sqlite"),
+)
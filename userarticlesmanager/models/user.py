@@ -1,8 +1,11 @@
+from dataclasses import dataclass
+from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import DateTime, Index, Integer, String
+from werkzeug.security import check_password_hash
 from userarticlesmanager.extensions import db
-from typing import Optional
+from userarticlesmanager.utils.passwords import hash_password
+from typing import Any, Optional
 
 
 # Constants for roles
@@ -20,6 +23,46 @@ class Permissions:
     DELETE = "delete"
 
 
+def role_has_permission(
+    role: str, user_id: int, permission: str, article_user_id: Optional[int] = None
+) -> bool:
+    """Check if a user with `role` and `user_id` has permission for a specific action."""
+    if role == UserRoles.ADMIN:
+        return True
+    if role == UserRoles.EDITOR:
+        return permission in [Permissions.READ, Permissions.UPDATE]
+    if role == UserRoles.VIEWER:
+        if permission == Permissions.READ:
+            return True
+        if permission == Permissions.CREATE:
+            return article_user_id is None or article_user_id == user_id
+        if permission in [Permissions.UPDATE, Permissions.DELETE]:
+            return article_user_id == user_id
+    return False
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Detached `(id, role, role_version)` view of a user, enough to authorize a request."""
+
+    id: int
+    role: str
+    role_version: int = 0
+
+    @classmethod
+    def from_claims(cls, user_id: int, claims: dict[str, Any]) -> "UserSnapshot":
+        """Build a snapshot from the role claim embedded in an access token."""
+        return cls(
+            id=user_id, role=claims["role"], role_version=claims.get("role_version", 0)
+        )
+
+    def has_permission(
+        self, permission: str, article_user_id: Optional[int] = None
+    ) -> bool:
+        """Check if the user has permission for a specific action."""
+        return role_has_permission(self.role, self.id, permission, article_user_id)
+
+
 class User(db.Model):  # type: ignore
     """User model representing a user in the database."""
 
@@ -31,7 +74,32 @@ class User(db.Model):  # type: ignore
     role: Mapped[str] = mapped_column(
         String(50), nullable=False, default=UserRoles.VIEWER
     )
-    articles: Mapped[list["Article"]] = relationship("Article", back_populates="user")  # type: ignore
+    # Bumped on every role change so tokens carrying an older role can be rejected
+    role_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # Number of articles, kept in step by every statement that inserts or deletes
+    # articles (see services.user_service.adjust_article_counts)
+    article_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # Set when a background delete starts; the user can no longer log in or use
+    # their tokens, and `flask resume-user-purges` finishes interrupted purges
+    deleting_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Articles are removed by the database (ON DELETE CASCADE) or by a set-based
+    # DELETE, never by loading them into the session.
+    articles: Mapped[list["Article"]] = relationship(  # type: ignore
+        "Article", back_populates="user", passive_deletes=True
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_users_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     def __init__(
         self, username: str, password: str, role: str = UserRoles.VIEWER
@@ -46,7 +114,7 @@ class User(db.Model):  # type: ignore
 
     @password.setter
     def password(self, raw_password: str) -> None:
-        self.password_hash = generate_password_hash(raw_password)
+        self.password_hash = hash_password(raw_password)
 
     def check_password(self, raw_password: str) -> bool:
         return check_password_hash(self.password_hash, raw_password)
@@ -55,18 +123,7 @@ class User(db.Model):  # type: ignore
         self, permission: str, article_user_id: Optional[int] = None
     ) -> bool:
         """Check if the user has permission for a specific action."""
-        if self.role == UserRoles.ADMIN:
-            return True
-        if self.role == UserRoles.EDITOR:
-            return permission in [Permissions.READ, Permissions.UPDATE]
-        if self.role == UserRoles.VIEWER:
-            if permission == Permissions.READ:
-                return True
-            if permission == Permissions.CREATE:
-                return article_user_id is None or article_user_id == self.id
-            if permission in [Permissions.UPDATE, Permissions.DELETE]:
-                return article_user_id == self.id
-        return False
+        return role_has_permission(self.role, self.id, permission, article_user_id)
 
     def to_dict(self) -> dict[str, str]:
         return {
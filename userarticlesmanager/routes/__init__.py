@@ -1,5 +1,6 @@
 from userarticlesmanager.routes.user_routes import user_routes
 from userarticlesmanager.routes.article_routes import article_routes
+from userarticlesmanager.routes.system_routes import system_routes
 from typing import Any
 
 
@@ -7,3 +8,4 @@ def register_routes(app) -> Any:
     """Register all routes."""
     app.register_blueprint(user_routes, url_prefix="/api")
     app.register_blueprint(article_routes, url_prefix="/api")
+    app.register_blueprint(system_routes)
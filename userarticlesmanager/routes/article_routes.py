@@ -1,12 +1,60 @@
-from flask import Blueprint, request, jsonify, Response
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from userarticlesmanager.models.user import User, Permissions
-from userarticlesmanager.models.article import Article
+from flask import (
+    Blueprint,
+    request,
+    jsonify,
+    Response,
+    current_app,
+    stream_with_context,
+)
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
+from sqlalchemy.orm import defer
+from userarticlesmanager.models.user import Permissions, UserRoles
+from userarticlesmanager.models.article import (
+    ARTICLE_FIELDS,
+    Article,
+    ArticleListVersion,
+)
 from userarticlesmanager.extensions import db
+from userarticlesmanager.services.article_service import (
+    BulkOperationError,
+    apply_bulk_operations,
+    article_list_version,
+    parse_user_id,
+)
+from userarticlesmanager.services.user_service import adjust_article_counts
+from userarticlesmanager.utils.auth import token_has_permission
+from userarticlesmanager.utils.fields import FieldsError, load_fields, parse_fields
+from userarticlesmanager.utils.instrumentation import query_budget
+from userarticlesmanager.utils.http_cache import (
+    add_validators,
+    article_etag,
+    article_version,
+    collection_etag,
+    is_not_modified,
+    matches_if_match,
+    not_modified,
+)
+from userarticlesmanager.utils.pagination import (
+    PaginationError,
+    paginate_keyset,
+    parse_limit,
+    parse_offset,
+)
+from userarticlesmanager.utils.replicas import primary_reads
+from userarticlesmanager.utils.response_cache import (
+    CachedResponse,
+    get_response_cache,
+    invalidate_articles,
+)
+from userarticlesmanager.utils.search import search_articles as full_text_search
+from userarticlesmanager.utils.export import (
+    EXPORT_FORMATS,
+    generate_csv,
+    generate_ndjson,
+)
 from flasgger import swag_from  # type: ignore
 from typing import Any, Optional
 
-
 article_routes = Blueprint("article_routes", __name__)
 
 
@@ -16,7 +64,6 @@ article_routes = Blueprint("article_routes", __name__)
 def create_article() -> Response:
     """Create a new article (Admin or Viewer)."""
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
 
     data = request.json
     if not data:
@@ -33,6 +80,12 @@ def create_article() -> Response:
         response.status_code = 400
         return response
 
+    target_user_id = parse_user_id(target_user_id)
+    if target_user_id is None:
+        response = jsonify({"message": "User ID must be an integer"})
+        response.status_code = 400
+        return response
+
     # Check permission to create the article
     if not current_user.has_permission(
         Permissions.CREATE, article_user_id=target_user_id
@@ -44,28 +97,117 @@ def create_article() -> Response:
     # Create article
     article = Article(title=title, content=content, user_id=target_user_id)
     db.session.add(article)
+    adjust_article_counts({target_user_id: 1})
+    ArticleListVersion.bump()
     db.session.commit()
+    invalidate_articles()
     response = jsonify(article.to_dict())
     response.status_code = 201
     return response
 
 
+@article_routes.route("/articles/bulk", methods=["POST"])
+@jwt_required()
+@swag_from("../swagger_config.yml", endpoint="articles_bulk", methods=["POST"])
+def bulk_articles() -> Response:
+    """Create, update and delete many articles in one transaction.
+
+    Permissions are the same as for the single-article endpoints. Each operation
+    gets its own result; unless `strict` is true, failed operations do not stop
+    the valid ones from being applied.
+    """
+    data = request.json
+    if not data:
+        response = jsonify({"message": "No input data provided"})
+        response.status_code = 400
+        return response
+
+    operations = data.get("operations")
+    max_operations = current_app.config.get("BULK_MAX_OPERATIONS", 1000)
+    if isinstance(operations, list) and len(operations) > max_operations:
+        response = jsonify(
+            {"message": f"At most {max_operations} operations are allowed"}
+        )
+        response.status_code = 413
+        return response
+
+    strict = bool(data.get("strict", False))
+    try:
+        results, failed = apply_bulk_operations(operations, current_user, strict)
+    except BulkOperationError as error:
+        response = jsonify({"message": str(error)})
+        response.status_code = 400
+        return response
+
+    succeeded = len([result for result in results if result["status"] < 300])
+    response = jsonify(
+        {
+            "results": results,
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+        }
+    )
+    response.status_code = 400 if failed and strict else 200
+    return response
+
+
 @article_routes.route("/articles", methods=["GET"])
 @article_routes.route("/articles/<int:article_id>", methods=["GET"])
 @jwt_required()
 @swag_from("../swagger_config.yml", endpoint="articles", methods=["GET"])
+@query_budget(2)
 def get_articles(article_id: Optional[int] = None) -> Response:
-    """Get all articles or one article by ID. Available for all roles (authentication required)."""
+    """Get one page of articles or one article by ID. Available for all roles (authentication required).
+
+    Articles are listed in `(created_at, id)` order. Pass `limit` to set the page
+    size and `after` with the `next_cursor` of the previous page to continue.
+    `fields` (e.g. `id,title`) limits the fields returned; the other columns are
+    not read from the database.
+
+    Responses carry an `ETag`, and a request whose `If-None-Match` still
+    matches gets an empty 304. Single articles also carry `Last-Modified` and
+    honor `If-Modified-Since`; list pages do not, as their ETag comes from the
+    version counter that every article write bumps.
+    """
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    cache = get_response_cache()
+    try:
+        fields = parse_fields(request.args.get("fields"), ARTICLE_FIELDS)
+    except FieldsError as error:
+        response = jsonify({"message": str(error)})
+        response.status_code = 400
+        return response
 
     if article_id:
-        article = Article.query.get(article_id)
+        # Sparse fieldsets are cheap to read and are not cached
+        if (
+            cache is not None
+            and fields is None
+            and token_has_permission(Permissions.READ)
+        ):
+            entry, hit = cache.get_or_compute(
+                cache.article_key(article_id), lambda: _render_article(article_id)
+            )
+            if entry is None:
+                response = jsonify({"message": "Article not found"})
+                response.status_code = 404
+                return response
+            return _send_cached(entry, hit)
+
+        # The content is only loaded when the article is actually sent
+        options = load_fields(
+            Article, fields, "user_id", "created_at", "updated_at"
+        ) or [defer(Article.content)]
+        article = Article.query.options(*options).get(article_id)
         if article:
-            if article.user_id == user_id or current_user.has_permission(
-                Permissions.READ
-            ):
-                return jsonify(article.to_dict())
+            if article.user_id == user_id or token_has_permission(Permissions.READ):
+                modified_at = article_version(article.created_at, article.updated_at)
+                etag = article_etag(article.id, modified_at, fields)
+                if is_not_modified(etag, modified_at):
+                    return not_modified(etag, modified_at)
+                return add_validators(
+                    jsonify(article.to_dict(fields)), etag, modified_at
+                )
             else:
                 response = jsonify({"message": "Access denied"})
                 response.status_code = 403
@@ -75,40 +217,196 @@ def get_articles(article_id: Optional[int] = None) -> Response:
             response.status_code = 404
             return response
     else:
-        articles = Article.query.all()
-        return jsonify([article.to_dict() for article in articles])
+        try:
+            limit = parse_limit(request.args.get("limit"))
+            if cache is not None:
+                page, hit = cache.get_or_compute(
+                    cache.list_key(request.query_string),
+                    lambda: _render_article_page(
+                        limit, request.args.get("after"), fields
+                    ),
+                )
+                return _send_cached(page, hit)
+
+            etag = collection_etag(article_list_version(), request.query_string)
+            if is_not_modified(etag, None):
+                return not_modified(etag, None)
+
+            articles, next_cursor = paginate_keyset(
+                _article_query(fields), Article, limit, request.args.get("after")
+            )
+        except PaginationError as error:
+            response = jsonify({"message": str(error)})
+            response.status_code = 400
+            return response
+
+        response = jsonify(
+            {
+                "items": [article.to_dict(fields) for article in articles],
+                "next_cursor": next_cursor,
+            }
+        )
+        return add_validators(response, etag, None)
+
+
+def _article_query(fields: Optional[list[str]]) -> Any:
+    # The keyset cursor is built from created_at and id
+    return Article.query.options(*load_fields(Article, fields, "created_at"))
+
+
+# Cached entries are shared by all clients, including one that just wrote, so
+# they are rendered from the primary and never from a lagging replica.
+
+
+def _render_article(article_id: int) -> Optional[CachedResponse]:
+    with primary_reads():
+        article = Article.query.get(article_id)
+    if not article:
+        return None
+    modified_at = article_version(article.created_at, article.updated_at)
+    return CachedResponse(
+        body=jsonify(article.to_dict()).get_data(),
+        etag=article_etag(article.id, modified_at),
+        last_modified=modified_at,
+    )
+
+
+def _render_article_page(
+    limit: int, after: Optional[str], fields: Optional[list[str]]
+) -> CachedResponse:
+    with primary_reads():
+        version = article_list_version()
+        articles, next_cursor = paginate_keyset(
+            _article_query(fields), Article, limit, after
+        )
+    body = jsonify(
+        {
+            "items": [article.to_dict(fields) for article in articles],
+            "next_cursor": next_cursor,
+        }
+    ).get_data()
+    return CachedResponse(
+        body=body,
+        etag=collection_etag(version, request.query_string),
+        last_modified=None,
+    )
+
+
+def _send_cached(entry: CachedResponse, hit: bool) -> Response:
+    """Answer from a cached entry, with a 304 when the client's copy is current."""
+    if is_not_modified(entry.etag, entry.last_modified):
+        response = not_modified(entry.etag, entry.last_modified)
+    else:
+        response = add_validators(
+            current_app.response_class(entry.body, mimetype="application/json"),
+            entry.etag,
+            entry.last_modified,
+        )
+    response.headers["X-Cache"] = "HIT" if hit else "MISS"
+    return response
 
 
 @article_routes.route("/articles/search", methods=["GET"])
 @jwt_required()
 @swag_from("../swagger_config.yml", endpoint="articles_search", methods=["GET"])
+@query_budget(2)
 def search_articles() -> Response:
-    """Search articles by title. Available for all roles (authentication required)."""
-    title = request.args.get("title", "").lower()
-    if not title:
+    """Full-text search over article titles and content, best matches first.
+
+    The search text is taken from `q` (or `title`, kept for older clients).
+    Results are paginated with `limit` and `offset`. Available for all roles
+    (authentication required).
+    """
+    query = request.args.get("q") or request.args.get("title", "")
+    if not query.strip():
         response = jsonify({"message": "Title parameter is required"})
         response.status_code = 400
         return response
 
-    articles = Article.query.filter(Article.title.ilike(f"%{title}%")).all()
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        offset = parse_offset(request.args.get("offset"))
+        fields = parse_fields(request.args.get("fields"), ARTICLE_FIELDS)
+    except (PaginationError, FieldsError) as error:
+        response = jsonify({"message": str(error)})
+        response.status_code = 400
+        return response
+
+    articles = full_text_search(
+        query, limit, offset, options=load_fields(Article, fields)
+    )
 
     if not articles:
         response = jsonify({"message": "No articles found"})
         response.status_code = 404
         return response
 
-    return jsonify([article.to_dict() for article in articles])
+    return jsonify([article.to_dict(fields) for article in articles])
+
+
+@article_routes.route("/articles/export", methods=["GET"])
+@jwt_required()
+@swag_from("../swagger_config.yml", endpoint="articles_export", methods=["GET"])
+def export_articles() -> Response:
+    """Stream every article as NDJSON (default) or CSV. Available for all roles (authentication required)."""
+    if not current_user.has_permission(Permissions.READ):
+        response = jsonify({"message": "Access denied"})
+        response.status_code = 403
+        return response
+
+    export_format = request.args.get("format", "ndjson").lower()
+    if export_format not in EXPORT_FORMATS:
+        response = jsonify({"message": "Format must be one of: ndjson, csv"})
+        response.status_code = 400
+        return response
+
+    try:
+        fields = parse_fields(request.args.get("fields"), ARTICLE_FIELDS)
+    except FieldsError as error:
+        response = jsonify({"message": str(error)})
+        response.status_code = 400
+        return response
+
+    batch_size = current_app.config.get("EXPORT_BATCH_SIZE", 1000)
+    generate = generate_csv if export_format == "csv" else generate_ndjson
+    response = Response(
+        stream_with_context(generate(batch_size, fields)),
+        mimetype=EXPORT_FORMATS[export_format],
+    )
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename=articles.{export_format}"
+    )
+    return response
+
+
+@article_routes.route("/articles/cache/stats", methods=["GET"])
+@jwt_required()
+@swag_from("../swagger_config.yml", endpoint="articles_cache_stats", methods=["GET"])
+def article_cache_stats() -> Response:
+    """Hit/miss counters of this process's article response cache (Admin only)."""
+    if current_user.role != UserRoles.ADMIN:
+        response = jsonify({"message": "Access denied"})
+        response.status_code = 403
+        return response
+
+    cache = get_response_cache()
+    return jsonify(cache.stats() if cache is not None else {"backend": "none"})
 
 
 @article_routes.route("/articles/<int:article_id>", methods=["PATCH"])
 @jwt_required()
 @swag_from("../swagger_config.yml", endpoint="articles_update", methods=["PATCH"])
 def update_articles(article_id: int) -> Response:
-    """Update article. Viewer can update only their articles, Editor and Admin can update any."""
-    user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    """Update article. Viewer can update only their articles, Editor and Admin can update any.
 
-    article = Article.query.get(article_id)
+    With an `If-Match` header the update is only applied if the article's
+    current ETag matches; otherwise 412 is returned.
+    """
+    query = Article.query
+    if request.if_match:
+        # Hold the row until commit so the precondition cannot go stale
+        query = query.with_for_update()
+    article = query.get(article_id)
     if not article:
         response = jsonify({"message": "Article not found"})
         response.status_code = 404
@@ -121,6 +419,15 @@ def update_articles(article_id: int) -> Response:
         response.status_code = 403
         return response
 
+    etag = article_etag(
+        article.id, article_version(article.created_at, article.updated_at)
+    )
+    if not matches_if_match(etag):
+        response = jsonify({"message": "Article has been modified"})
+        response.status_code = 412
+        response.set_etag(etag)
+        return response
+
     data = request.json
     if not data:
         response = jsonify({"message": "No input data provided"})
@@ -135,8 +442,13 @@ def update_articles(article_id: int) -> Response:
     if content is not None:
         article.content = content
 
+    ArticleListVersion.bump()
     db.session.commit()
-    return jsonify(article.to_dict())
+    invalidate_articles([article_id])
+    modified_at = article_version(article.created_at, article.updated_at)
+    return add_validators(
+        jsonify(article.to_dict()), article_etag(article.id, modified_at), modified_at
+    )
 
 
 @article_routes.route("/articles/<int:article_id>", methods=["DELETE"])
@@ -144,9 +456,6 @@ def update_articles(article_id: int) -> Response:
 @swag_from("../swagger_config.yml", endpoint="articles_delete", methods=["DELETE"])
 def delete_article(article_id: int) -> Response:
     """Delete article. Viewer can delete only their articles, Admin can delete any, Editor cannot delete."""
-    user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
-
     article = Article.query.get(article_id)
     if not article:
         response = jsonify({"message": "Article not found"})
@@ -161,7 +470,10 @@ def delete_article(article_id: int) -> Response:
         return response
 
     db.session.delete(article)
+    adjust_article_counts({article.user_id: -1})
+    ArticleListVersion.bump()
     db.session.commit()
+    invalidate_articles([article_id])
     response = jsonify({"message": "Article deleted successfully"})
     response.status_code = 200
     return response
@@ -0,0 +1,135 @@
+from flask import Blueprint, jsonify, Response, current_app
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from userarticlesmanager.extensions import db
+from userarticlesmanager.utils.auth import get_user_cache
+from userarticlesmanager.utils.db_engine import pool_stats
+from userarticlesmanager.utils.instrumentation import get_metrics
+from userarticlesmanager.utils.response_cache import get_response_cache
+
+# Probes for the process manager and load balancer; registered without the /api prefix
+system_routes = Blueprint("system_routes", __name__)
+
+
+@system_routes.route("/healthz", methods=["GET"])
+def liveness() -> Response:
+    """Liveness probe: the worker is up and serving requests. Never touches the database."""
+    response = jsonify({"status": "ok"})
+    response.status_code = 200
+    return response
+
+
+@system_routes.route("/readyz", methods=["GET"])
+def readiness() -> Response:
+    """Readiness probe: the worker can reach the database and should receive traffic.
+
+    The body also reports the connection pool's occupancy and checkout waits.
+    """
+    try:
+        db.session.execute(text("SELECT 1"))
+    except SQLAlchemyError:
+        current_app.logger.exception("Readiness check failed")
+        db.session.rollback()
+        response = jsonify(
+            {
+                "status": "unavailable",
+                "message": "Database unreachable",
+                "pool": pool_stats(db.engine),
+            }
+        )
+        response.status_code = 503
+        return response
+
+    response = jsonify({"status": "ok", "pool": pool_stats(db.engine)})
+    response.status_code = 200
+    return response
+
+
+@system_routes.route("/metrics", methods=["GET"])
+def metrics() -> Response:
+    """Prometheus metrics of the worker process that answers the scrape."""
+    response = current_app.response_class(
+        get_metrics().render(_runtime_metrics()), mimetype="text/plain"
+    )
+    response.headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+    return response
+
+
+def _runtime_metrics() -> list[tuple[str, str, str, float]]:
+    """Connection pool and cache figures as `(name, type, help, value)`."""
+    samples = []
+    pool = pool_stats(db.engine)
+    if "checked_out" in pool:
+        samples += [
+            ("db_pool_size", "gauge", "Connections kept in the pool.", pool["size"]),
+            (
+                "db_pool_checked_out",
+                "gauge",
+                "Connections in use.",
+                pool["checked_out"],
+            ),
+            (
+                "db_pool_overflow",
+                "gauge",
+                "Connections open beyond the pool size.",
+                pool["overflow"],
+            ),
+            (
+                "db_pool_checkouts_total",
+                "counter",
+                "Connection checkouts.",
+                pool["checkouts"],
+            ),
+            (
+                "db_pool_checkout_timeouts_total",
+                "counter",
+                "Checkouts that gave up waiting for a connection.",
+                pool["checkout_timeouts"],
+            ),
+            (
+                "db_pool_checkout_wait_seconds_total",
+                "counter",
+                "Time spent waiting for a connection.",
+                pool["wait_seconds_total"],
+            ),
+        ]
+
+    cache = get_response_cache()
+    if cache is not None:
+        stats = cache.stats()
+        samples += [
+            (
+                "response_cache_hits_total",
+                "counter",
+                "Response cache hits.",
+                stats["hits"],
+            ),
+            (
+                "response_cache_misses_total",
+                "counter",
+                "Response cache misses.",
+                stats["misses"],
+            ),
+        ]
+        if "size" in stats:
+            samples.append(
+                ("response_cache_entries", "gauge", "Cached responses.", stats["size"])
+            )
+
+    users = get_user_cache().stats()
+    samples += [
+        (
+            "current_user_cache_hits_total",
+            "counter",
+            "Authorization cache hits.",
+            users["hits"],
+        ),
+        (
+            "current_user_cache_misses_total",
+            "counter",
+            "Authorization cache misses.",
+            users["misses"],
+        ),
+        ("current_user_cache_entries", "gauge", "Cached users.", users["size"]),
+    ]
+    return samples
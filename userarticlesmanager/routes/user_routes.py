@@ -1,8 +1,38 @@
-from flask import Blueprint, request, jsonify, Response
-from userarticlesmanager.models.user import User, UserRoles, Permissions
-from userarticlesmanager.models.article import Article
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, Response, current_app
+from sqlalchemy.orm import with_parent
+from userarticlesmanager.models.user import Permissions, User, UserRoles
+from userarticlesmanager.models.article import ARTICLE_FIELDS, Article
+from flask_jwt_extended import (
+    create_access_token,
+    get_jwt_identity,
+    jwt_required,
+    current_user,
+)
 from userarticlesmanager.extensions import db
+from userarticlesmanager.services.user_service import (
+    delete_user_and_articles,
+    mark_user_deleting,
+    start_user_purge,
+)
+from userarticlesmanager.utils.auth import (
+    invalidate_current_user,
+    remember_current_user,
+    token_claims,
+    token_has_permission,
+)
+from userarticlesmanager.utils.fields import FieldsError, load_fields, parse_fields
+from userarticlesmanager.utils.instrumentation import query_budget
+from userarticlesmanager.utils.pagination import (
+    PaginationError,
+    paginate_keyset,
+    parse_limit,
+    parse_offset,
+)
+from userarticlesmanager.utils.passwords import (
+    PasswordHasherBusy,
+    get_password_hasher,
+)
+from userarticlesmanager.utils.user_search import search_users as search_usernames
 from flasgger import swag_from  # type: ignore
 
 user_routes = Blueprint("user_routes", __name__)
@@ -20,9 +50,28 @@ def login() -> Response:
 
     username = data.get("username")
     password = data.get("password")
-    user = User.query.filter_by(username=username).first()
-    if user and user.check_password(password):
-        access_token = create_access_token(identity=str(user.id))
+    user = (
+        User.query.filter_by(username=username, deleting_at=None).first()
+        if username
+        else None
+    )
+    hasher = get_password_hasher()
+    try:
+        valid = bool(user and password and hasher.verify(user.password_hash, password))
+        if user and valid and hasher.needs_rehash(user.password_hash):
+            user.password_hash = hasher.pooled_hash(password)
+            db.session.commit()
+    except PasswordHasherBusy:
+        response = jsonify({"message": "Too many login attempts, try again later"})
+        response.status_code = 503
+        response.headers["Retry-After"] = "1"
+        return response
+
+    if user and valid:
+        remember_current_user(user)
+        access_token = create_access_token(
+            identity=str(user.id), additional_claims=token_claims(user)
+        )
         response = jsonify(
             {"message": "Login successful", "access_token": access_token}
         )
@@ -37,17 +86,19 @@ def login() -> Response:
 @user_routes.route("/users", methods=["GET"])
 @jwt_required()
 @swag_from("../../swagger_config.yml", endpoint="users_list", methods=["GET"])
+@query_budget(1)
 def list_users() -> Response:
-    """List all users (Admin only)."""
-    user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    """List all users (Admin only).
+
+    With `article_count=true` each user also carries their number of articles.
+    """
     if current_user.role != UserRoles.ADMIN:
         response = jsonify({"message": "Access denied"})
         response.status_code = 403
         return response
 
     users = User.query.all()
-    response = jsonify([user.to_dict() for user in users])
+    response = jsonify([_user_dict(user) for user in users])
     response.status_code = 200
     return response
 
@@ -55,10 +106,9 @@ def list_users() -> Response:
 @user_routes.route("/users/<int:user_id>", methods=["GET"])
 @jwt_required()
 @swag_from("../../swagger_config.yml", endpoint="users_get", methods=["GET"])
+@query_budget(1)
 def get_user(user_id: int) -> Response:
-    """Get user details (Admin only)."""
-    current_user_id = get_jwt_identity()
-    current_user = User.query.get(current_user_id)
+    """Get user details (Admin only), with `article_count` on request as in `list_users`."""
     if current_user.role != UserRoles.ADMIN:
         response = jsonify({"message": "Access denied"})
         response.status_code = 403
@@ -70,7 +120,69 @@ def get_user(user_id: int) -> Response:
         response.status_code = 404
         return response
 
-    response = jsonify(user.to_dict())
+    response = jsonify(_user_dict(user))
+    response.status_code = 200
+    return response
+
+
+def _user_dict(user: User) -> dict:
+    """`user.to_dict()`, plus the stored `article_count` when the request asks for it."""
+    if request.args.get("article_count", "").lower() in ("1", "true", "yes"):
+        return dict(user.to_dict(), article_count=user.article_count)
+    return user.to_dict()
+
+
+@user_routes.route("/users/<int:user_id>/articles", methods=["GET"])
+@jwt_required()
+@swag_from("../../swagger_config.yml", endpoint="users_articles", methods=["GET"])
+@query_budget(2)
+def list_user_articles(user_id: int) -> Response:
+    """Get one page of a user's articles. Available to the user and to roles that may read articles.
+
+    Takes the same `limit`, `after` and `fields` parameters as `GET /api/articles`.
+    """
+    if str(user_id) != str(get_jwt_identity()) and not token_has_permission(
+        Permissions.READ
+    ):
+        response = jsonify({"message": "Access denied"})
+        response.status_code = 403
+        return response
+
+    try:
+        fields = parse_fields(request.args.get("fields"), ARTICLE_FIELDS)
+    except FieldsError as error:
+        response = jsonify({"message": str(error)})
+        response.status_code = 400
+        return response
+
+    user = db.session.get(User, user_id)
+    if not user:
+        response = jsonify({"message": "User not found"})
+        response.status_code = 404
+        return response
+
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        # Pages through User.articles in the database instead of loading the collection
+        articles, next_cursor = paginate_keyset(
+            Article.query.filter(with_parent(user, User.articles)).options(
+                *load_fields(Article, fields, "created_at")
+            ),
+            Article,
+            limit,
+            request.args.get("after"),
+        )
+    except PaginationError as error:
+        response = jsonify({"message": str(error)})
+        response.status_code = 400
+        return response
+
+    response = jsonify(
+        {
+            "items": [article.to_dict(fields) for article in articles],
+            "next_cursor": next_cursor,
+        }
+    )
     response.status_code = 200
     return response
 
@@ -78,18 +190,29 @@ def get_user(user_id: int) -> Response:
 @user_routes.route("/users/search", methods=["GET"])
 @jwt_required()
 @swag_from("../../swagger_config.yml", endpoint="users_search", methods=["GET"])
+@query_budget(2)
 def search_users() -> Response:
-    """Search users by username (Admin only)."""
-    current_user_id = get_jwt_identity()
-    current_user = User.query.get(current_user_id)
+    """Search users whose username contains a term (Admin only), paginated with `limit` and `offset`."""
     if current_user.role != UserRoles.ADMIN:
         response = jsonify({"message": "Access denied"})
         response.status_code = 403
         return response
 
-    username = request.args.get("username", "").lower()
+    username = request.args.get("username", "").strip()
+    if not username:
+        response = jsonify({"message": "Username parameter is required"})
+        response.status_code = 400
+        return response
 
-    users = User.query.filter(User.username.ilike(f"%{username}%")).all()
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        offset = parse_offset(request.args.get("offset"))
+    except PaginationError as error:
+        response = jsonify({"message": str(error)})
+        response.status_code = 400
+        return response
+
+    users = search_usernames(username, limit, offset)
 
     if not users:
         response = jsonify({"message": "No users found"})
@@ -106,8 +229,6 @@ def search_users() -> Response:
 @swag_from("../../swagger_config.yml", endpoint="users_update", methods=["PATCH"])
 def update_user(user_id: int) -> Response:
     """Update a user's details (Admin only)."""
-    current_user_id = get_jwt_identity()
-    current_user = User.query.get(current_user_id)
 
     if current_user.role != UserRoles.ADMIN:
         response = jsonify({"message": "Access denied"})
@@ -131,10 +252,15 @@ def update_user(user_id: int) -> Response:
 
     if username:
         user.username = username
-    if role in [UserRoles.ADMIN, UserRoles.EDITOR, UserRoles.VIEWER]:
+    if (
+        role in [UserRoles.ADMIN, UserRoles.EDITOR, UserRoles.VIEWER]
+        and role != user.role
+    ):
         user.role = role
+        user.role_version += 1
 
     db.session.commit()
+    invalidate_current_user(user_id)
 
     response = jsonify({"message": "User updated successfully", "user": user.to_dict()})
     response.status_code = 200
@@ -145,9 +271,12 @@ def update_user(user_id: int) -> Response:
 @jwt_required()
 @swag_from("../../swagger_config.yml", endpoint="users_delete", methods=["DELETE"])
 def delete_user(user_id: int) -> Response:
-    """Delete a user (Admin only)."""
-    current_user_id = get_jwt_identity()
-    current_user = User.query.get(current_user_id)
+    """Delete a user and their articles (Admin only).
+
+    With `?mode=background` the user is marked as being deleted and the
+    articles are purged in chunks on a background thread; the request returns
+    202 right away. `flask resume-user-purges` finishes purges cut short.
+    """
 
     if current_user.role != UserRoles.ADMIN:
         response = jsonify({"message": "Access denied"})
@@ -160,12 +289,17 @@ def delete_user(user_id: int) -> Response:
         response.status_code = 404
         return response
 
-    articles = Article.query.filter_by(user_id=user_id).all()
-    for article in articles:
-        db.session.delete(article)
+    if request.args.get("mode") == "background":
+        # Committed first, so the user is locked out even if the purge dies
+        mark_user_deleting(user_id)
+        invalidate_current_user(user_id)
+        start_user_purge(current_app._get_current_object(), user_id)  # type: ignore
+        response = jsonify({"message": "User deletion started"})
+        response.status_code = 202
+        return response
 
-    db.session.delete(user)
-    db.session.commit()
+    delete_user_and_articles(user_id)
+    invalidate_current_user(user_id)
 
     response = jsonify({"message": "User deleted successfully"})
     response.status_code = 200
@@ -0,0 +1,243 @@
+from collections import Counter
+from typing import Any, Optional
+from sqlalchemy import delete, insert, select, update
+from userarticlesmanager.models.article import Article, ArticleListVersion
+from userarticlesmanager.models.user import Permissions, User, UserSnapshot
+from userarticlesmanager.extensions import db
+from userarticlesmanager.services.user_service import adjust_article_counts
+from userarticlesmanager.utils.response_cache import invalidate_articles
+
+BULK_ACTIONS = {"create", "update", "delete"}
+TITLE_MAX_LENGTH: int = Article.__table__.c.title.type.length
+
+
+class BulkOperationError(ValueError):
+    """Raised when a bulk request as a whole is malformed."""
+
+
+def article_list_version() -> int:
+    """Return the version of the articles table, bumped by every article write."""
+    version = db.session.scalar(
+        select(ArticleListVersion.version).where(ArticleListVersion.id == 1)
+    )
+    return version or 0
+
+
+def _error(index: int, action: Any, status: int, message: str) -> dict[str, Any]:
+    return {"index": index, "action": action, "status": status, "message": message}
+
+
+def parse_user_id(value: Any) -> Optional[int]:
+    """Return `value` as a user ID, or None unless it is a whole number.
+
+    Digit strings are accepted, as the JWT identity claim is a string; floats
+    and booleans are not, since `int()` would silently turn them into user 1.
+    """
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        return None
+    return value
+
+
+def _validate_text(operation: dict[str, Any], required: bool) -> Optional[str]:
+    title = operation.get("title")
+    content = operation.get("content")
+    if required and (not title or not content):
+        return "Title and content are required"
+    if not required and title is None and content is None:
+        return "Title or content is required"
+    if title is not None and (not isinstance(title, str) or not title):
+        return "Title must be a non-empty string"
+    if title is not None and len(title) > TITLE_MAX_LENGTH:
+        return f"Title must be at most {TITLE_MAX_LENGTH} characters"
+    if content is not None and (not isinstance(content, str) or not content):
+        return "Content must be a non-empty string"
+    return None
+
+
+def apply_bulk_operations(
+    operations: Any, current_user: UserSnapshot, strict: bool = False
+) -> tuple[list[dict[str, Any]], bool]:
+    """Validate and apply a batch of article operations in a single transaction.
+
+    Each operation is a dict with an `action` of "create", "update" or "delete".
+    Permissions are evaluated once per distinct owner, and existing articles and
+    target users are looked up with one query each. Valid creates are inserted
+    with one executemany INSERT, updates and deletes with one statement each,
+    in that order, and the authors' article counts with one executemany
+    UPDATE, followed by a single commit.
+
+    Returns the per-operation results and whether any operation failed. Failed
+    operations do not prevent the others from being applied unless `strict` is
+    set, in which case nothing is written.
+    """
+    if not isinstance(operations, list) or not operations:
+        raise BulkOperationError("Operations must be a non-empty list")
+
+    results: list[Optional[dict[str, Any]]] = [None] * len(operations)
+    creates: list[tuple[int, dict[str, Any]]] = []
+    updates: list[tuple[int, dict[str, Any]]] = []
+    deletes: list[tuple[int, int]] = []
+
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            results[index] = _error(index, None, 400, "Operation must be an object")
+            continue
+        action = operation.get("action")
+        if action not in BULK_ACTIONS:
+            results[index] = _error(
+                index, action, 400, "Action must be one of: create, update, delete"
+            )
+            continue
+        if action == "create":
+            message = _validate_text(operation, required=True)
+            user_id = parse_user_id(operation.get("user_id", current_user.id))
+            if user_id is None:
+                message = message or "User ID must be an integer"
+            if message:
+                results[index] = _error(index, action, 400, message)
+                continue
+            creates.append(
+                (
+                    index,
+                    {
+                        "title": operation["title"],
+                        "content": operation["content"],
+                        "user_id": user_id,
+                    },
+                )
+            )
+            continue
+
+        article_id = operation.get("id")
+        if not isinstance(article_id, int):
+            results[index] = _error(index, action, 400, "Article ID is required")
+            continue
+        if action == "update":
+            message = _validate_text(operation, required=False)
+            if message:
+                results[index] = _error(index, action, 400, message)
+                continue
+            values = {"id": article_id}
+            for field in ("title", "content"):
+                if operation.get(field) is not None:
+                    values[field] = operation[field]
+            updates.append((index, values))
+        else:
+            deletes.append((index, article_id))
+
+    # One query for every referenced article and one for every target user
+    article_ids = {values["id"] for _, values in updates} | {i for _, i in deletes}
+    owners = dict(
+        db.session.execute(
+            select(Article.id, Article.user_id).where(Article.id.in_(article_ids))
+        )
+        .tuples()
+        .all()
+    )
+    target_user_ids = {row["user_id"] for _, row in creates}
+    existing_users = set(
+        db.session.execute(
+            select(User.id).where(User.id.in_(target_user_ids))
+        ).scalars()
+    )
+
+    permissions: dict[tuple[str, int], bool] = {}
+
+    def allowed(permission: str, owner_id: int) -> bool:
+        key = (permission, owner_id)
+        if key not in permissions:
+            permissions[key] = current_user.has_permission(
+                permission, article_user_id=owner_id
+            )
+        return permissions[key]
+
+    insert_rows = []
+    for index, row in creates:
+        if row["user_id"] not in existing_users:
+            results[index] = _error(index, "create", 404, "User not found")
+        elif not allowed(Permissions.CREATE, row["user_id"]):
+            results[index] = _error(index, "create", 403, "Access denied")
+        else:
+            insert_rows.append((index, row))
+
+    update_rows = []
+    for index, values in updates:
+        owner_id = owners.get(values["id"])
+        if owner_id is None:
+            results[index] = _error(index, "update", 404, "Article not found")
+        elif not allowed(Permissions.UPDATE, owner_id):
+            results[index] = _error(index, "update", 403, "Access denied")
+        else:
+            update_rows.append((index, values))
+
+    delete_ids: dict[int, int] = {}
+    for index, article_id in deletes:
+        owner_id = owners.get(article_id)
+        if owner_id is None or article_id in delete_ids:
+            results[index] = _error(index, "delete", 404, "Article not found")
+        elif not allowed(Permissions.DELETE, owner_id):
+            results[index] = _error(index, "delete", 403, "Access denied")
+        else:
+            delete_ids[article_id] = index
+
+    failed = any(result is not None for result in results)
+    if failed and strict:
+        return [
+            result
+            or _error(
+                index,
+                operations[index].get("action"),
+                424,
+                "Not applied because another operation failed",
+            )
+            for index, result in enumerate(results)
+        ], True
+
+    if insert_rows:
+        new_ids = db.session.scalars(
+            insert(Article).returning(Article.id, sort_by_parameter_order=True),
+            [row for _, row in insert_rows],
+        ).all()
+        for (index, _), article_id in zip(insert_rows, new_ids):
+            results[index] = {
+                "index": index,
+                "action": "create",
+                "status": 201,
+                "id": article_id,
+            }
+    if update_rows:
+        db.session.execute(update(Article), [values for _, values in update_rows])
+        for index, values in update_rows:
+            results[index] = {
+                "index": index,
+                "action": "update",
+                "status": 200,
+                "id": values["id"],
+            }
+    if delete_ids:
+        db.session.execute(
+            delete(Article)
+            .where(Article.id.in_(delete_ids))
+            .execution_options(synchronize_session=False)
+        )
+        for article_id, index in delete_ids.items():
+            results[index] = {
+                "index": index,
+                "action": "delete",
+                "status": 200,
+                "id": article_id,
+            }
+    counts: Counter[int] = Counter(row["user_id"] for _, row in insert_rows)
+    counts.subtract(owners[article_id] for article_id in delete_ids)
+    adjust_article_counts(counts)
+    if insert_rows or update_rows or delete_ids:
+        ArticleListVersion.bump()
+    db.session.commit()
+    if insert_rows or update_rows or delete_ids:
+        invalidate_articles(
+            [values["id"] for _, values in update_rows] + list(delete_ids)
+        )
+
+    return [result for result in results if result is not None], failed
@@ -1,5 +1,12 @@
+import threading
+from datetime import datetime
+from flask import Flask
+from typing import Mapping
+from sqlalchemy import bindparam, delete, func, select, update
+from userarticlesmanager.models.article import Article, ArticleListVersion
 from userarticlesmanager.models.user import User
 from userarticlesmanager.extensions import db
+from userarticlesmanager.utils.response_cache import invalidate_all_articles
 
 
 def create_user(username: str, password: str, role: str = "Viewer") -> User:
@@ -18,3 +25,156 @@ def create_user(username: str, password: str, role: str = "Viewer") -> User:
     db.session.commit()
 
     return user
+
+
+def adjust_article_counts(deltas: Mapping[int, int]) -> None:
+    """Add `deltas` (user ID -> change) to the users' `article_count`.
+
+    Runs one executemany UPDATE in the session's transaction, so callers
+    apply it before committing the article inserts or deletes it accounts for.
+    """
+    rows = [
+        {"user_id": user_id, "delta": delta}
+        for user_id, delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+    users = User.__table__
+    db.session.execute(
+        update(users)
+        .where(users.c.id == bindparam("user_id"))
+        .values(article_count=users.c.article_count + bindparam("delta")),
+        rows,
+    )
+
+
+def reconcile_article_counts(
+    chunk_size: int = 1000, repair: bool = True
+) -> list[tuple[int, int, int]]:
+    """Compare every user's `article_count` with the articles actually stored.
+
+    Users are checked `chunk_size` IDs at a time, one grouped query and, when
+    `repair` is set, one transaction per chunk. Returns the drifted users as
+    `(user_id, stored count, actual count)`.
+    """
+    drifted: list[tuple[int, int, int]] = []
+    last_id = 0
+    while True:
+        chunk = db.session.execute(
+            select(User.id, User.article_count, func.count(Article.id))
+            .outerjoin(Article, Article.user_id == User.id)
+            .where(User.id > last_id)
+            .group_by(User.id, User.article_count)
+            .order_by(User.id)
+            .limit(chunk_size)
+        ).all()
+        if not chunk:
+            break
+        last_id = chunk[-1][0]
+        wrong = [
+            (user_id, stored, actual)
+            for user_id, stored, actual in chunk
+            if stored != actual
+        ]
+        if wrong and repair:
+            # Applied as deltas, so articles written since the chunk was read
+            # stay counted
+            adjust_article_counts(
+                {user_id: actual - stored for user_id, stored, actual in wrong}
+            )
+        db.session.commit()
+        drifted.extend(wrong)
+    return drifted
+
+
+def delete_user_and_articles(user_id: int) -> None:
+    """Delete a user and all of their articles with two set-based statements.
+
+    The deleted IDs are not read back; cached articles are retired as a whole.
+    """
+    db.session.execute(
+        delete(Article)
+        .where(Article.user_id == user_id)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.execute(delete(User).where(User.id == user_id))
+    ArticleListVersion.bump()
+    db.session.commit()
+    invalidate_all_articles()
+
+
+def purge_user(user_id: int, chunk_size: int) -> int:
+    """Delete a user's articles `chunk_size` rows per transaction, then the user.
+
+    Keeps each transaction and its locks small for authors with very many
+    articles. Returns the number of deleted articles.
+    """
+    deleted = 0
+    while True:
+        chunk = (
+            select(Article.id)
+            .where(Article.user_id == user_id)
+            .limit(chunk_size)
+            .scalar_subquery()
+        )
+        result = db.session.execute(
+            delete(Article)
+            .where(Article.id.in_(chunk))
+            .execution_options(synchronize_session=False)
+        )
+        count = result.rowcount  # type: ignore[attr-defined]
+        adjust_article_counts({user_id: -count})
+        ArticleListVersion.bump()
+        db.session.commit()
+        invalidate_all_articles()
+        deleted += count
+        if count < chunk_size:
+            break
+
+    db.session.execute(delete(User).where(User.id == user_id))
+    db.session.commit()
+    return deleted
+
+
+def mark_user_deleting(user_id: int) -> None:
+    """Record that the user is being deleted, before the purge starts.
+
+    From the commit on the user cannot log in and their tokens are rejected by
+    every worker, and `resume_user_purges` can finish the purge should the
+    process running it die.
+    """
+    db.session.execute(
+        update(User).where(User.id == user_id).values(deleting_at=datetime.utcnow())
+    )
+    db.session.commit()
+
+
+def resume_user_purges(chunk_size: int) -> list[tuple[int, int]]:
+    """Purge every user marked by `mark_user_deleting` whose purge did not finish.
+
+    Returns `(user ID, deleted articles)` per purged user.
+    """
+    user_ids = db.session.scalars(
+        select(User.id).where(User.deleting_at.is_not(None)).order_by(User.id)
+    ).all()
+    return [(user_id, purge_user(user_id, chunk_size)) for user_id in user_ids]
+
+
+def start_user_purge(app: Flask, user_id: int) -> threading.Thread:
+    """Run `purge_user` on a background thread with its own application context."""
+
+    def run() -> None:
+        with app.app_context():
+            try:
+                deleted = purge_user(
+                    user_id, app.config.get("USER_PURGE_CHUNK_SIZE", 1000)
+                )
+                app.logger.info("Purged user %s and %s articles", user_id, deleted)
+            except Exception:
+                app.logger.exception("Purging user %s failed", user_id)
+                db.session.rollback()
+
+    thread = threading.Thread(target=run, name=f"purge-user-{user_id}", daemon=True)
+    thread.start()
+    return thread
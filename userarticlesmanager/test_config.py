@@ -5,3 +5,8 @@ class TestConfig:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = "test_secret"
     TESTING = True
+    # Cheap hashes keep the suite fast; verification runs inline
+    PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"
+    PASSWORD_HASH_WORKERS = 0
+    # Views over their `query_budget` fail the test that requested them
+    QUERY_BUDGET_ENFORCE = True
@@ -0,0 +1,97 @@
+from typing import Any, Optional
+from flask import current_app
+from flask_jwt_extended import get_jwt
+from sqlalchemy import select
+from userarticlesmanager.extensions import db
+from userarticlesmanager.models.user import User, UserSnapshot, role_has_permission
+from userarticlesmanager.utils.cache import TTLCache
+
+
+def token_claims(user: User) -> dict[str, Any]:
+    """Additional access token claims that let requests be authorized without a query."""
+    return {"role": user.role, "role_version": user.role_version}
+
+
+def is_token_revoked(_jwt_header: dict[str, Any], jwt_data: dict[str, Any]) -> bool:
+    """`token_in_blocklist_loader` rejecting tokens of deleted users and tokens
+    issued before a role change.
+
+    The role version is read from the users table through `lookup_user`, so a
+    change made by any worker process is seen here within the cache TTL.
+    """
+    user_id = int(jwt_data[current_app.config["JWT_IDENTITY_CLAIM"]])
+    snapshot = lookup_user(user_id)
+    if snapshot is None:
+        return True
+    return jwt_data.get("role_version", snapshot.role_version) < snapshot.role_version
+
+
+def token_has_permission(
+    permission: str, article_user_id: Optional[int] = None
+) -> bool:
+    """`has_permission` for the current request using only the token's claims."""
+    claims = get_jwt()
+    user_id = int(claims[current_app.config["JWT_IDENTITY_CLAIM"]])
+    if "role" in claims:
+        return role_has_permission(claims["role"], user_id, permission, article_user_id)
+    # Tokens issued before role claims existed fall back to the user lookup.
+    snapshot = load_current_user({}, claims)
+    return snapshot is not None and snapshot.has_permission(permission, article_user_id)
+
+
+def get_user_cache() -> TTLCache:
+    """Return the application's cache of `UserSnapshot` objects keyed by user ID."""
+    return current_app.extensions["current_user_cache"]
+
+
+def lookup_user(user_id: int) -> Optional[UserSnapshot]:
+    """Return the user's `(id, role, role_version)`, or None for a deleted user
+    or one being deleted.
+
+    Snapshots are cached per process for `CURRENT_USER_CACHE_TTL` seconds, so
+    authorizing a request normally needs no database query; a change made by
+    another worker process is seen once the entry expires. Missing users are
+    not cached and are looked up again on every request.
+    """
+    cache = get_user_cache()
+    snapshot = cache.get(user_id)
+    if snapshot is None:
+        row = db.session.execute(
+            select(User.id, User.role, User.role_version).where(
+                User.id == user_id, User.deleting_at.is_(None)
+            )
+        ).first()
+        if row is None:
+            return None
+        snapshot = UserSnapshot(id=row.id, role=row.role, role_version=row.role_version)
+        cache.set(user_id, snapshot)
+    return snapshot
+
+
+def remember_current_user(user: User) -> None:
+    """Cache the snapshot of a user just loaded in full, e.g. at login."""
+    get_user_cache().set(
+        user.id,
+        UserSnapshot(id=user.id, role=user.role, role_version=user.role_version),
+    )
+
+
+def load_current_user(
+    _jwt_header: dict[str, Any], jwt_data: dict[str, Any]
+) -> Optional[UserSnapshot]:
+    """`user_lookup_loader` for flask_jwt_extended, exposed as `current_user`.
+
+    Tokens with a role claim are trusted as is (`is_token_revoked` has already
+    checked the role version). For older tokens the role comes from
+    `lookup_user`. Returning None for a deleted user makes flask_jwt_extended
+    reject the request with a 401.
+    """
+    user_id = int(jwt_data[current_app.config["JWT_IDENTITY_CLAIM"]])
+    if "role" in jwt_data:
+        return UserSnapshot.from_claims(user_id, jwt_data)
+    return lookup_user(user_id)
+
+
+def invalidate_current_user(user_id: int) -> None:
+    """Drop a cached snapshot after the user's role changes or the user is deleted."""
+    get_user_cache().delete(user_id)
@@ -0,0 +1,124 @@
+import gzip
+import zlib
+from typing import Any, Iterable, Iterator, Optional
+from flask import Response, current_app, request
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "text/csv",
+    "text/css",
+    "text/html",
+    "text/plain",
+}
+
+# Strong ETags of compressed bodies get one of these suffixes, as the bytes differ
+ENCODING_ETAG_SUFFIXES = ("-gzip", "-br")
+
+
+def negotiate_encoding() -> Optional[str]:
+    """Pick "br" or "gzip" from the request's `Accept-Encoding`, or None."""
+    accepted = request.accept_encodings
+    candidates = []
+    if brotli is not None and accepted.quality("br") > 0:
+        candidates.append((accepted.quality("br"), 1, "br"))
+    if accepted.quality("gzip") > 0:
+        candidates.append((accepted.quality("gzip"), 0, "gzip"))
+    return max(candidates)[2] if candidates else None
+
+
+class _StreamCompressor:
+    """Incremental gzip or brotli compressor that flushes after every chunk, so
+    consumers of a streamed body still receive rows as they are produced."""
+
+    def __init__(self, encoding: str, level: int, brotli_quality: int) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits 16 + MAX_WBITS writes a gzip container
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def _compress_stream(
+    chunks: Iterable[Any], compressor: _StreamCompressor
+) -> Iterator[bytes]:
+    # Runs after the request context is gone, so the compressor is built beforehand
+    try:
+        for chunk in chunks:
+            data = compressor.compress(
+                chunk.encode() if isinstance(chunk, str) else chunk
+            )
+            if data:
+                yield data
+        yield compressor.finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def _compress_body(
+    body: bytes, encoding: str, level: int, brotli_quality: int
+) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def compress_response(response: Response) -> Response:
+    """`after_request` hook compressing text responses the client accepts compressed.
+
+    Buffered bodies below `COMPRESS_MIN_SIZE` bytes are sent as they are.
+    Streamed bodies (e.g. the export) are always compressed, chunk by chunk.
+    """
+    if (
+        response.mimetype not in COMPRESSIBLE_MIMETYPES
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or response.cache_control.no_transform
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    level = current_app.config.get("COMPRESS_LEVEL", 6)
+    brotli_quality = current_app.config.get("COMPRESS_BROTLI_QUALITY", 4)
+    if response.is_streamed:
+        response.response = _compress_stream(
+            response.response, _StreamCompressor(encoding, level, brotli_quality)
+        )
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        if len(body) < current_app.config.get("COMPRESS_MIN_SIZE", 1024):
+            return response
+        response.set_data(_compress_body(body, encoding, level, brotli_quality))
+
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
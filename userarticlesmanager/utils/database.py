@@ -1,6 +1,26 @@
+import io
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterator, Optional
+from flask import current_app
+from sqlalchemy import BigInteger, Table, cast, func, insert, select
 from userarticlesmanager.models.user import User, UserRoles
-from userarticlesmanager.models.article import Article
+from userarticlesmanager.models.article import Article, ArticleListVersion
 from userarticlesmanager.extensions import db
+from userarticlesmanager.services.user_service import adjust_article_counts
+from userarticlesmanager.utils.passwords import hash_password
+from userarticlesmanager.utils.response_cache import invalidate_articles
+
+# Vocabulary of generated titles and content, so that searches find matches
+SAMPLE_WORDS = (
+    "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima "
+    "mike november oscar papa quebec romeo sierra tango uniform victor whiskey "
+    "xray yankee zulu database index query cache latency replica pool worker "
+    "article author review draft release garden recipe travel science music"
+).split()
+# Distinct article bodies generated up front and reused, which keeps generation fast
+_CONTENT_VARIANTS = 1000
 
 
 def create_sample_data() -> None:
@@ -34,8 +54,165 @@ def create_sample_data() -> None:
     db.session.add(article1)
     db.session.add(article2)
     db.session.add(article3)
+    adjust_article_counts({admin.id: 1, editor.id: 1, viewer.id: 1})
+    ArticleListVersion.bump()
 
     # Commit changes to the database
     db.session.commit()
 
     print("Sample data created successfully!")
+
+
+def generate_sample_data(
+    users: int,
+    articles: int,
+    content_size: int = 500,
+    seed: int = 0,
+    password: str = "password",
+    batch_size: int = 10_000,
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> tuple[int, int]:
+    """Insert `users` users and `articles` articles of synthetic data.
+
+    Usernames are `user1`, `user2`, ..., continuing after the highest `userN`
+    already present so that the generator can be run again; `user1` is an
+    admin, every tenth user an editor and the others viewers, and all share
+    `password`, hashed once. Rows are written in batches of `batch_size`, one
+    transaction each, with PostgreSQL's `COPY` when the driver is psycopg2 and
+    batched Core INSERTs otherwise; the same `seed` produces the same data.
+    `progress` is called with the table name and the rows written so far
+    after each batch. Returns the number of users and articles inserted.
+    """
+    rng = random.Random(seed)
+    password_hash = hash_password(password)
+    first = _last_sample_number() + 1
+    user_ids: list[int] = []
+    for batch in _batches(
+        (
+            {
+                "username": f"user{n}",
+                "password_hash": password_hash,
+                "role": _sample_role(n),
+            }
+            for n in range(first, first + users)
+        ),
+        batch_size,
+    ):
+        if _copy_supported():
+            _copy_rows(User.__table__, batch)
+            user_ids.extend(
+                db.session.scalars(
+                    select(User.id)
+                    .where(User.username.in_([row["username"] for row in batch]))
+                    .order_by(User.id)
+                )
+            )
+        else:
+            user_ids.extend(db.session.scalars(insert(User).returning(User.id), batch))
+        db.session.commit()
+        if progress is not None:
+            progress(User.__tablename__, len(user_ids))
+
+    written = 0
+    if user_ids:
+        contents = [_sample_text(rng, content_size) for _ in range(_CONTENT_VARIANTS)]
+        started_at = datetime.utcnow() - timedelta(seconds=articles)
+        for batch in _batches(
+            (
+                {
+                    "title": _sample_text(rng, 60).title(),
+                    "content": rng.choice(contents),
+                    "created_at": started_at + timedelta(seconds=n),
+                    "user_id": rng.choice(user_ids),
+                }
+                for n in range(articles)
+            ),
+            batch_size,
+        ):
+            if _copy_supported():
+                _copy_rows(Article.__table__, batch)
+            else:
+                db.session.execute(insert(Article), batch)
+            adjust_article_counts(Counter(row["user_id"] for row in batch))
+            ArticleListVersion.bump()
+            db.session.commit()
+            written += len(batch)
+            if progress is not None:
+                progress(Article.__tablename__, written)
+
+    # Bulk inserts bypass the ORM events that maintain these
+    current_app.extensions.pop("username_index", None)
+    invalidate_articles()
+    return len(user_ids), written
+
+
+def _last_sample_number() -> int:
+    """Highest N of the existing `userN` usernames, or 0."""
+    last = db.session.scalar(
+        select(func.max(cast(func.substr(User.username, 5), BigInteger))).where(
+            User.username.regexp_match("^user[0-9]+$")
+        )
+    )
+    return last or 0
+
+
+def _copy_supported() -> bool:
+    dialect = db.session.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+def _copy_rows(table: Table, rows: list[dict[str, Any]]) -> None:
+    """Write `rows` to `table` with `COPY ... FROM STDIN` in the session's transaction.
+
+    Row triggers (e.g. the article search vector) still fire; columns left
+    out take their server defaults.
+    """
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(row[column]) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor = db.session.connection().connection.dbapi_connection.cursor()  # type: ignore[union-attr]
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN", buffer
+        )
+    finally:
+        cursor.close()
+
+
+def _copy_value(value: Any) -> str:
+    """`value` in COPY's text format."""
+    if value is None:
+        return "\\N"
+    text = value.isoformat() if isinstance(value, datetime) else str(value)
+    return (
+        text.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _sample_role(n: int) -> str:
+    if n == 1:
+        return UserRoles.ADMIN
+    return UserRoles.EDITOR if n % 10 == 0 else UserRoles.VIEWER
+
+
+def _sample_text(rng: random.Random, size: int) -> str:
+    # Words average under six characters with their separator, so this is enough
+    words = rng.choices(SAMPLE_WORDS, k=size // 3 + 1)
+    return " ".join(words)[:size].strip()
+
+
+def _batches(rows: Iterator[dict[str, Any]], size: int) -> Iterator[list[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
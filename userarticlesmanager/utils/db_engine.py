@@ -0,0 +1,203 @@
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+from flask import Response, current_app, jsonify, request
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+# Statement timeout (ms) of the request being served, or None outside requests
+_statement_timeout: ContextVar[Optional[int]] = ContextVar(
+    "statement_timeout", default=None
+)
+# Monotonic deadline of the SQLite statement running in this context
+_sqlite_deadline: ContextVar[Optional[float]] = ContextVar(
+    "sqlite_deadline", default=None
+)
+
+# SQLite checks the deadline every this many virtual machine instructions
+_SQLITE_PROGRESS_STEPS = 1000
+# PostgreSQL's SQLSTATE for query_canceled, raised when statement_timeout expires
+_QUERY_CANCELED = "57014"
+
+
+class InstrumentedQueuePool(QueuePool):
+    """`QueuePool` that records how long checkouts wait for a free connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._metrics_lock:
+                self.checkouts += 1
+                self.checkout_timeouts += timed_out
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+    def stats(self) -> dict[str, Any]:
+        """Occupancy right now and checkout waits since the pool was created."""
+        with self._metrics_lock:
+            return {
+                "size": self.size(),
+                "max_overflow": self._max_overflow,
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "wait_seconds_total": self.wait_total,
+                "wait_seconds_max": self.wait_max,
+            }
+
+
+def engine_options(
+    database_uri: str,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_timeout: float = 10.0,
+    pool_recycle: int = 1800,
+    pool_pre_ping: bool = True,
+    statement_timeout_ms: int = 0,
+    connect_timeout: int = 10,
+) -> dict[str, Any]:
+    """Build `SQLALCHEMY_ENGINE_OPTIONS` for `database_uri`.
+
+    Pool settings only apply to server databases; SQLite keeps the pool
+    Flask-SQLAlchemy chooses for it. On PostgreSQL `statement_timeout_ms` is
+    set for every connection (0 disables it).
+    """
+    if not database_uri or make_url(database_uri).get_backend_name() == "sqlite":
+        return {}
+
+    options: dict[str, Any] = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_recycle": pool_recycle,
+        "pool_pre_ping": pool_pre_ping,
+    }
+    if make_url(database_uri).get_backend_name() == "postgresql":
+        options["connect_args"] = {
+            "connect_timeout": connect_timeout,
+            "options": f"-c statement_timeout={statement_timeout_ms}",
+        }
+    return options
+
+
+def replica_binds(replica_uris: list[str], **settings: Any) -> dict[str, Any]:
+    """`SQLALCHEMY_BINDS` entries "replica_0", "replica_1", ... for read replicas,
+    each with the same engine `settings` as the primary."""
+    return {
+        f"replica_{index}": {"url": uri, **engine_options(uri, **settings)}
+        for index, uri in enumerate(replica_uris)
+    }
+
+
+def pool_stats(engine: Engine) -> dict[str, Any]:
+    """Metrics of `engine`'s pool; only the pool class for uninstrumented pools."""
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        return engine.pool.stats()
+    return {"pool": type(engine.pool).__name__}
+
+
+def request_statement_timeout() -> Optional[int]:
+    """Statement timeout in milliseconds for the current request's endpoint.
+
+    `STATEMENT_TIMEOUTS_MS` overrides `DB_STATEMENT_TIMEOUT_MS` per endpoint.
+    """
+    default = current_app.config.get("DB_STATEMENT_TIMEOUT_MS", 0)
+    overrides = current_app.config.get("STATEMENT_TIMEOUTS_MS", {})
+    return overrides.get(request.endpoint, default) or None
+
+
+def start_request_timeout() -> None:
+    """`before_request` hook arming the statement timeout of this request."""
+    _statement_timeout.set(request_statement_timeout())
+
+
+def end_request_timeout(error: Optional[BaseException] = None) -> None:
+    """`teardown_request` hook disarming it again."""
+    _statement_timeout.set(None)
+
+
+@event.listens_for(Session, "after_begin")
+def _set_local_statement_timeout(
+    session: Session, transaction: Any, connection: Any
+) -> None:
+    # Connections already carry DB_STATEMENT_TIMEOUT_MS; only overrides cost a round trip
+    timeout = _statement_timeout.get()
+    if (
+        timeout is None
+        or connection.dialect.name != "postgresql"
+        or timeout == current_app.config.get("DB_STATEMENT_TIMEOUT_MS", 0)
+    ):
+        return
+    connection.execute(select(func.set_config("statement_timeout", str(timeout), True)))
+
+
+@event.listens_for(Engine, "connect")
+def _install_sqlite_interrupt(dbapi_connection: Any, connection_record: Any) -> None:
+    # SQLite has no statement_timeout; abort statements that run past the deadline
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.set_progress_handler(
+            _sqlite_deadline_passed, _SQLITE_PROGRESS_STEPS
+        )
+
+
+def _sqlite_deadline_passed() -> int:
+    deadline = _sqlite_deadline.get()
+    return int(deadline is not None and time.monotonic() > deadline)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _arm_sqlite_deadline(
+    connection: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    timeout = _statement_timeout.get()
+    _sqlite_deadline.set(None if timeout is None else time.monotonic() + timeout / 1000)
+
+
+def is_statement_timeout(error: OperationalError) -> bool:
+    """Whether `error` was raised because a statement ran past its timeout."""
+    if getattr(error.orig, "pgcode", None) == _QUERY_CANCELED:
+        return True
+    return isinstance(error.orig, sqlite3.OperationalError) and "interrupted" in str(
+        error.orig
+    )
+
+
+def handle_operational_error(error: OperationalError) -> Response:
+    """Answer 503 for statements cancelled by their timeout; re-raise anything else."""
+    if not is_statement_timeout(error):
+        raise error
+    current_app.logger.warning("Statement timeout on %s", request.endpoint)
+    response = jsonify({"message": "The database query took too long"})
+    response.status_code = 503
+    response.headers["Retry-After"] = "1"
+    return response
@@ -0,0 +1,65 @@
+import csv
+import io
+from typing import Any, Iterator, Optional, Sequence
+from flask import current_app
+from sqlalchemy import select
+from userarticlesmanager.extensions import db
+from userarticlesmanager.models.article import Article
+from userarticlesmanager.utils.fields import load_fields
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def iter_article_batches(
+    batch_size: int, fields: Optional[Sequence[str]] = None
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield `Article.to_dict` for every article, one batch of rows at a time.
+
+    `yield_per` makes the driver use a server-side cursor where the database
+    supports one, so only one batch of rows is held in memory at a time. The
+    session's identity map only holds weak references, so exported objects are
+    released as soon as their batch has been serialized. With `fields`, only
+    those columns are selected.
+    """
+    statement = (
+        select(Article)
+        .options(*load_fields(Article, fields))
+        .order_by(Article.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in db.session.execute(statement).scalars().partitions():
+        yield [article.to_dict(fields) for article in partition]
+
+
+def generate_ndjson(
+    batch_size: int, fields: Optional[Sequence[str]] = None
+) -> Iterator[str]:
+    """Yield articles as newline-delimited JSON, one chunk per batch."""
+    dumps = current_app.json.dumps
+    for batch in iter_article_batches(batch_size, fields):
+        yield "".join(dumps(row) + "\n" for row in batch)
+
+
+def generate_csv(
+    batch_size: int, fields: Optional[Sequence[str]] = None
+) -> Iterator[str]:
+    """Yield articles as CSV with a header row, one chunk per batch."""
+    buffer = io.StringIO()
+    writer: Any = None
+    for batch in iter_article_batches(batch_size, fields):
+        for row in batch:
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(
+                {
+                    key: value.isoformat() if hasattr(value, "isoformat") else value
+                    for key, value in row.items()
+                }
+            )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
@@ -0,0 +1,42 @@
+from typing import Any, Optional, Sequence
+from sqlalchemy.orm import load_only
+
+
+class FieldsError(ValueError):
+    """Raised when the `fields` query parameter names unknown fields."""
+
+
+def parse_fields(
+    raw_fields: Optional[str], allowed: Sequence[str]
+) -> Optional[list[str]]:
+    """Parse a comma-separated `fields` query parameter.
+
+    Returns None when the parameter is absent (all fields), otherwise the
+    requested fields in the order of `allowed`.
+    """
+    requested = {
+        field.strip() for field in (raw_fields or "").split(",") if field.strip()
+    }
+    if not requested:
+        return None
+    unknown = sorted(requested.difference(allowed))
+    if unknown:
+        raise FieldsError(
+            f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return [field for field in allowed if field in requested]
+
+
+def load_fields(
+    model: Any, fields: Optional[Sequence[str]], *required: str
+) -> list[Any]:
+    """Loader options that fetch only `fields` and the `required` columns of `model`.
+
+    Other columns are not selected at all, and reading one of them raises
+    instead of silently issuing another query. Returns no options when every
+    field was requested.
+    """
+    if fields is None:
+        return []
+    names = dict.fromkeys([*fields, *required])
+    return [load_only(*(getattr(model, name) for name in names), raiseload=True)]
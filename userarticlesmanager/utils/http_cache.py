@@ -0,0 +1,84 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Optional, Sequence
+from flask import Response, request
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _as_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps are stored as naive UTC; make them comparable with header dates."""
+    if moment is None:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.replace(microsecond=0)
+
+
+def article_version(created_at: datetime, updated_at: Optional[datetime]) -> datetime:
+    """Last modification time of an article; never-updated articles use `created_at`."""
+    return updated_at or created_at
+
+
+def article_etag(
+    article_id: int, modified_at: datetime, fields: Optional[Sequence[str]] = None
+) -> str:
+    """Strong ETag of one article, derived from its ID and last modification time.
+
+    A sparse fieldset is a different representation and gets its own ETag.
+    """
+    if fields is None:
+        return _digest("article", article_id, modified_at.isoformat())
+    return _digest("article", article_id, modified_at.isoformat(), ",".join(fields))
+
+
+def collection_etag(version: int, query_string: bytes) -> str:
+    """Strong ETag of a list page.
+
+    `version` (see `ArticleListVersion`) changes with every article write; the
+    query string distinguishes pages.
+    """
+    return _digest("articles", version, query_string.decode())
+
+
+def _variants(etag: str) -> list[str]:
+    # The compression hook appends the content coding to the ETags it sends
+    from userarticlesmanager.utils.compression import ENCODING_ETAG_SUFFIXES
+
+    return [etag] + [etag + suffix for suffix in ENCODING_ETAG_SUFFIXES]
+
+
+def is_not_modified(etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate `If-None-Match` and, only when it is absent, `If-Modified-Since`."""
+    if request.if_none_match:
+        return any(request.if_none_match.contains_weak(v) for v in _variants(etag))
+    if request.if_modified_since and last_modified is not None:
+        return _as_utc(last_modified) <= request.if_modified_since  # type: ignore[operator]
+    return False
+
+
+def matches_if_match(etag: str) -> bool:
+    """Check a request's `If-Match` precondition; true when the header is absent."""
+    if not request.if_match:
+        return True
+    return any(request.if_match.contains(variant) for variant in _variants(etag))
+
+
+def add_validators(
+    response: Response, etag: str, last_modified: Optional[datetime]
+) -> Response:
+    """Set `ETag` and `Last-Modified` and ask clients to revalidate on every use."""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _as_utc(last_modified)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def not_modified(etag: str, last_modified: Optional[datetime]) -> Response:
+    """Build an empty 304 response carrying the current validators."""
+    response = Response(status=304)
+    return add_validators(response, etag, last_modified)
@@ -0,0 +1,295 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+from flask import Response, current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+View = TypeVar("View", bound=Callable[..., Any])
+
+# Upper bounds (seconds) of the request duration histogram
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised, when `QUERY_BUDGET_ENFORCE` is set, by a view that ran more queries
+    than its `query_budget` allows."""
+
+
+class QueryStats:
+    """Number and duration of the statements run while it is active."""
+
+    def __init__(self, slow_threshold: Optional[float] = None) -> None:
+        self.slow_threshold = slow_threshold
+        self.queries = 0
+        self.seconds = 0.0
+        self.slow_queries = 0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+
+# Statistics of the request being served, and of any `count_queries` blocks
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "request_stats", default=None
+)
+_counters: ContextVar[tuple[QueryStats, ...]] = ContextVar("counters", default=())
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(
+    connection: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    connection.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(
+    connection: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    seconds = time.perf_counter() - connection.info["query_started"].pop()
+    for counter in _counters.get():
+        counter.record(statement, seconds)
+    stats = _request_stats.get()
+    if stats is None:
+        return
+    stats.record(statement, seconds)
+    if stats.slow_threshold is not None and seconds >= stats.slow_threshold:
+        stats.slow_queries += 1
+        # Parameters are left out of the log, as they can hold user data
+        current_app.logger.warning(
+            "Slow query (%.1f ms) on %s: %s",
+            seconds * 1000,
+            request.endpoint,
+            " ".join(statement.split())[:500],
+        )
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Count the statements run in this context, e.g. by test client requests::
+
+    with count_queries() as stats:
+        client.get("/api/articles")
+    assert stats.queries <= 2
+    """
+    stats = QueryStats()
+    token = _counters.set(_counters.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _counters.reset(token)
+
+
+def query_budget(max_queries: int) -> Callable[[View], View]:
+    """Declare how many queries one call of the decorated view may run.
+
+    Queries made before the view is entered (e.g. by the JWT user lookup of
+    an outer `jwt_required`) are not counted. Calls over the budget are
+    logged together with the statements that repeated (the usual sign of an
+    N+1 pattern); with `QUERY_BUDGET_ENFORCE` (set by the test configuration)
+    they raise `QueryBudgetExceeded`.
+    """
+
+    def decorator(view: View) -> View:
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            stats = g.get("query_stats")
+            g.query_budget = (max_queries, stats.queries if stats else 0)
+            return current_app.ensure_sync(view)(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+class Metrics:
+    """Per-process request and query counters in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests: defaultdict[tuple[str, str, int], int] = defaultdict(int)
+        self.durations: dict[str, list[float]] = {}
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.slow_queries = 0
+        self.budget_overruns = 0
+        self.rejections: defaultdict[tuple[str, str], int] = defaultdict(int)
+
+    def observe(
+        self,
+        method: str,
+        endpoint: str,
+        status: int,
+        seconds: float,
+        stats: QueryStats,
+        over_budget: bool = False,
+    ) -> None:
+        with self._lock:
+            self.requests[(method, endpoint, status)] += 1
+            # Bucket counts, then sum and count
+            histogram = self.durations.setdefault(
+                endpoint, [0.0] * (len(DURATION_BUCKETS) + 2)
+            )
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    histogram[index] += 1
+            histogram[-2] += seconds
+            histogram[-1] += 1
+            self.db_queries += stats.queries
+            self.db_seconds += stats.seconds
+            self.slow_queries += stats.slow_queries
+            self.budget_overruns += over_budget
+
+    def reject(self, reason: str, endpoint: str) -> None:
+        """Count a request turned away by admission control.
+
+        `reason` is "rate_limit" or "concurrency".
+        """
+        with self._lock:
+            self.rejections[(reason, endpoint)] += 1
+
+    def render(self, extra: Iterable[tuple[str, str, str, float]] = ()) -> str:
+        """Prometheus exposition of the counters, followed by `extra` metrics given
+        as `(name, type, help, value)`."""
+        lines: list[str] = []
+
+        def metric(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            metric("http_requests_total", "counter", "Requests served.")
+            for (method, endpoint, status), requests in sorted(self.requests.items()):
+                lines.append(
+                    f'http_requests_total{{method="{method}",endpoint="{endpoint}",'
+                    f'status="{status}"}} {requests}'
+                )
+            metric("http_request_duration_seconds", "histogram", "Request wall time.")
+            for endpoint, histogram in sorted(self.durations.items()):
+                for bound, count in zip(DURATION_BUCKETS, histogram):
+                    lines.append(
+                        f"http_request_duration_seconds_bucket"
+                        f'{{endpoint="{endpoint}",le="{bound}"}} {count:g}'
+                    )
+                lines.append(
+                    f"http_request_duration_seconds_bucket"
+                    f'{{endpoint="{endpoint}",le="+Inf"}} {histogram[-1]:g}'
+                )
+                lines.append(
+                    f'http_request_duration_seconds_sum{{endpoint="{endpoint}"}} '
+                    f"{histogram[-2]}"
+                )
+                lines.append(
+                    f'http_request_duration_seconds_count{{endpoint="{endpoint}"}} '
+                    f"{histogram[-1]:g}"
+                )
+            for name, help_text, value in (
+                ("db_queries_total", "Statements run by requests.", self.db_queries),
+                (
+                    "db_query_duration_seconds_total",
+                    "Time requests spent in statements.",
+                    self.db_seconds,
+                ),
+                (
+                    "db_slow_queries_total",
+                    "Statements slower than SLOW_QUERY_THRESHOLD_MS.",
+                    self.slow_queries,
+                ),
+                (
+                    "db_query_budget_exceeded_total",
+                    "Requests that ran more queries than their budget.",
+                    self.budget_overruns,
+                ),
+            ):
+                metric(name, "counter", help_text)
+                lines.append(f"{name} {value}")
+            metric(
+                "http_requests_rejected_total",
+                "counter",
+                "Requests refused by rate limits or concurrency caps.",
+            )
+            for (reason, endpoint), rejected in sorted(self.rejections.items()):
+                lines.append(
+                    f'http_requests_rejected_total{{reason="{reason}",'
+                    f'endpoint="{endpoint}"}} {rejected}'
+                )
+
+        for name, kind, help_text, value in extra:
+            metric(name, kind, help_text)
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _queries(count: int) -> str:
+    return "1 query" if count == 1 else f"{count} queries"
+
+
+def get_metrics() -> Metrics:
+    return current_app.extensions["metrics"]
+
+
+def start_request_instrumentation() -> None:
+    """`before_request` hook starting the wall clock and the query statistics."""
+    g.request_started = time.perf_counter()
+    threshold_ms = current_app.config.get("SLOW_QUERY_THRESHOLD_MS", 200)
+    g.query_stats = QueryStats(threshold_ms / 1000 if threshold_ms > 0 else None)
+    _request_stats.set(g.query_stats)
+
+
+def finish_request_instrumentation(response: Response) -> Response:
+    """`after_request` hook recording the request and adding `Server-Timing`."""
+    stats: Optional[QueryStats] = g.get("query_stats")
+    if stats is None:  # a before_request hook registered earlier failed
+        return response
+    _request_stats.set(None)
+    seconds = time.perf_counter() - g.request_started
+
+    budget, queries_before = g.get("query_budget", (None, 0))
+    view_queries = stats.queries - queries_before
+    over_budget = budget is not None and view_queries > budget
+    get_metrics().observe(
+        request.method,
+        request.endpoint or "none",
+        response.status_code,
+        seconds,
+        stats,
+        over_budget,
+    )
+
+    if current_app.config.get("SERVER_TIMING_ENABLED", True):
+        response.headers["Server-Timing"] = (
+            f'db;dur={stats.seconds * 1000:.1f};desc="{_queries(stats.queries)}", '
+            f"app;dur={seconds * 1000:.1f}"
+        )
+
+    if over_budget:
+        repeated = [
+            f"{count}x {' '.join(statement.split())[:200]}"
+            for statement, count in stats.statements.most_common(3)
+            if count > 1
+        ]
+        message = f"{request.endpoint} ran {stats.queries} queries, budget {budget}" + (
+            f"; repeated: {'; '.join(repeated)}" if repeated else ""
+        )
+        current_app.logger.warning("Query budget exceeded: %s", message)
+        if current_app.config.get("QUERY_BUDGET_ENFORCE", False):
+            raise QueryBudgetExceeded(message)
+    return response
@@ -0,0 +1,84 @@
+import dataclasses
+import decimal
+import uuid
+from datetime import date, datetime, timezone
+from typing import Any
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speed-up
+    orjson = None  # type: ignore[assignment]
+
+
+def _isoformat(moment: datetime) -> str:
+    """ISO 8601 as orjson writes it; naive timestamps are stored as UTC."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    text = moment.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return _isoformat(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """The standard library provider, writing datetimes as ISO 8601 like `OrjsonProvider`.
+
+    Keys keep their insertion order and non-ASCII text is written as UTF-8, so
+    both providers produce the same documents.
+    """
+
+    default = staticmethod(_default)  # type: ignore[assignment]
+    ensure_ascii = False
+    sort_keys = False
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, which serializes datetimes natively."""
+
+    options = (
+        0
+        if orjson is None
+        else orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    )
+
+    def _dumps(self, obj: Any, indent: bool = False) -> bytes:
+        options = self.options | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=_default, option=options)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self._dumps(obj, indent=bool(kwargs.get("indent"))).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Like `DefaultJSONProvider.response`, but without a str round trip."""
+        obj = self._prepare_response_obj(args, kwargs)
+        body = self._dumps(obj, indent=self._app.debug) + b"\n"
+        return self._app.response_class(body, mimetype="application/json")  # type: ignore
+
+
+def create_json_provider(app: Flask) -> JSONProvider:
+    """Select the provider from `JSON_PROVIDER`: "orjson", "stdlib" or "auto" (orjson if installed)."""
+    choice = app.config.get("JSON_PROVIDER", "auto")
+    if choice == "orjson" and orjson is None:
+        raise RuntimeError("JSON_PROVIDER=orjson requires the orjson package")
+    if choice == "orjson" or (choice == "auto" and orjson is not None):
+        return OrjsonProvider(app)
+    if choice in ("auto", "stdlib"):
+        return StdlibJSONProvider(app)
+    raise ValueError(f"Unknown JSON_PROVIDER: {choice}")
@@ -0,0 +1,91 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional
+from flask import current_app
+from sqlalchemy import or_
+
+
+class PaginationError(ValueError):
+    """Raised when pagination parameters in a request are invalid."""
+
+
+def parse_limit(raw_limit: Optional[str]) -> int:
+    """Parse the `limit` query parameter, applying the configured default and maximum."""
+    default_limit = current_app.config.get("PAGE_SIZE_DEFAULT", 20)
+    max_limit = current_app.config.get("PAGE_SIZE_MAX", 100)
+    if raw_limit is None or raw_limit == "":
+        return default_limit
+    try:
+        limit = int(raw_limit)
+    except ValueError:
+        raise PaginationError("Limit must be an integer")
+    if limit < 1:
+        raise PaginationError("Limit must be a positive integer")
+    return min(limit, max_limit)
+
+
+def parse_offset(raw_offset: Optional[str]) -> int:
+    """Parse the `offset` query parameter used by ranked (non-keyset) listings."""
+    if raw_offset is None or raw_offset == "":
+        return 0
+    try:
+        offset = int(raw_offset)
+    except ValueError:
+        raise PaginationError("Offset must be an integer")
+    if offset < 0:
+        raise PaginationError("Offset must not be negative")
+    return offset
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor string."""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by `encode_cursor` back into its keyset position."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise PaginationError("Invalid cursor")
+
+
+def keyset_window(
+    query: Any, model: Any, limit: int, after: Optional[str] = None
+) -> Any:
+    """Restrict `query` (a legacy `Query` or a `Select`) to the page after `after`.
+
+    The position is compared as `created_at >= c AND (created_at > c OR id > i)`
+    rather than as a row value so that it behaves identically on SQLite and
+    PostgreSQL; the leading `created_at >= c` lets both seek into the
+    `(created_at, id)` index instead of scanning it from the start. One extra
+    row is fetched to find out whether a next page exists.
+    """
+    if after:
+        created_at, row_id = decode_cursor(after)
+        query = query.filter(
+            model.created_at >= created_at,
+            or_(model.created_at > created_at, model.id > row_id),
+        )
+    return query.order_by(model.created_at, model.id).limit(limit + 1)
+
+
+def split_page(rows: list[Any], limit: int) -> tuple[list[Any], Optional[str]]:
+    """Cut the rows fetched through `keyset_window` to one page plus the next cursor."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
+
+
+def paginate_keyset(
+    query: Any, model: Any, limit: int, after: Optional[str] = None
+) -> tuple[list[Any], Optional[str]]:
+    """Return one page of `query` ordered on `(created_at, id)` plus the next cursor."""
+    return split_page(keyset_window(query, model, limit, after).all(), limit)
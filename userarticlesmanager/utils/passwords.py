@@ -0,0 +1,125 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Optional, TypeVar
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when every slot of the process pool is taken, or a hash times out."""
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords with configurable werkzeug parameters.
+
+    With `workers` > 0, verification and the rehash at login run on a process
+    pool so CPU-bound hashing cannot occupy the request threads. At most
+    `max_pending` of them are queued or running at a time; further calls raise
+    `PasswordHasherBusy` instead of waiting, so a login burst cannot starve
+    other endpoints. With `workers` == 0, hashing runs inline.
+    """
+
+    def __init__(
+        self,
+        method: str = "scrypt",
+        salt_length: int = 16,
+        workers: int = 0,
+        max_pending: int = 32,
+        timeout: float = 10.0,
+    ) -> None:
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(max_pending, 1))
+        self._max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._executor_lock = threading.Lock()
+        self._hash_prefix: Optional[str] = None
+
+    def hash(self, raw_password: str) -> str:
+        return generate_password_hash(
+            raw_password, method=self.method, salt_length=self.salt_length
+        )
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Check whether a stored hash was made with other parameters than the configured ones.
+
+        Stored hashes read `method$salt$hash`; both the method with its cost
+        parameters and the length of the salt are compared.
+        """
+        if self._hash_prefix is None:
+            # werkzeug expands e.g. "scrypt" to "scrypt:32768:8:1" in the stored hash
+            self._hash_prefix = self.hash("").split("$", 1)[0]
+        method, _, rest = password_hash.partition("$")
+        salt = rest.split("$", 1)[0]
+        return method != self._hash_prefix or len(salt) != self.salt_length
+
+    def verify(self, password_hash: str, raw_password: str) -> bool:
+        if self.workers <= 0:
+            return check_password_hash(password_hash, raw_password)
+        return self._run(check_password_hash, password_hash, raw_password)
+
+    def pooled_hash(self, raw_password: str) -> str:
+        """`hash` on the process pool, e.g. to upgrade a stored hash at login."""
+        if self.workers <= 0:
+            return self.hash(raw_password)
+        return self._run(
+            generate_password_hash, raw_password, self.method, self.salt_length
+        )
+
+    def _run(self, function: Callable[..., T], *args: Any) -> T:
+        if self._max_pending <= 0 or not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy("Too many password hashes in progress")
+        try:
+            future = self._get_executor().submit(function, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the job leaves the pool, also when the caller
+        # stops waiting for it, so `max_pending` bounds the queued work
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout as error:
+            raise PasswordHasherBusy("Password hashing timed out") from error
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Pools do not survive a fork, so each worker process creates its own.
+        with self._executor_lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def create_password_hasher(config: dict) -> PasswordHasher:
+    """Build a `PasswordHasher` from the `PASSWORD_HASH_*` settings of an app config."""
+    return PasswordHasher(
+        method=config.get("PASSWORD_HASH_METHOD", "scrypt"),
+        salt_length=config.get("PASSWORD_SALT_LENGTH", 16),
+        workers=config.get("PASSWORD_HASH_WORKERS", 0),
+        max_pending=config.get("PASSWORD_HASH_MAX_PENDING", 32),
+        timeout=config.get("PASSWORD_HASH_TIMEOUT", 10.0),
+    )
+
+
+def get_password_hasher() -> PasswordHasher:
+    return current_app.extensions["password_hasher"]
+
+
+def hash_password(raw_password: str) -> str:
+    """Hash with the application's configured parameters, or werkzeug's defaults outside an app."""
+    if has_app_context() and "password_hasher" in current_app.extensions:
+        return get_password_hasher().hash(raw_password)
+    return generate_password_hash(raw_password)
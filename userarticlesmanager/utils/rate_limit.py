@@ -0,0 +1,231 @@
+import math
+import threading
+import time
+from typing import Any, Optional, Protocol
+from flask import Response, current_app, g, jsonify, request
+from flask_jwt_extended import decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+from userarticlesmanager.utils.cache import TTLCache
+from userarticlesmanager.utils.instrumentation import get_metrics
+from userarticlesmanager.utils.response_cache import ResponseCache
+
+
+def take_token(
+    tokens: float, updated_at: float, now: float, rate: float, burst: int
+) -> tuple[float, float]:
+    """Refill a token bucket holding `tokens` at `updated_at` and take one token.
+
+    Returns the tokens left and 0.0 when a token was available, or the
+    unchanged bucket and the seconds until one will be.
+    """
+    tokens = min(float(burst), tokens + max(0.0, now - updated_at) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate
+
+
+class RateLimitStore(Protocol):
+    """Keeps the token buckets; `take` returns 0.0 or the seconds to wait."""
+
+    name: str
+
+    def take(self, key: str, rate: float, burst: int) -> float: ...
+
+
+class MemoryRateLimitStore:
+    """Process-local buckets; each worker process allows the full rate.
+
+    A bucket left alone until it is full again is the same as a new one, so
+    it expires then, and the least recently used buckets are evicted first.
+    """
+
+    name = "memory"
+
+    def __init__(self, maxsize: int) -> None:
+        self._buckets = TTLCache(maxsize=maxsize, ttl=60)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key) or (float(burst), now)
+            tokens, retry_after = take_token(tokens, updated_at, now, rate, burst)
+            self._buckets.set(key, (tokens, now), ttl=burst / rate)
+        return retry_after
+
+
+# `take_token` run atomically by the server, on the server's clock. Lua numbers
+# are returned to the client as integers, so the wait is sent as a string.
+_TAKE_TOKEN_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or burst
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000))
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimitStore:
+    """Buckets shared by all worker processes, for any client speaking the Redis
+    protocol with scripting (redis-py, or a compatible local stand-in)."""
+
+    name = "redis"
+
+    def __init__(self, client: Any, prefix: str = "userarticlesmanager:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        return float(
+            self.client.eval(_TAKE_TOKEN_SCRIPT, 1, self.prefix + key, rate, burst)
+        )
+
+
+class RateLimiter:
+    """Token-bucket limits per endpoint, given as `(requests per second, burst)`.
+
+    Each client gets its own bucket per endpoint: the JWT identity when the
+    request carries a valid token, the client address otherwise.
+    """
+
+    def __init__(
+        self, limits: dict[str, tuple[float, int]], store: RateLimitStore
+    ) -> None:
+        self.limits = limits
+        self.store = store
+
+    def check(self, endpoint: str, client_key: str) -> float:
+        """Take a token for `client_key` at `endpoint`; returns 0.0 or the seconds to wait."""
+        limit = self.limits.get(endpoint)
+        if limit is None:
+            return 0.0
+        rate, burst = limit
+        return self.store.take(f"ratelimit:{endpoint}:{client_key}", rate, burst)
+
+
+def create_rate_limiter(
+    config: dict, response_cache: Optional[ResponseCache]
+) -> Optional[RateLimiter]:
+    """Build the limiter from `RATE_LIMITS` and `RATE_LIMIT_BACKEND`, or None without limits.
+
+    The redis backend shares the response cache's client when it is Redis.
+    """
+    limits = {
+        endpoint: (float(rate), int(burst))
+        for endpoint, (rate, burst) in (config.get("RATE_LIMITS") or {}).items()
+        if rate > 0
+    }
+    backend_name = config.get("RATE_LIMIT_BACKEND", "memory")
+    if not limits or backend_name == "none":
+        return None
+    store: RateLimitStore
+    if backend_name == "memory":
+        store = MemoryRateLimitStore(maxsize=config.get("RATE_LIMIT_SIZE", 65536))
+    elif backend_name == "redis":
+        if response_cache is not None and response_cache.backend.name == "redis":
+            client = response_cache.backend.client  # type: ignore[attr-defined]
+        else:
+            try:
+                import redis  # type: ignore
+            except ImportError as error:
+                raise RuntimeError(
+                    "RATE_LIMIT_BACKEND=redis requires the redis package"
+                ) from error
+            client = redis.Redis.from_url(
+                config.get("RATE_LIMIT_URL", "redis://localhost:6379/0")
+            )
+        store = RedisRateLimitStore(client)
+    else:
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend_name}")
+    return RateLimiter(limits, store)
+
+
+class ConcurrencyLimiter:
+    """Caps the requests of an endpoint served at once by this process.
+
+    A request over the cap is turned away instead of waiting for a worker
+    thread or a database connection behind the others.
+    """
+
+    def __init__(self, limits: dict[str, int]) -> None:
+        self.limits = {endpoint: cap for endpoint, cap in limits.items() if cap > 0}
+        self.in_flight = {endpoint: 0 for endpoint in self.limits}
+        self._lock = threading.Lock()
+
+    def acquire(self, endpoint: str) -> bool:
+        cap = self.limits.get(endpoint)
+        if cap is None:
+            return True
+        with self._lock:
+            if self.in_flight[endpoint] >= cap:
+                return False
+            self.in_flight[endpoint] += 1
+            return True
+
+    def release(self, endpoint: str) -> None:
+        if endpoint in self.limits:
+            with self._lock:
+                self.in_flight[endpoint] -= 1
+
+
+def _client_key() -> str:
+    # The token is checked again by the view; here it only names the bucket
+    authorization = request.headers.get("Authorization", "")
+    if authorization.startswith("Bearer "):
+        try:
+            claims = decode_token(authorization[len("Bearer ") :])
+        except (JWTExtendedException, PyJWTError):
+            claims = {}  # rejected by the view, if it needs a token
+        identity = claims.get(current_app.config["JWT_IDENTITY_CLAIM"])
+        if identity is not None:
+            return f"user:{identity}"
+    return f"addr:{request.remote_addr}"
+
+
+def _reject(status: int, message: str, retry_after: float, reason: str) -> Response:
+    get_metrics().reject(reason, request.endpoint or "none")
+    response = jsonify({"message": message})
+    response.status_code = status
+    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def admit_request() -> Optional[Response]:
+    """`before_request` hook answering 429 to clients over their rate limit and
+    503 when the endpoint's concurrency cap is reached."""
+    endpoint = request.endpoint
+    if endpoint is None:
+        return None
+    limiter: Optional[RateLimiter] = current_app.extensions.get("rate_limiter")
+    if limiter is not None and endpoint in limiter.limits:
+        retry_after = limiter.check(endpoint, _client_key())
+        if retry_after > 0:
+            return _reject(
+                429, "Too many requests, try again later", retry_after, "rate_limit"
+            )
+
+    concurrency: ConcurrencyLimiter = current_app.extensions["concurrency_limiter"]
+    if not concurrency.acquire(endpoint):
+        return _reject(503, "Server busy, try again later", 1, "concurrency")
+    g.concurrency_slot = endpoint
+    return None
+
+
+def release_request(error: Optional[BaseException] = None) -> None:
+    """`teardown_request` hook freeing the slot taken by `admit_request`."""
+    endpoint = g.pop("concurrency_slot", None)
+    if endpoint is not None:
+        current_app.extensions["concurrency_limiter"].release(endpoint)
@@ -0,0 +1,175 @@
+import random
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Sequence
+from flask import Response, current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Select
+from sqlalchemy.sql.dml import UpdateBase
+from userarticlesmanager.utils.response_cache import (
+    CacheBackend,
+    MemoryBackend,
+    RedisBackend,
+    ResponseCache,
+)
+
+# Requests that never write; only these may read from a replica
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReplicaRouter:
+    """Picks a replica bind for read-only requests and pins writers to the primary.
+
+    After a request writes, its client (the JWT identity, or the address of a
+    request without one) reads from the primary for `sticky_seconds`, long
+    enough for the replicas to catch up, so clients always see their own writes. The marks live in `backend`; a
+    shared backend pins clients across worker processes.
+    """
+
+    def __init__(
+        self, bind_keys: Sequence[str], sticky_seconds: float, backend: CacheBackend
+    ) -> None:
+        self.bind_keys = list(bind_keys)
+        self.sticky_seconds = sticky_seconds
+        self.backend = backend
+
+    def choose(self) -> str:
+        return random.choice(self.bind_keys)
+
+    def mark_write(self, client_keys: Sequence[str]) -> None:
+        for key in client_keys:
+            self.backend.set(f"replica:sticky:{key}", b"1", self.sticky_seconds)
+
+    def is_sticky(self, client_keys: Sequence[str]) -> bool:
+        return any(
+            self.backend.get(f"replica:sticky:{key}") is not None for key in client_keys
+        )
+
+
+def create_replica_router(
+    config: dict, response_cache: Optional[ResponseCache]
+) -> Optional[ReplicaRouter]:
+    """Build a router over the `replica_*` binds, or None without replicas.
+
+    Sticky marks are kept in Redis by default, so a client that wrote to one
+    worker process reads from the primary on all of them; the redis backend
+    shares the response cache's client when it is Redis. `memory` keeps them
+    per process and only suits a single worker process.
+    """
+    bind_keys = sorted(
+        key for key in config.get("SQLALCHEMY_BINDS") or {} if key.startswith("replica")
+    )
+    if not bind_keys:
+        return None
+    backend_name = config.get("REPLICA_STICKY_BACKEND", "redis")
+    backend: CacheBackend
+    if backend_name == "memory":
+        backend = MemoryBackend(maxsize=config.get("REPLICA_STICKY_SIZE", 4096))
+    elif backend_name == "redis":
+        if response_cache is not None and response_cache.backend.name == "redis":
+            backend = response_cache.backend
+        else:
+            try:
+                import redis  # type: ignore
+            except ImportError as error:
+                raise RuntimeError(
+                    "REPLICA_STICKY_BACKEND=redis requires the redis package"
+                ) from error
+            backend = RedisBackend(
+                redis.Redis.from_url(
+                    config.get("REPLICA_STICKY_URL", "redis://localhost:6379/0")
+                )
+            )
+    else:
+        raise ValueError(f"Unknown REPLICA_STICKY_BACKEND: {backend_name}")
+    return ReplicaRouter(
+        bind_keys,
+        sticky_seconds=config.get("REPLICA_STICKY_SECONDS", 5.0),
+        backend=backend,
+    )
+
+
+def get_replica_router() -> Optional[ReplicaRouter]:
+    return current_app.extensions.get("replica_router")
+
+
+def _client_keys() -> list[str]:
+    # The address is shared by every client behind a proxy or NAT, so it only
+    # names requests without a JWT identity
+    try:
+        identity = get_jwt_identity()
+    except RuntimeError:  # the view does not verify a JWT, or has not yet
+        identity = None
+    if identity is not None:
+        return [f"user:{identity}"]
+    return [f"addr:{request.remote_addr}"]
+
+
+@contextmanager
+def primary_reads() -> Iterator[None]:
+    """Send the SELECTs made inside the block to the primary, e.g. to render
+    entries shared with other clients that must not be behind a write."""
+    previous = g.get("primary_reads", False)
+    g.primary_reads = True
+    try:
+        yield
+    finally:
+        g.primary_reads = previous
+
+
+def replica_bind_key() -> Optional[str]:
+    """The replica this request reads from, or None to use the primary.
+
+    The choice is made once per client identity seen in the request, so that
+    one request does not hop between replicas. Once the request has written,
+    it reads from the primary too, as do the reads inside `primary_reads`.
+    """
+    if (
+        not has_request_context()
+        or request.method not in SAFE_METHODS
+        or g.get("wrote_primary")
+        or g.get("primary_reads")
+    ):
+        return None
+    router = get_replica_router()
+    if router is None:
+        return None
+    client_keys = _client_keys()
+    route = g.get("replica_route")
+    if route is not None and route[0] == client_keys:
+        return route[1]
+    bind_key = None if router.is_sticky(client_keys) else router.choose()
+    g.replica_route = (client_keys, bind_key)
+    return bind_key
+
+
+def mark_client_write(response: Response) -> Response:
+    """`after_request` hook pinning a client that wrote to the primary."""
+    router = get_replica_router()
+    if router is not None and g.get("wrote_primary"):
+        router.mark_write(_client_keys())
+    return response
+
+
+class RoutingSession(Session):
+    """Session sending the SELECTs of read-only requests to a replica.
+
+    Flushes, DML statements and anything else (e.g. `text()` statements) go
+    to the primary, as does every statement of a request that may write.
+    """
+
+    def get_bind(
+        self,
+        mapper: Optional[Any] = None,
+        clause: Optional[Any] = None,
+        bind: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> Any:
+        if bind is None and has_request_context():
+            if self._flushing or isinstance(clause, UpdateBase):
+                g.wrote_primary = True
+            elif isinstance(clause, Select):
+                bind_key = replica_bind_key()
+                if bind_key is not None:
+                    return self._db.engines[bind_key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
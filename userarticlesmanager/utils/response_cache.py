@@ -0,0 +1,347 @@
+import json
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Protocol,
+    TypeVar,
+    cast,
+)
+from flask import current_app, has_app_context
+from userarticlesmanager.utils.cache import TTLCache
+
+
+class CachedResponse(NamedTuple):
+    """A rendered JSON response body together with its validators."""
+
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime]
+
+    def dumps(self) -> bytes:
+        header = {
+            "etag": self.etag,
+            "last_modified": (
+                self.last_modified.isoformat() if self.last_modified else None
+            ),
+        }
+        return json.dumps(header).encode() + b"\n" + self.body
+
+    @classmethod
+    def loads(cls, data: bytes) -> "CachedResponse":
+        header, body = data.split(b"\n", 1)
+        fields = json.loads(header)
+        last_modified = fields["last_modified"]
+        return cls(
+            body=body,
+            etag=fields["etag"],
+            last_modified=(
+                datetime.fromisoformat(last_modified) if last_modified else None
+            ),
+        )
+
+
+Entry = TypeVar("Entry", bound=Optional[CachedResponse])
+
+
+class CacheBackend(Protocol):
+    """Byte-string store used by `ResponseCache`; a `ttl` of None never expires."""
+
+    name: str
+
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    def set(self, key: str, value: bytes, ttl: Optional[float]) -> None: ...
+
+    def add(self, key: str, value: bytes, ttl: Optional[float]) -> bool: ...
+
+    def delete(self, *keys: str) -> None: ...
+
+    def incr(self, key: str) -> int: ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryBackend:
+    """Process-local LRU backend. Other worker processes keep their own copies,
+    so their entries only go stale until they expire.
+
+    Entries stored without a TTL (the list generation counter) are kept outside
+    the LRU so that they are never evicted.
+    """
+
+    name = "memory"
+
+    def __init__(self, maxsize: int) -> None:
+        self._entries = TTLCache(maxsize=maxsize, ttl=float("inf"))
+        self._persistent: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        if key in self._persistent:
+            return self._persistent[key]
+        return self._entries.get(key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        if ttl is None:
+            self._persistent[key] = value
+        else:
+            self._entries.set(key, value, ttl=ttl)
+
+    def add(self, key: str, value: bytes, ttl: Optional[float]) -> bool:
+        with self._lock:
+            if self.get(key) is not None:
+                return False
+            self.set(key, value, ttl)
+            return True
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._persistent.pop(key, None)
+            self._entries.delete(key)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._persistent.get(key, b"0")) + 1
+            self._persistent[key] = str(value).encode()
+            return value
+
+    def clear(self) -> None:
+        self._persistent.clear()
+        self._entries.clear()
+
+    def size(self) -> int:
+        return self._entries.stats()["size"]
+
+
+class RedisBackend:
+    """Backend shared by all worker processes, for any client speaking the Redis
+    protocol (redis-py, or a compatible local stand-in)."""
+
+    name = "redis"
+
+    def __init__(self, client: Any, prefix: str = "userarticlesmanager:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        self.client.set(self.prefix + key, value, px=self._milliseconds(ttl))
+
+    def add(self, key: str, value: bytes, ttl: Optional[float]) -> bool:
+        return bool(
+            self.client.set(
+                self.prefix + key, value, px=self._milliseconds(ttl), nx=True
+            )
+        )
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(self.prefix + key))
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+    @staticmethod
+    def _milliseconds(ttl: Optional[float]) -> Optional[int]:
+        return None if ttl is None else max(int(ttl * 1000), 1)
+
+
+class ResponseCache:
+    """Cache of rendered article responses with write-through invalidation.
+
+    Single articles are stored under their ID and removed when the article is
+    written. List pages are stored under a generation number that every write
+    increments, so one counter update retires all cached pages; orphaned pages
+    expire after `ttl`. Single articles carry a generation of their own,
+    incremented when many articles go at once (e.g. a user is deleted), so that
+    their IDs need not be read to drop them.
+
+    A miss is computed once: concurrent requests for the same key wait for the
+    first one (within the process through a lock, across processes through a
+    short-lived lock entry in the backend) instead of all querying the database.
+    A read racing with a write can still store the old version of a single
+    article; such an entry lives at most `ttl` seconds.
+    """
+
+    _GENERATION_KEY = "articles:list:generation"
+    _ARTICLE_GENERATION_KEY = "articles:generation"
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: float = 30.0,
+        lock_timeout: float = 5.0,
+        stripes: int = 64,
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        self._flights = [threading.Lock() for _ in range(stripes)]
+
+    def article_key(self, article_id: int) -> str:
+        return f"articles:{self._generation(self._ARTICLE_GENERATION_KEY)}:{article_id}"
+
+    def list_key(self, query_string: bytes) -> str:
+        return f"articles:list:{self._generation()}:{query_string.decode()}"
+
+    def _generation(self, key: str = _GENERATION_KEY) -> int:
+        raw = self.backend.get(key)
+        if raw is None:
+            # Start from the clock so a lost counter cannot reuse an old generation
+            self.backend.add(key, str(time.time_ns()).encode(), None)
+            raw = self.backend.get(key)
+        return int(raw or 0)
+
+    def _next_generation(self, key: str) -> None:
+        self._generation(key)  # seeds the counter if it is missing
+        self.backend.incr(key)
+
+    def get_or_compute(
+        self, key: str, compute: Callable[[], Entry]
+    ) -> tuple[Entry, bool]:
+        """Return the entry for `key` and whether it came from the cache.
+
+        `compute` renders the entry on a miss; when it returns None (e.g. the
+        article does not exist) nothing is stored.
+        """
+        entry = self._get(key)
+        if entry is not None:
+            self._count(hit=True)
+            return cast(Entry, entry), True
+
+        flight = self._flights[zlib.crc32(key.encode()) % len(self._flights)]
+        with flight:
+            entry = self._get(key)
+            if entry is not None:
+                self._count(hit=True)
+                return cast(Entry, entry), True
+
+            self._count(hit=False)
+            lock_key = f"lock:{key}"
+            if not self.backend.add(lock_key, b"1", self.lock_timeout):
+                entry = self._wait_for(key)
+                if entry is not None:
+                    return cast(Entry, entry), False
+                # The other process did not finish in time; render without storing
+                return compute(), False
+            try:
+                computed = compute()
+                if computed is not None:
+                    self.backend.set(key, computed.dumps(), self.ttl)
+                return computed, False
+            finally:
+                self.backend.delete(lock_key)
+
+    def _get(self, key: str) -> Optional[CachedResponse]:
+        data = self.backend.get(key)
+        return CachedResponse.loads(data) if data is not None else None
+
+    def _wait_for(self, key: str) -> Optional[CachedResponse]:
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.01)
+            entry = self._get(key)
+            if entry is not None:
+                return entry
+        return None
+
+    def invalidate_articles(self, article_ids: Iterable[int] = ()) -> None:
+        """Drop the given articles and every cached list page."""
+        keys = [self.article_key(article_id) for article_id in article_ids]
+        self.backend.delete(*keys)
+        self._next_generation(self._GENERATION_KEY)
+
+    def invalidate_all_articles(self) -> None:
+        """Drop every cached article and list page, e.g. after a user's articles
+        were deleted with one statement."""
+        self._next_generation(self._ARTICLE_GENERATION_KEY)
+        self._next_generation(self._GENERATION_KEY)
+
+    def clear(self) -> None:
+        self.backend.clear()
+        with self._stats_lock:
+            self.hits = 0
+            self.misses = 0
+
+    def _count(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return the backend name and hit/miss counters of this process."""
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            stats: dict[str, Any] = {
+                "backend": self.backend.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+        if isinstance(self.backend, MemoryBackend):
+            stats["size"] = self.backend.size()
+        return stats
+
+
+def create_response_cache(config: dict) -> Optional[ResponseCache]:
+    """Build a `ResponseCache` from the `RESPONSE_CACHE_*` settings, or None when disabled."""
+    backend_name = config.get("RESPONSE_CACHE_BACKEND", "memory")
+    backend: CacheBackend
+    if backend_name == "none":
+        return None
+    if backend_name == "memory":
+        backend = MemoryBackend(maxsize=config.get("RESPONSE_CACHE_SIZE", 4096))
+    elif backend_name == "redis":
+        try:
+            import redis  # type: ignore
+        except ImportError as error:
+            raise RuntimeError(
+                "RESPONSE_CACHE_BACKEND=redis requires the redis package"
+            ) from error
+        backend = RedisBackend(
+            redis.Redis.from_url(
+                config.get("RESPONSE_CACHE_URL", "redis://localhost:6379/0")
+            )
+        )
+    else:
+        raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {backend_name}")
+    return ResponseCache(backend, ttl=config.get("RESPONSE_CACHE_TTL", 30.0))
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("response_cache")
+
+
+def invalidate_articles(article_ids: Iterable[int] = ()) -> None:
+    """Invalidate cached responses after articles were created, changed or deleted."""
+    cache = get_response_cache()
+    if cache is not None:
+        cache.invalidate_articles(article_ids)
+
+
+def invalidate_all_articles() -> None:
+    """Invalidate every cached response, without knowing which articles changed."""
+    cache = get_response_cache()
+    if cache is not None:
+        cache.invalidate_all_articles()
@@ -0,0 +1,67 @@
+import re
+from typing import Any, Sequence
+from sqlalchemy import func, select, text
+from userarticlesmanager.extensions import db
+from userarticlesmanager.models.article import Article
+
+# Text search configuration used by the PostgreSQL trigger that fills
+# articles.search_vector. Queries must use the same one to hit the GIN index.
+SEARCH_TEXT_CONFIG = "english"
+
+# Title matches weigh more than content matches in SQLite's bm25 ranking,
+# mirroring the A/B weights of the PostgreSQL search_vector.
+_SQLITE_SEARCH_SQL = text(
+    "SELECT rowid FROM articles_fts WHERE articles_fts MATCH :match "
+    "ORDER BY bm25(articles_fts, 10.0, 1.0), rowid LIMIT :limit OFFSET :offset"
+)
+
+
+def _search_terms(query: str) -> list[str]:
+    """Split a free-text query into word terms, dropping search operators."""
+    return re.findall(r"\w+", query.lower())
+
+
+def search_articles(
+    query: str, limit: int, offset: int = 0, options: Sequence[Any] = ()
+) -> list[Article]:
+    """Return articles whose title or content match every term, best matches first.
+
+    Each term also matches as a prefix, so `search` finds "Searchable". PostgreSQL
+    uses the GIN-indexed `search_vector` column; SQLite uses the FTS5 table.
+    Loader `options` (e.g. from `load_fields`) are applied to the loaded articles.
+    """
+    terms = _search_terms(query)
+    if not terms:
+        return []
+
+    if db.session.get_bind().dialect.name == "postgresql":
+        ts_query = func.to_tsquery(
+            SEARCH_TEXT_CONFIG, " & ".join(f"{term}:*" for term in terms)
+        )
+        statement = (
+            select(Article)
+            .options(*options)
+            .where(Article.search_vector.op("@@")(ts_query))
+            .order_by(
+                func.ts_rank_cd(Article.search_vector, ts_query).desc(), Article.id
+            )
+            .limit(limit)
+            .offset(offset)
+        )
+        return list(db.session.execute(statement).scalars())
+
+    match = " ".join(f'"{term}"*' for term in terms)
+    ids = (
+        db.session.execute(
+            _SQLITE_SEARCH_SQL, {"match": match, "limit": limit, "offset": offset}
+        )
+        .scalars()
+        .all()
+    )
+    articles = {
+        article.id: article
+        for article in db.session.execute(
+            select(Article).options(*options).where(Article.id.in_(ids))
+        ).scalars()
+    }
+    return [articles[article_id] for article_id in ids if article_id in articles]
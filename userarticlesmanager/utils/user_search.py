@@ -0,0 +1,136 @@
+import bisect
+import threading
+from typing import Any
+from flask import current_app, has_app_context
+from sqlalchemy import event, select
+from userarticlesmanager.extensions import db
+from userarticlesmanager.models.user import User
+
+
+def _like_pattern(term: str) -> str:
+    """Build a `%term%` LIKE pattern with wildcard characters in `term` escaped."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class UsernameIndex:
+    """In-memory substring index over usernames, used when pg_trgm is unavailable.
+
+    Every suffix of every lower-cased username is kept in one sorted list, so the
+    users whose name contains a term are the suffixes starting with it, found with
+    a binary search instead of a scan over the users table.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._suffixes: list[tuple[str, int]] = []
+        self._names: dict[int, str] = {}
+        self.loaded = False
+
+    def load(self, rows: list[tuple[int, str]]) -> None:
+        """Replace the index contents with `(id, username)` rows."""
+        with self._lock:
+            self._names = {user_id: username.lower() for user_id, username in rows}
+            self._suffixes = sorted(
+                (name[start:], user_id)
+                for user_id, name in self._names.items()
+                for start in range(len(name))
+            )
+            self.loaded = True
+
+    def add(self, user_id: int, username: str) -> None:
+        with self._lock:
+            self._discard(user_id)
+            name = username.lower()
+            self._names[user_id] = name
+            for start in range(len(name)):
+                bisect.insort(self._suffixes, (name[start:], user_id))
+
+    def remove(self, user_id: int) -> None:
+        with self._lock:
+            self._discard(user_id)
+
+    def _discard(self, user_id: int) -> None:
+        name = self._names.pop(user_id, None)
+        if name is None:
+            return
+        for start in range(len(name)):
+            entry = (name[start:], user_id)
+            position = bisect.bisect_left(self._suffixes, entry)
+            if position < len(self._suffixes) and self._suffixes[position] == entry:
+                del self._suffixes[position]
+
+    def search(self, term: str) -> list[tuple[str, int]]:
+        """Return `(username, id)` pairs whose username contains `term`, sorted by name."""
+        term = term.lower()
+        with self._lock:
+            matches = set()
+            position = bisect.bisect_left(self._suffixes, (term, -1))
+            while position < len(self._suffixes):
+                suffix, user_id = self._suffixes[position]
+                if not suffix.startswith(term):
+                    break
+                matches.add((self._names[user_id], user_id))
+                position += 1
+        return sorted(matches)
+
+
+def get_username_index() -> UsernameIndex:
+    """Return the application's username index, building it on first use."""
+    index = current_app.extensions.setdefault("username_index", UsernameIndex())
+    if not index.loaded:
+        index.load(list(db.session.execute(select(User.id, User.username)).tuples()))
+    return index
+
+
+def search_users(term: str, limit: int, offset: int = 0) -> list[User]:
+    """Return users whose username contains `term`, ordered by username.
+
+    PostgreSQL serves the ILIKE from the pg_trgm GIN index. Other databases use
+    the in-memory `UsernameIndex`; its candidates are re-checked against the
+    database, so entries left behind by writes outside the ORM are filtered out.
+    """
+    pattern = _like_pattern(term)
+    if db.session.get_bind().dialect.name == "postgresql":
+        statement = (
+            select(User)
+            .where(User.username.ilike(pattern, escape="\\"))
+            .order_by(User.username, User.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        return list(db.session.execute(statement).scalars())
+
+    page = get_username_index().search(term)[offset : offset + limit]
+    ids = [user_id for _, user_id in page]
+    users = {
+        user.id: user
+        for user in db.session.execute(
+            select(User).where(
+                User.id.in_(ids), User.username.ilike(pattern, escape="\\")
+            )
+        ).scalars()
+    }
+    return [users[user_id] for user_id in ids if user_id in users]
+
+
+def _loaded_index() -> Any:
+    if not has_app_context():
+        return None
+    index = current_app.extensions.get("username_index")
+    return index if index is not None and index.loaded else None
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+def _index_user(mapper: Any, connection: Any, user: User) -> None:
+    index = _loaded_index()
+    if index is not None:
+        index.add(user.id, user.username)
+
+
+@event.listens_for(User, "after_delete")
+def _unindex_user(mapper: Any, connection: Any, user: User) -> None:
+    index = _loaded_index()
+    if index is not None:
+        index.remove(user.id)
@@ -1,3 +1,4 @@
+import os
 from userarticlesmanager.extensions import create_app
 from userarticlesmanager.routes import register_routes
 
@@ -7,4 +8,5 @@ app = create_app()
 register_routes(app)
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    # Development server only; production runs `gunicorn -c gunicorn.conf.py wsgi:app`
+    app.run(debug=os.getenv("FLASK_DEBUG", "0") == "1")